@@ -0,0 +1,165 @@
+"""Compares sending events over HTTP/1.1 with requests and over HTTP/2.
+
+Starts two local servers answering every call after `--latency` ms, as the
+Sift API would over the network: a `sift.testing.SiftServer` speaking
+HTTP/1.1 and one speaking HTTP/2 (in clear text, with prior knowledge). Then sends `--events` events with
+`track_many()` to each of them, and reports the throughput and the number of
+connections each client opened.
+
+Requires the `http2` extra. Run from the root folder of the repository:
+
+    python -m benchmarks.http2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import threading
+import time
+import typing as t
+
+import h2.config
+import h2.connection
+import h2.events
+import h2.exceptions
+import httpx
+
+import sift
+from sift.http2 import HTTP2Transport
+from sift.pool import PoolStats
+from sift.testing import SiftServer
+
+BODY = b'{"status": 0, "error_message": "OK"}'
+
+
+class HTTP2Protocol(asyncio.Protocol):
+    latency = 0.0
+
+    def __init__(self) -> None:
+        self.conn = h2.connection.H2Connection(
+            h2.config.H2Configuration(client_side=False)
+        )
+        self.transport: asyncio.Transport | None = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = t.cast(asyncio.Transport, transport)
+        self.conn.initiate_connection()
+        self.flush()
+
+    def data_received(self, data: bytes) -> None:
+        for event in self.conn.receive_data(data):
+            if isinstance(event, h2.events.DataReceived):
+                self.conn.acknowledge_received_data(
+                    event.flow_controlled_length, event.stream_id
+                )
+            elif isinstance(event, h2.events.StreamEnded):
+                asyncio.ensure_future(self.respond(event.stream_id))
+            elif isinstance(event, h2.events.ConnectionTerminated):
+                t.cast(asyncio.Transport, self.transport).close()
+
+        self.flush()
+
+    async def respond(self, stream_id: int) -> None:
+        await asyncio.sleep(self.latency)
+
+        try:
+            self.conn.send_headers(
+                stream_id,
+                [
+                    (":status", "200"),
+                    ("content-type", "application/json"),
+                    ("content-length", str(len(BODY))),
+                ],
+            )
+            self.conn.send_data(stream_id, BODY, end_stream=True)
+        except h2.exceptions.StreamClosedError:
+            return
+
+        self.flush()
+
+    def flush(self) -> None:
+        if self.transport is not None and not self.transport.is_closing():
+            self.transport.write(self.conn.data_to_send())
+
+
+def serve_http2(latency: float) -> str:
+    protocol = type("Protocol", (HTTP2Protocol,), {"latency": latency})
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(
+        loop.create_server(protocol, "127.0.0.1", 0)
+    )
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+
+
+def send(
+    client: sift.Client, events: int, concurrency: int
+) -> tuple[float, int]:
+    # the duration in seconds and the number of failed calls
+    started = time.perf_counter()
+    failed = sum(
+        isinstance(result, Exception)
+        for _, result in client.track_many(
+            (
+                ("$login", {"$user_id": f"billy_jones_{i}"})
+                for i in range(events)
+            ),
+            max_concurrency=concurrency,
+            ordered=False,
+        )
+    )
+    return time.perf_counter() - started, failed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--events", type=int, default=2000, help="events sent per client"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=64, help="calls in flight"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=20, help="server latency in ms"
+    )
+    args = parser.parse_args()
+    latency = args.latency / 1000
+
+    # urllib3 warns about connections discarded from a full pool
+    logging.getLogger("urllib3").setLevel(logging.ERROR)
+
+    http11 = sift.Client(
+        api_key="a_fake_api_key",
+        api_url=SiftServer(latency=latency, capture=False).start().url,
+        pool_maxsize=args.concurrency,
+    )
+    http2_transport = HTTP2Transport(httpx.Client(http1=False, http2=True))
+    http2 = sift.Client(
+        api_key="a_fake_api_key",
+        api_url=serve_http2(latency),
+        transport=http2_transport,
+    )
+    clients: dict[str, tuple[sift.Client, PoolStats]] = {
+        "HTTP/1.1": (http11, t.cast(PoolStats, http11.pool_stats)),
+        "HTTP/2": (http2, http2_transport.stats),
+    }
+
+    print(
+        f"{args.events} events, {args.concurrency} in flight, "
+        f"{args.latency:g} ms server latency"
+    )
+    print(f"{'transport':<12}{'events/s':>10}{'connections':>13}{'failed':>8}")
+
+    for name, (client, stats) in clients.items():
+        duration, failed = send(client, args.events, args.concurrency)
+        print(
+            f"{name:<12}{args.events / duration:>10.0f}"
+            f"{stats.new_connections:>13}{failed:>8}"
+        )
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Compares the JSON codecs of sift.utils on a large `$create_order` event.
+
+Checks that every installed codec produces the same document as the
+standard library with `DecimalEncoder`, then times encoding the event and
+decoding a score response of the same size.
+
+Run from the root folder of the repository:
+
+    python -m benchmarks.json_codec
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import timeit
+import typing as t
+from decimal import Decimal
+
+from sift.utils import DecimalEncoder, get_json_codec
+
+CODECS = ("json", "orjson", "ujson", "simdjson")
+
+
+def create_order(items: int) -> dict[str, t.Any]:
+    address = {
+        "$name": "Bill Jones",
+        "$phone": "1-415-555-6041",
+        "$address_1": "2100 Main Street",
+        "$address_2": "Apt 3B",
+        "$city": "New London",
+        "$region": "New Hampshire",
+        "$country": "US",
+        "$zipcode": "03257",
+    }
+
+    return {
+        "$user_id": "billy_jones_301",
+        "$session_id": "gigtleqddo84l8cm15qe4il",
+        "$order_id": "ORDER-28168441",
+        "$user_email": "bill@gmail.com",
+        "$amount": Decimal("115940000"),
+        "$currency_code": "USD",
+        "$billing_address": address,
+        "$shipping_address": address,
+        "$payment_methods": [
+            {
+                "$payment_type": "$credit_card",
+                "$payment_gateway": "$braintree",
+                "$card_bin": "542486",
+                "$card_last4": "4444",
+            }
+        ],
+        "$items": [
+            {
+                "$item_id": f"B004834GQO-{i}",
+                "$product_title": "The Slanket Blanket-Texas Tea",
+                "$price": Decimal("39.99"),
+                "$upc": "6786211451001",
+                "$sku": "004834GQ",
+                "$brand": "Slanket",
+                "$manufacturer": "Slanket",
+                "$category": "Blankets & Throws",
+                "$tags": ["Awesome", "Wintertime specials"],
+                "$color": "Texas Tea",
+                "$quantity": 16,
+            }
+            for i in range(items)
+        ],
+        "$promotions": [
+            {
+                "$promotion_id": f"FirstTimeBuyer-{i}",
+                "$status": "$success",
+                "$description": "$5 off",
+                "$discount": {
+                    "$amount": Decimal("5000000"),
+                    "$currency_code": "USD",
+                    "$minimum_purchase_amount": Decimal("25000000"),
+                },
+            }
+            for i in range(items // 10 + 1)
+        ],
+        "$shipping_method": "$physical",
+        "$ip": "54.208.214.78",
+    }
+
+
+def installed_codecs() -> list[str]:
+    return [
+        name
+        for name in CODECS
+        if name == "json" or importlib.util.find_spec(name)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--items", type=int, default=100, help="items in the order"
+    )
+    parser.add_argument(
+        "--number", type=int, default=1000, help="calls per measure"
+    )
+    args = parser.parse_args()
+
+    event = create_order(args.items)
+    expected = json.dumps(event, cls=DecimalEncoder)
+    response = json.dumps(
+        {"status": 0, "error_message": "OK", "request": expected}
+    ).encode()
+
+    print(
+        f"$create_order with {args.items} items: {len(expected)} bytes, "
+        f"{args.number} calls per measure"
+    )
+    print(f"{'codec':<10}{'dumps µs':>10}{'loads µs':>10}{'speedup':>16}")
+
+    baseline: tuple[float, float] | None = None
+
+    for name in installed_codecs():
+        codec = get_json_codec(name)
+
+        # parity: the same document once parsed
+        assert json.loads(codec.dumps(event)) == json.loads(expected), name
+        assert codec.loads(response) == json.loads(response), name
+
+        dumps = min(
+            timeit.repeat(
+                lambda: codec.dumps(event), number=args.number, repeat=5
+            )
+        )
+        loads = min(
+            timeit.repeat(
+                lambda: codec.loads(response), number=args.number, repeat=5
+            )
+        )
+        baseline = baseline or (dumps, loads)
+
+        print(
+            f"{name:<10}"
+            f"{dumps / args.number * 1e6:>10.1f}"
+            f"{loads / args.number * 1e6:>10.1f}"
+            f"{baseline[0] / dumps:>7.1f}x /{baseline[1] / loads:>5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,389 @@
+"""Benchmarks the hot paths of the client, with results to compare runs.
+
+Three groups of benchmarks:
+
+- `overhead`: the client-side cost of API calls, through a transport
+  answering right away, and of their steps: validating arguments, building
+  URLs and headers, and encoding events with `DecimalEncoder`;
+- `response`: building a `Response` and parsing small and large bodies;
+- `end_to_end`: the throughput and latency percentiles of `track()` against
+  a local `sift.testing.SiftServer`, at several concurrency levels. The
+  server runs in this process unless `--api-url` is given, competing with
+  the client for the GIL.
+
+Results are printed as a table and, with `--json`, written as a JSON
+document. `--compare` compares the results with those of a previous run,
+and exits with status 1 if any is worse by more than `--threshold`:
+
+    python -m benchmarks.suite --json baseline.json
+    git checkout my-branch
+    python -m benchmarks.suite --compare baseline.json
+
+Run from the root folder of the repository.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import datetime
+import json
+import logging
+import platform
+import sys
+import threading
+import time
+import timeit
+import typing as t
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+
+import sift
+from benchmarks.json_codec import create_order
+from sift.client import Response
+from sift.testing import SiftServer
+from sift.transport import BufferedResponse, HttpRequest, TransportResponse
+from sift.utils import DecimalEncoder
+from sift.version import VERSION
+
+GROUPS = ("overhead", "response", "end_to_end")
+
+# a result: name, unit, value, and whether "lower" or "higher" is better
+Result = t.Dict[str, t.Any]
+
+OK = b'{"status": 0, "error_message": "OK"}'
+
+
+class StubTransport:
+    """Answers every request right away with `OK`."""
+
+    def send(self, request: HttpRequest) -> TransportResponse:
+        return BufferedResponse(request.url, 200, None, OK)
+
+    def close(self) -> None:
+        pass
+
+
+def result(
+    name: str, unit: str, value: float, better: str = "lower"
+) -> Result:
+    return {"name": name, "unit": unit, "value": value, "better": better}
+
+
+def timed(name: str, fn: Callable[[], object], number: int | None) -> Result:
+    # the best of 5 measures, the least disturbed by other processes, in µs
+    # per call; by default, each measure makes as many calls as take at
+    # least 0.2 seconds
+    timer = timeit.Timer(fn)
+    number = number or timer.autorange()[0]
+    best = min(timer.repeat(number=number, repeat=5))
+    return result(name, "us", best / number * 1e6)
+
+
+def percentile(values: Sequence[float], p: float) -> float:
+    # nearest-rank percentile of sorted values
+    index = max(0, min(len(values) - 1, round(p / 100 * len(values)) - 1))
+    return values[index]
+
+
+def overhead(number: int | None) -> Iterator[Result]:
+    client = sift.Client(
+        api_key="a_fake_api_key",
+        account_id="ACCT",
+        transport=StubTransport(),
+    )
+    decision = {
+        "decision_id": "user_looks_bad_payment_abuse",
+        "source": "MANUAL_REVIEW",
+        "analyst": "analyst@example.com",
+        "description": "Looks bad",
+    }
+    login = {"$user_id": "billy_jones_301", "$ip": "54.208.214.78"}
+    order = create_order(100)
+
+    steps: dict[str, Callable[[], object]] = {
+        "validate_decision": lambda: (
+            client._validate_apply_decision_request(decision, "billy_jones")
+        ),
+        "events_url": lambda: client._events_url("205"),
+        "session_decisions_url": lambda: client._session_decisions_url(
+            "ACCT", "billy_jones_301", "gigtleqddo84l8cm15qe4il"
+        ),
+        "post_headers": client._post_headers,
+        "encode_login": lambda: client.json_codec.dumps(login),
+        "encode_create_order_100_items": lambda: client.json_codec.dumps(
+            order
+        ),
+        "track": lambda: client.track("$login", login),
+        "track_create_order_100_items": lambda: client.track(
+            "$create_order", order
+        ),
+        "get_user_score": lambda: client.get_user_score("billy_jones_301"),
+        "label": lambda: client.label("billy_jones_301", {"$is_bad": True}),
+        "apply_user_decision": lambda: client.apply_user_decision(
+            "billy_jones_301", decision
+        ),
+    }
+
+    for name, fn in steps.items():
+        yield timed(f"overhead.{name}", fn, number)
+
+
+def response_bodies() -> dict[str, bytes]:
+    order = json.dumps(create_order(100), cls=DecimalEncoder)
+    scores = {
+        abuse_type: {
+            "score": 0.5,
+            "reasons": [
+                {"name": f"Reason {i}", "value": str(i)} for i in range(20)
+            ],
+        }
+        for abuse_type in (
+            "payment_abuse",
+            "promotion_abuse",
+            "content_abuse",
+            "account_abuse",
+        )
+    }
+
+    return {
+        "small": OK,
+        "large": json.dumps(
+            {
+                "status": 0,
+                "error_message": "OK",
+                "time": 1327604222,
+                "request": order,
+                "score_response": {
+                    "status": 0,
+                    "error_message": "OK",
+                    "user_id": "billy_jones_301",
+                    "scores": scores,
+                },
+            }
+        ).encode(),
+    }
+
+
+def response(number: int | None) -> Iterator[Result]:
+    url = "https://api.sift.com/v205/events"
+
+    for size, body in response_bodies().items():
+        http_response = BufferedResponse(url, 200, None, body)
+
+        yield timed(
+            f"response.{size}.construct",
+            lambda: Response(http_response).is_ok(),
+            number,
+        )
+        yield timed(
+            f"response.{size}.body",
+            lambda: Response(http_response).body,
+            number,
+        )
+        yield timed(
+            f"response.{size}.request",
+            lambda: Response(http_response).request,
+            number,
+        )
+
+
+def end_to_end(
+    calls: int,
+    concurrency_levels: Sequence[int],
+    latency: float,
+    api_url: str | None,
+) -> Iterator[Result]:
+    # urllib3 warns about connections discarded from a full pool
+    logging.getLogger("urllib3").setLevel(logging.ERROR)
+
+    with contextlib.ExitStack() as stack:
+        if api_url is None:
+            server = SiftServer(latency=latency, capture=False)
+            api_url = stack.enter_context(server).url
+
+        for concurrency in concurrency_levels:
+            client = sift.Client(
+                api_key="a_fake_api_key",
+                api_url=api_url,
+                pool_maxsize=concurrency,
+            )
+            # connections are opened before the measure
+            client.warm_up(concurrency)
+            latencies: list[float] = []
+            lock = threading.Lock()
+
+            def send(i: int) -> None:
+                started = time.perf_counter()
+                client.track("$login", {"$user_id": f"billy_jones_{i}"})
+                elapsed = time.perf_counter() - started
+
+                with lock:
+                    latencies.append(elapsed)
+
+            started = time.perf_counter()
+
+            with ThreadPoolExecutor(concurrency) as executor:
+                for _ in executor.map(send, range(calls)):
+                    pass
+
+            duration = time.perf_counter() - started
+            client.close()
+            latencies.sort()
+            prefix = f"end_to_end.track.c{concurrency}"
+
+            yield result(
+                f"{prefix}.throughput", "calls/s", calls / duration, "higher"
+            )
+
+            for p in (50, 90, 99):
+                yield result(
+                    f"{prefix}.p{p}", "ms", percentile(latencies, p) * 1000
+                )
+
+            yield result(f"{prefix}.max", "ms", latencies[-1] * 1000)
+
+
+def run(args: argparse.Namespace) -> list[Result]:
+    groups = {
+        "overhead": lambda: overhead(args.number),
+        "response": lambda: response(args.number),
+        "end_to_end": lambda: end_to_end(
+            args.calls, args.concurrency, args.latency / 1000, args.api_url
+        ),
+    }
+    results = []
+
+    for group in args.groups:
+        for r in groups[group]():
+            results.append(r)
+            print(f"{r['name']:<48}{r['value']:>12.2f} {r['unit']}")
+
+    return results
+
+
+def document(
+    results: list[Result], args: argparse.Namespace
+) -> dict[str, t.Any]:
+    return {
+        "sift_version": VERSION,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "time": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "arguments": {
+            "groups": args.groups,
+            "number": args.number,
+            "calls": args.calls,
+            "concurrency": args.concurrency,
+            "latency": args.latency,
+            "api_url": args.api_url,
+        },
+        "results": results,
+    }
+
+
+def compare(
+    results: list[Result], baseline: dict[str, t.Any], threshold: float
+) -> list[str]:
+    # the names of the results worse than the baseline by more than
+    # threshold, a fraction
+    previous = {r["name"]: r for r in baseline["results"]}
+    regressions = []
+
+    print(f"\n{'benchmark':<48}{'baseline':>12}{'current':>12}{'change':>9}")
+
+    for r in results:
+        old = previous.get(r["name"])
+
+        if old is None or not old["value"]:
+            continue
+
+        change = r["value"] / old["value"] - 1
+        worse = change if r["better"] == "lower" else -change
+        flag = ""
+
+        if worse > threshold:
+            flag = "  worse"
+            regressions.append(r["name"])
+
+        print(
+            f"{r['name']:<48}{old['value']:>12.2f}{r['value']:>12.2f}"
+            f"{change:>+9.1%}{flag}"
+        )
+
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "groups",
+        nargs="*",
+        help=f"the groups of benchmarks run, among {', '.join(GROUPS)}; "
+        "by default all",
+    )
+    parser.add_argument(
+        "--number",
+        type=int,
+        help="calls per measure of the overhead and response benchmarks, "
+        "by default as many as take 0.2 seconds",
+    )
+    parser.add_argument(
+        "--calls",
+        type=int,
+        default=2000,
+        help="calls per concurrency level of the end-to-end benchmarks",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        nargs="+",
+        default=[1, 8, 32],
+        help="concurrency levels of the end-to-end benchmarks",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0,
+        help="server latency in ms of the end-to-end benchmarks",
+    )
+    parser.add_argument(
+        "--api-url",
+        help="the server of the end-to-end benchmarks, e.g. one started "
+        "with `python -m sift.testing`, instead of a server in this process",
+    )
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument(
+        "--compare", help="compare with the results in this file"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=10,
+        help="the change in %% from which --compare reports a result as "
+        "worse",
+    )
+    args = parser.parse_args()
+    args.groups = args.groups or list(GROUPS)
+
+    for group in args.groups:
+        if group not in GROUPS:
+            parser.error(f"unknown group: {group}")
+
+    results = run(args)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(document(results, args), f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+        if compare(results, baseline, args.threshold / 100):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+import typing as t
 
 from .client import Client
 from .version import VERSION
@@ -9,3 +10,14 @@ __version__ = VERSION
 
 api_key: str | None = os.environ.get("API_KEY")
 account_id: str | None = os.environ.get("ACCOUNT_ID")
+
+
+def __getattr__(name: str) -> t.Any:
+    # AsyncClient depends on the optional httpx package, so it is only
+    # imported on first access
+    if name == "AsyncClient":
+        from .async_client import AsyncClient
+
+        return AsyncClient
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
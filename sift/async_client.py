@@ -0,0 +1,673 @@
+"""asyncio client for Sift Science's API.
+
+Requires the optional `httpx` dependency:
+
+    pip install "Sift[async]"
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import typing as t
+from collections import deque
+from collections.abc import AsyncIterator, Iterable
+
+from requests.auth import HTTPBasicAuth
+
+try:
+    import httpx
+except ImportError as e:
+    raise ImportError(
+        "AsyncClient requires the httpx package. "
+        'Install it with `pip install "Sift[async]"`.'
+    ) from e
+
+from sift.cache import ScoreCache, ScoreCacheKey
+from sift.circuit_breaker import CircuitBreaker
+from sift.client import (
+    _STATUS_CHUNK_SIZE,
+    BaseClient,
+    Response,
+    StatusResponse,
+    TrackItem,
+    _StatusScanner,
+)
+from sift.compression import Compression
+from sift.concurrency import AdaptiveConcurrency
+from sift.constants import API_URL
+from sift.exceptions import ApiException
+from sift.hooks import Hooks, RequestInfo, _current_timings, _report_trace
+from sift.pool import PoolStats, httpx_limits, httpx_timeout
+from sift.rate_limit import RateLimiter
+from sift.retry import RetryPolicy
+from sift.single_flight import AsyncSingleFlight
+from sift.utils import JSONCodec
+from sift.version import API_VERSION
+
+if t.TYPE_CHECKING:
+    from sift.tracing import Tracing
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncClient(BaseClient[t.Awaitable[Response]]):
+    """A non-blocking counterpart of `sift.Client`.
+
+    It exposes the same methods with the same arguments and validation, but
+    every API method returns an awaitable resolving to a `Response`. Invalid
+    arguments raise `TypeError`/`ValueError` as soon as a method is called;
+    failed API calls raise `ApiException` when awaited.
+
+    Example:
+
+        async with sift.AsyncClient(api_key="...") as client:
+            response = await client.track("$login", properties)
+    """
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        api_url: str = API_URL,
+        timeout: float | tuple[float, float] = 2,
+        account_id: str | None = None,
+        version: str = API_VERSION,
+        session: httpx.AsyncClient | None = None,
+        retry: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        rate_limiter: RateLimiter | None = None,
+        score_cache: ScoreCache | None = None,
+        coalesce_reads: bool = False,
+        json_codec: str | JSONCodec = "json",
+        track_status_only: bool = False,
+        compression: Compression | None = None,
+        pool_maxsize: int = 32,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        http2: bool = False,
+        hooks: Hooks | None = None,
+        tracing: bool | Tracing | None = None,
+    ) -> None:
+        """Initialize the client.
+
+        Args:
+            api_key:
+                The Sift Science API key associated with your account. You can
+                obtain it from https://console.sift.com/developer/api-keys
+
+            api_url (optional):
+                Base URL, including scheme and host, for sending events.
+                Defaults to 'https://api.sift.com'.
+
+            timeout (optional):
+                How many seconds to wait for the server to send data before
+                giving up, as a float, or a (connect timeout, read timeout) tuple.
+                Defaults to 2 seconds.
+
+            account_id (optional):
+                The ID of your Sift Science account. You can obtain
+                it from https://developers.sift.com/console/account/profile
+
+            version (optional):
+                The version of the Sift Science API to call.
+                Defaults to the latest version.
+
+            session (optional):
+                httpx.AsyncClient object, e.g. to tune its connection pool
+                https://www.python-httpx.org/advanced/resource-limits/
+                The connection pool arguments below don't apply to it.
+
+            retry (optional):
+                A sift.retry.RetryPolicy applied to every call, unless
+                overridden by the `retry` argument of a call.
+                Defaults to no retries.
+
+            circuit_breaker (optional):
+                A sift.circuit_breaker.CircuitBreaker failing calls right away
+                while their endpoint family is unhealthy.
+
+            rate_limiter (optional):
+                A sift.rate_limit.RateLimiter pacing calls, per endpoint
+                family, to stay within the account's rate limits. Waiting
+                for a token doesn't block the event loop.
+
+            score_cache (optional):
+                A sift.cache.ScoreCache serving `get_user_score()` calls
+                from memory. Scores are cached per API key, so clients of
+                different Sift accounts may share it.
+
+            coalesce_reads (optional):
+                Set to True to let concurrent identical GET requests, such as
+                `get_user_score()` calls for the same user, share a single
+                HTTP request and its response. See sift.single_flight.
+
+            json_codec (optional):
+                The JSON codec serializing request bodies and parsing
+                responses: "json" for the standard library, "orjson",
+                "ujson", "simdjson", "auto" for the fastest one installed, or
+                a sift.utils.JSONCodec object. See sift.utils.get_json_codec.
+                Defaults to "json".
+
+            track_status_only (optional):
+                Set to True to make `track()` calls only read the API status
+                of responses, unless they request a score, actions,
+                a workflow status or warnings. See the `status_only`
+                argument of `track()`.
+
+            compression (optional):
+                A sift.compression.Compression compressing large request
+                bodies. Defaults to sending them uncompressed.
+
+            pool_maxsize (optional):
+                The maximum number of idle connections kept open. Defaults
+                to 32.
+
+            pool_block (optional):
+                Whether to wait for a connection to be free when
+                `pool_maxsize` are in use, instead of opening more
+                connections. Defaults to False.
+
+            keep_alive (optional):
+                Whether to reuse connections. Defaults to True.
+
+            http2 (optional):
+                Set to True to send calls over HTTP/2, multiplexing
+                concurrent calls over a few connections. Requires the
+                `http2` extra: pip install "Sift[http2]". Defaults to False.
+
+            hooks (optional):
+                A sift.hooks.Hooks whose functions are called around every
+                attempt to call the API, e.g. to export metrics.
+
+            tracing (optional):
+                Whether to wrap every API call in an OpenTelemetry span, see
+                sift.tracing, or a sift.tracing.Tracing creating the spans.
+                Defaults to tracing calls if the OpenTelemetry API is
+                installed.
+        """
+        super().__init__(
+            api_key,
+            api_url,
+            timeout,
+            account_id,
+            version,
+            retry,
+            circuit_breaker,
+            rate_limiter,
+            score_cache,
+            json_codec,
+            track_status_only,
+            compression,
+            hooks,
+            tracing,
+        )
+
+        # counters of the connection pool, unless a session is provided
+        self.pool_stats: PoolStats | None = None
+
+        if session is None:
+            session = httpx.AsyncClient(
+                http2=http2,
+                limits=httpx_limits(pool_maxsize, pool_block, keep_alive),
+            )
+            self.pool_stats = PoolStats()
+
+        self.session = session
+        self._httpx_auth: tuple[HTTPBasicAuth, httpx.Auth] | None = None
+        self.single_flight: AsyncSingleFlight[Response] | None = (
+            AsyncSingleFlight() if coalesce_reads else None
+        )
+        self._keep_alive: asyncio.Task[None] | None = None
+
+    async def _trace(self, event: str, info: dict[str, t.Any]) -> None:
+        # httpcore's tracing of the connections of a request
+        if (
+            event == "connection.connect_tcp.complete"
+            and self.pool_stats is not None
+        ):
+            self.pool_stats._count_new_connection()
+
+        _report_trace(event)
+
+    def _basic_auth(self, auth: HTTPBasicAuth | None) -> httpx.Auth | None:
+        # httpx.BasicAuth encodes its header once, reuse it as long as the
+        # client's credentials don't change
+        if auth is None:
+            return None
+
+        if self._httpx_auth is None or self._httpx_auth[0] is not auth:
+            self._httpx_auth = (
+                auth,
+                httpx.BasicAuth(auth.username, auth.password),
+            )
+
+        return self._httpx_auth[1]
+
+    async def __aenter__(self) -> AsyncClient:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """
+        Stops the keep-alive started by `warm_up()` and closes the underlying
+        connection pool.
+        """
+        if self._keep_alive is not None:
+            self._keep_alive.cancel()
+            self._keep_alive = None
+
+        await self.session.aclose()
+
+    async def warm_up(
+        self,
+        n_connections: int = 1,
+        keep_alive_interval: float | None = None,
+    ) -> int:
+        """
+        Opens connections to `api_url` ahead of traffic, e.g. on startup, so
+        that the first calls don't wait for DNS resolution and TCP and TLS
+        handshakes. httpx can't open a connection without a request, so this
+        sends `n_connections` concurrent HEAD requests to `api_url`.
+
+        Args:
+            n_connections (optional):
+                The number of connections to open, up to `pool_maxsize`;
+                connections which are already open count towards it.
+                Defaults to 1.
+
+            keep_alive_interval (optional):
+                Set to a number of seconds to repeat the HEAD requests from
+                a background task at this interval while the client is idle,
+                so that neither the server nor a load balancer closes the
+                connections, and closed ones are reopened. Choose an interval
+                below their idle timeout. Stopped by `aclose()`. Defaults to
+                no keep-alive.
+
+        Returns:
+            The number of connections opened.
+
+        Raises:
+            ApiException: If a request failed.
+        """
+        self._assert_warm_up(n_connections, keep_alive_interval)
+        opened = await self._warm_up(n_connections)
+
+        if keep_alive_interval is not None:
+            if self._keep_alive is not None:
+                self._keep_alive.cancel()
+
+            self._keep_alive = asyncio.ensure_future(
+                self._run_keep_alive(n_connections, keep_alive_interval)
+            )
+
+        return opened
+
+    async def _warm_up(self, n_connections: int) -> int:
+        opened = 0
+
+        async def trace(event: str, info: dict[str, t.Any]) -> None:
+            nonlocal opened
+
+            if event == "connection.connect_tcp.complete":
+                opened += 1
+
+                if self.pool_stats is not None:
+                    self.pool_stats._count_new_connection()
+                    self.pool_stats._count_warmed_connection()
+
+        try:
+            await asyncio.gather(
+                *(
+                    self.session.head(
+                        self.url,
+                        timeout=self._timeout(self.timeout),
+                        extensions={"trace": trace},
+                    )
+                    for _ in range(n_connections)
+                )
+            )
+        except httpx.HTTPError as e:
+            raise ApiException(str(e), self.url)
+
+        return opened
+
+    async def _run_keep_alive(
+        self, n_connections: int, interval: float
+    ) -> None:
+        # pings unless requests were sent in the meantime, which keeps
+        # connections open anyway
+        requests = self._requests_sent()
+
+        while True:
+            await asyncio.sleep(interval)
+
+            if self._requests_sent() == requests:
+                try:
+                    await self._warm_up(n_connections)
+                except ApiException:
+                    logger.warning("Keep-alive ping failed", exc_info=True)
+
+            requests = self._requests_sent()
+
+    def _requests_sent(self) -> int:
+        # without pool statistics the client always looks idle
+        return self.pool_stats.requests if self.pool_stats is not None else 0
+
+    def _timeout(self, timeout: float | tuple[float, float]) -> httpx.Timeout:
+        return httpx_timeout(timeout)
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        *,
+        endpoint: str,
+        event_type: str | None = None,
+        **kwargs: t.Any,
+    ) -> Response:
+        if self.tracing is None:
+            return await self._call(method, url, endpoint=endpoint, **kwargs)
+
+        with self._span(method, url, endpoint, event_type, kwargs) as call:
+            response = await self._call(
+                method, url, endpoint=endpoint, **kwargs
+            )
+            call.status = response.http_status_code
+            return response
+
+    async def _call(
+        self,
+        method: str,
+        url: str,
+        *,
+        endpoint: str,
+        retry: RetryPolicy | None = None,
+        cache_key: ScoreCacheKey | None = None,
+        invalidates: str | None = None,
+        status_only: bool = False,
+        **kwargs: t.Any,
+    ) -> Response:
+        if status_only:
+            kwargs["stream"] = True
+
+        if self.compression is not None:
+            self._compress(kwargs)
+
+        if self.score_cache is None:
+            return await self._fetch(method, url, endpoint, retry, **kwargs)
+
+        if cache_key is not None:
+            cached, token = self.score_cache.get(cache_key)
+
+            if cached is not None:
+                return cached
+
+            response = None
+
+            try:
+                response = await self._fetch(
+                    method, url, endpoint, retry, **kwargs
+                )
+                return response
+            finally:
+                self.score_cache.put(cache_key, response, token)
+
+        try:
+            return await self._fetch(method, url, endpoint, retry, **kwargs)
+        finally:
+            if invalidates:
+                self.score_cache.invalidate(invalidates)
+
+    async def _fetch(
+        self,
+        method: str,
+        url: str,
+        endpoint: str,
+        retry: RetryPolicy | None,
+        **kwargs: t.Any,
+    ) -> Response:
+        if self.single_flight is None or method != "get":
+            return await self._send(method, url, endpoint, retry, **kwargs)
+
+        return await self.single_flight.do(
+            self._flight_key(url, kwargs.get("params")),
+            lambda: self._send(method, url, endpoint, retry, **kwargs),
+        )
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        endpoint: str,
+        retry: RetryPolicy | None,
+        params: dict[str, t.Any] | None = None,
+        data: str | bytes | None = None,
+        headers: dict[str, str] | None = None,
+        auth: HTTPBasicAuth | None = None,
+        timeout: float | tuple[float, float] | None = None,
+        stream: bool = False,
+    ) -> Response:
+        started = time.monotonic()
+        attempt = 1
+        # skip the instrumentation without hooks registered
+        hooks = self.hooks or None
+
+        while True:
+            info = (
+                None
+                if hooks is None
+                else self._request_info(
+                    method,
+                    url,
+                    endpoint,
+                    attempt,
+                    {"data": data, "headers": headers},
+                )
+            )
+
+            try:
+                wait = self._rate_limit_delay(url, endpoint)
+
+                if wait:
+                    await asyncio.sleep(wait)
+
+                generation = self._check_circuit(url, endpoint)
+            except ApiException as e:
+                if hooks is not None:
+                    hooks._on_error(t.cast(RequestInfo, info), e, None)
+
+                raise
+
+            attempt_started = time.monotonic()
+            http_response = None
+            request_sent = True
+
+            try:
+                try:
+                    if info is not None:
+                        t.cast(Hooks, hooks)._before_request(info)
+                        headers = info.headers
+
+                    request = self.session.build_request(
+                        method.upper(),
+                        url,
+                        params=params,
+                        content=data,
+                        headers=headers,
+                        timeout=self._timeout(
+                            self.timeout if timeout is None else timeout
+                        ),
+                        extensions=(
+                            {"trace": self._trace}
+                            if self.pool_stats is not None or info is not None
+                            else None
+                        ),
+                    )
+
+                    if self.pool_stats is not None:
+                        self.pool_stats._count_request()
+
+                    if info is not None:
+                        _current_timings.set(info.timings)
+                        info.timings._start()
+
+                    http_response = await self.session.send(
+                        request,
+                        auth=self._basic_auth(auth),
+                        stream=stream,
+                    )
+                    status = (
+                        await self._scan_status(http_response)
+                        if stream
+                        else None
+                    )
+                except httpx.HTTPError as e:
+                    request_sent = not isinstance(
+                        e, (httpx.ConnectError, httpx.ConnectTimeout)
+                    )
+                    raise ApiException(str(e), url)
+                finally:
+                    if info is not None:
+                        self._after_response(
+                            t.cast(Hooks, hooks), info, http_response
+                        )
+
+                response = (
+                    StatusResponse(http_response, *status)
+                    if status
+                    else Response(http_response, self.json_codec)
+                )
+            except ApiException as e:
+                self._record_outcome(endpoint, attempt_started, e, generation)
+                delay = self._retry_delay(
+                    e,
+                    endpoint,
+                    retry,
+                    attempt,
+                    started,
+                    request_sent,
+                    (
+                        http_response.headers.get("Retry-After")
+                        if http_response is not None
+                        else None
+                    ),
+                )
+
+                if hooks is not None:
+                    hooks._on_error(t.cast(RequestInfo, info), e, delay)
+
+                if delay is None:
+                    raise
+            else:
+                self._record_outcome(
+                    endpoint, attempt_started, None, generation
+                )
+                return response
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    async def _scan_status(
+        http_response: httpx.Response,
+    ) -> tuple[int | None, str | None] | None:
+        # see `sift.Client._scan_status()`
+        try:
+            if not 200 <= http_response.status_code < 300:
+                await http_response.aread()
+                return None
+
+            scanner = _StatusScanner()
+
+            async for chunk in http_response.aiter_bytes(_STATUS_CHUNK_SIZE):
+                scanner.feed(chunk)
+
+            return scanner.api_status, scanner.api_error_message
+        finally:
+            await http_response.aclose()
+
+    async def track_many(
+        self,
+        events: Iterable[TrackItem],
+        max_concurrency: int = 10,
+        ordered: bool = True,
+        concurrency: AdaptiveConcurrency | None = None,
+    ) -> AsyncIterator[tuple[int, Response | ApiException]]:
+        """
+        Tracks a stream of events, keeping up to `max_concurrency` requests
+        in flight. See `sift.Client.track_many()` for the arguments.
+
+        Yields:
+            (index, result) tuples, where `index` is the position of the event
+            in `events` and `result` is a sift.client.Response object if the
+            call was successful or the ApiException raised otherwise.
+
+        Raises:
+            TypeError, ValueError: If an event has invalid arguments
+        """
+        self._assert_max_concurrency(max_concurrency)
+
+        async def send(item: TrackItem) -> Response | ApiException:
+            started = time.monotonic()
+
+            try:
+                response = await self._track_item(item)
+            except ApiException as e:
+                if concurrency is not None:
+                    concurrency.record(time.monotonic() - started, e)
+
+                return e
+
+            if concurrency is not None:
+                concurrency.record(time.monotonic() - started)
+
+            return response
+
+        def window_size() -> int:
+            if concurrency is None:
+                return max_concurrency
+
+            return min(max_concurrency, concurrency.limit)
+
+        window: deque[tuple[int, asyncio.Future[Response | ApiException]]]
+        window = deque()
+        pending: dict[asyncio.Future[Response | ApiException], int] = {}
+
+        try:
+            if ordered:
+                for index, item in enumerate(events):
+                    while len(window) >= window_size():
+                        head, future = window.popleft()
+                        yield head, await future
+
+                    window.append((index, asyncio.ensure_future(send(item))))
+
+                while window:
+                    head, future = window.popleft()
+                    yield head, await future
+            else:
+                for index, item in enumerate(events):
+                    while len(pending) >= window_size():
+                        done, _ = await asyncio.wait(
+                            pending, return_when=asyncio.FIRST_COMPLETED
+                        )
+
+                        for future in done:
+                            yield pending.pop(future), future.result()
+
+                    pending[asyncio.ensure_future(send(item))] = index
+
+                while pending:
+                    done, _ = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+
+                    for future in done:
+                        yield pending.pop(future), future.result()
+        finally:
+            # the consumer stopped early or an event failed validation
+            for future in (*pending, *(future for _, future in window)):
+                future.cancel()
@@ -0,0 +1,174 @@
+"""Caching of user scores.
+
+`ScoreCache` keeps the responses of `client.get_user_score()` for `ttl`
+seconds, evicting the least recently used ones beyond `max_size`. Cached
+scores of a user are dropped when the client sends a call which changes
+them: `track()` with `return_score=True`, `rescore_user()`, `label()` and
+`apply_user_decision()`.
+
+Scores are cached per API key, so clients of different Sift accounts may
+share a cache.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import typing as t
+from collections import OrderedDict
+
+if t.TYPE_CHECKING:
+    from sift.client import Response
+
+# (user_id, abuse_types, include_score_percentiles, api_key)
+ScoreCacheKey = t.Tuple[str, t.Optional[t.Tuple[str, ...]], bool, str]
+
+
+class ScoreCache:
+    """A thread-safe TTL and LRU cache of user scores.
+
+    Cached `Response` objects are shared by every caller getting them from
+    the cache, so treat them as read-only.
+
+    Attributes:
+        hits: The number of lookups answered from the cache.
+        misses: The number of lookups sent to the Sift API.
+        evictions: The number of entries evicted to stay within `max_size`.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 60.0) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_size (optional):
+                The maximum number of cached responses. Defaults to 1024.
+
+            ttl (optional):
+                The number of seconds a response is served from the cache.
+                Defaults to 60 seconds.
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be a positive integer")
+
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # key -> (expiry time, response), least recently used first
+        self._entries: OrderedDict[ScoreCacheKey, tuple[float, Response]]
+        self._entries = OrderedDict()
+        # user_id -> keys of the user's entries
+        self._user_keys: dict[str, set[ScoreCacheKey]] = {}
+        # user_id -> [lookups awaiting `put()`, invalidations since the
+        # first of them], see `put()`
+        self._pending: dict[str, list[int]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_ratio(self) -> float:
+        """The share of lookups answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, key: ScoreCacheKey) -> tuple[Response | None, int]:
+        """
+        Looks up a response. Every miss must be followed by a `put()`, even
+        if the call failed.
+
+        Returns:
+            The cached response, or None and a token to pass to `put()`.
+        """
+        user_id = key[0]
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1], 0
+
+            if entry is not None:
+                self._remove(key)
+
+            self.misses += 1
+            pending = self._pending.setdefault(user_id, [0, 0])
+            pending[0] += 1
+
+            return None, pending[1]
+
+    def put(
+        self,
+        key: ScoreCacheKey,
+        response: Response | None,
+        token: int,
+    ) -> None:
+        """
+        Caches the response fetched after a miss of `get()`, unless the
+        user's scores were invalidated since: the response may predate the
+        change.
+
+        Args:
+            key:
+                The key passed to `get()`.
+
+            response:
+                The response, or None if the call failed.
+
+            token:
+                The token returned by `get()`.
+        """
+        user_id = key[0]
+
+        with self._lock:
+            pending = self._pending[user_id]
+            pending[0] -= 1
+
+            if not pending[0]:
+                del self._pending[user_id]
+
+            if response is None or pending[1] != token:
+                return
+
+            self._entries[key] = (time.monotonic() + self.ttl, response)
+            self._entries.move_to_end(key)
+            self._user_keys.setdefault(user_id, set()).add(key)
+
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, user_id: str) -> None:
+        """Drops the cached scores of a user, whatever the API key."""
+        with self._lock:
+            self._invalidate(user_id)
+
+    def clear(self) -> None:
+        """Drops every cached score."""
+        with self._lock:
+            for user_id in {*self._user_keys, *self._pending}:
+                self._invalidate(user_id)
+
+    def _invalidate(self, user_id: str) -> None:
+        # called with `_lock` held
+        if user_id in self._pending:
+            self._pending[user_id][1] += 1
+
+        for key in self._user_keys.pop(user_id, ()):
+            del self._entries[key]
+
+    def _remove(self, key: ScoreCacheKey) -> None:
+        # called with `_lock` held
+        del self._entries[key]
+        keys = self._user_keys[key[0]]
+        keys.discard(key)
+
+        if not keys:
+            del self._user_keys[key[0]]
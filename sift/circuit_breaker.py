@@ -0,0 +1,283 @@
+"""Client-side circuit breaking.
+
+A `CircuitBreaker` watches the outcome of calls per endpoint family
+("events", "score", "decisions", ...). When too many recent calls of
+a family failed or were slow, its circuit opens and further calls fail right
+away with `CircuitOpenException` instead of waiting for a timeout. After
+`reset_timeout` seconds a few probe calls are let through: if they succeed
+the circuit closes again, otherwise it stays open for another
+`reset_timeout`. The outcome of a call made by a client is ignored if the
+circuit changed state since the call started, e.g. a call started while the
+circuit was closed doesn't count as a probe.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import typing as t
+from collections import deque
+
+from sift.exceptions import ApiException
+from sift.retry import SERVER_ERROR_API_STATUSES
+
+CircuitState = t.Literal["closed", "open", "half_open"]
+
+
+def is_failure(error: ApiException | None) -> bool:
+    """Whether a call outcome says the Sift API is unhealthy: connection
+    errors, timeouts and server-side errors. Client errors, such as invalid
+    requests, are not failures.
+    """
+    if error is None:
+        return False
+
+    return (
+        error.http_status_code is None
+        or error.http_status_code >= 500
+        or error.api_status in SERVER_ERROR_API_STATUSES
+    )
+
+
+class _Circuit:
+    def __init__(self) -> None:
+        self.state: CircuitState = "closed"
+        # (time, failed, slow) of the calls of the rolling window
+        self.calls: deque[tuple[float, bool, bool]] = deque()
+        self.failures = 0
+        self.slow_calls = 0
+        self.opened_at = 0.0
+        self.probing_since = 0.0
+        self.probes_started = 0
+        self.probes_succeeded = 0
+        # incremented on every change of state, see `CircuitBreaker._allow()`
+        self.generation = 0
+
+
+class CircuitBreaker:
+    """Short-circuits calls to endpoint families which are failing.
+
+    A circuit opens when, over the last `window` seconds, at least
+    `minimum_calls` calls were made and either the share of failed calls
+    reached `failure_rate_threshold` or the share of calls slower than
+    `slow_call_duration` reached `slow_call_rate_threshold`.
+
+    One instance may be shared by several clients, e.g. the threads of
+    a worker pool.
+    """
+
+    def __init__(
+        self,
+        failure_rate_threshold: float = 0.5,
+        slow_call_duration: float | None = None,
+        slow_call_rate_threshold: float = 1.0,
+        minimum_calls: int = 20,
+        window: float = 10.0,
+        reset_timeout: float = 30.0,
+        half_open_probes: int = 1,
+    ) -> None:
+        """Initialize the circuit breaker.
+
+        Args:
+            failure_rate_threshold (optional):
+                The share of failed calls, between 0 and 1, opening the
+                circuit. Connection errors, timeouts, HTTP 5XX and
+                server-side API statuses are failures. Defaults to 0.5.
+
+            slow_call_duration (optional):
+                The number of seconds after which a call is slow.
+                Defaults to not tracking slow calls.
+
+            slow_call_rate_threshold (optional):
+                The share of slow calls, between 0 and 1, opening the
+                circuit. Defaults to 1.
+
+            minimum_calls (optional):
+                The minimum number of calls in the window before the circuit
+                can open. Defaults to 20.
+
+            window (optional):
+                The number of seconds of calls the rates are computed over.
+                Defaults to 10 seconds.
+
+            reset_timeout (optional):
+                The number of seconds an open circuit rejects calls before
+                letting probe calls through. Defaults to 30 seconds.
+
+            half_open_probes (optional):
+                The number of successful probe calls closing the circuit.
+                Defaults to 1.
+        """
+        if minimum_calls < 1:
+            raise ValueError("minimum_calls must be a positive integer")
+
+        if half_open_probes < 1:
+            raise ValueError("half_open_probes must be a positive integer")
+
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_duration = slow_call_duration
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.minimum_calls = minimum_calls
+        self.window = window
+        self.reset_timeout = reset_timeout
+        self.half_open_probes = half_open_probes
+
+        self._circuits: dict[str, _Circuit] = {}
+        self._lock = threading.Lock()
+
+    def _circuit(self, family: str) -> _Circuit:
+        # called with `_lock` held
+        circuit = self._circuits.get(family)
+
+        if circuit is None:
+            circuit = self._circuits[family] = _Circuit()
+
+        return circuit
+
+    def state(self, family: str) -> CircuitState:
+        """The state of the circuit of an endpoint family."""
+        with self._lock:
+            return self._circuit(family).state
+
+    def allow(self, family: str) -> float | None:
+        """
+        Decides whether a call to an endpoint family may be made. Every
+        allowed call must be followed by a `record()` of its outcome.
+
+        Returns:
+            None if the call may be made, otherwise the number of seconds
+            until probe calls are let through.
+        """
+        return self._allow(family)[0]
+
+    def _allow(self, family: str) -> tuple[float | None, int]:
+        # `allow()`, and the generation of the circuit, which clients pass to
+        # `_record()` so that outcomes from a previous state are ignored
+        now = time.monotonic()
+
+        with self._lock:
+            circuit = self._circuit(family)
+
+            if circuit.state == "closed":
+                return None, circuit.generation
+
+            if circuit.state == "open":
+                remaining = circuit.opened_at + self.reset_timeout - now
+
+                if remaining > 0:
+                    return remaining, circuit.generation
+
+                circuit.state = "half_open"
+                circuit.generation += 1
+                circuit.probing_since = now
+                circuit.probes_started = circuit.probes_succeeded = 0
+            elif circuit.probes_started >= self.half_open_probes:
+                remaining = circuit.probing_since + self.reset_timeout - now
+
+                if remaining > 0:
+                    return remaining, circuit.generation
+
+                # probes which never reported back, e.g. cancelled calls
+                circuit.probing_since = now
+                circuit.probes_started = circuit.probes_succeeded
+
+            circuit.probes_started += 1
+            return None, circuit.generation
+
+    def record(self, family: str, failed: bool, duration: float) -> None:
+        """
+        Records the outcome of a call allowed by `allow()`.
+
+        Args:
+            family:
+                The endpoint family of the call.
+
+            failed:
+                Whether the call failed, see `is_failure()`.
+
+            duration:
+                The duration of the call in seconds.
+        """
+        self._record(family, failed, duration, None)
+
+    def _record(
+        self,
+        family: str,
+        failed: bool,
+        duration: float,
+        generation: int | None,
+    ) -> None:
+        # `record()`, ignoring the outcome unless the circuit is still in
+        # `generation`, the one returned by `_allow()` when the call started
+        now = time.monotonic()
+        slow = (
+            self.slow_call_duration is not None
+            and duration >= self.slow_call_duration
+        )
+
+        with self._lock:
+            circuit = self._circuit(family)
+
+            if generation is not None and generation != circuit.generation:
+                # a call which started in a previous state, e.g. before the
+                # circuit opened, which must not count as a probe
+                return
+
+            if circuit.state == "half_open":
+                if failed or slow:
+                    self._open(circuit, now)
+                else:
+                    circuit.probes_succeeded += 1
+
+                    if circuit.probes_succeeded >= self.half_open_probes:
+                        self._close(circuit)
+
+                return
+
+            if circuit.state == "open":
+                # a call which started before the circuit opened
+                return
+
+            circuit.calls.append((now, failed, slow))
+            circuit.failures += failed
+            circuit.slow_calls += slow
+
+            while circuit.calls and circuit.calls[0][0] <= now - self.window:
+                _, old_failed, old_slow = circuit.calls.popleft()
+                circuit.failures -= old_failed
+                circuit.slow_calls -= old_slow
+
+            calls = len(circuit.calls)
+
+            if calls >= self.minimum_calls and (
+                circuit.failures / calls >= self.failure_rate_threshold
+                or (
+                    self.slow_call_duration is not None
+                    and circuit.slow_calls / calls
+                    >= self.slow_call_rate_threshold
+                )
+            ):
+                self._open(circuit, now)
+
+    def reset(self, family: str | None = None) -> None:
+        """Closes the circuit of an endpoint family, or all circuits."""
+        with self._lock:
+            circuits = (
+                list(self._circuits.values())
+                if family is None
+                else [self._circuit(family)]
+            )
+
+            for circuit in circuits:
+                self._close(circuit)
+
+    def _open(self, circuit: _Circuit, now: float) -> None:
+        circuit.state = "open"
+        circuit.generation += 1
+        circuit.opened_at = now
+
+    def _close(self, circuit: _Circuit) -> None:
+        circuit.state = "closed"
+        circuit.generation += 1
+        circuit.calls.clear()
+        circuit.failures = circuit.slow_calls = 0
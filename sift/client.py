@@ -4,20 +4,64 @@ See: https://developers.sift.com/docs/python/events-api/
 
 from __future__ import annotations
 
+import abc
+import base64
+import functools
 import json
+import re
 import sys
+import time
 import typing as t
-from collections.abc import Mapping, Sequence
+from collections import deque
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
 
 import requests
+import urllib3
+from requests import PreparedRequest
 from requests.auth import HTTPBasicAuth
 
 import sift
+from sift.cache import ScoreCache, ScoreCacheKey
+from sift.circuit_breaker import CircuitBreaker, is_failure
+from sift.compression import ACCEPT_ENCODING, Compression
+from sift.concurrency import AdaptiveConcurrency
 from sift.constants import API_URL, DECISION_SOURCES
-from sift.exceptions import ApiException
-from sift.utils import DecimalEncoder, quote_path as _q
+from sift.exceptions import (
+    ApiException,
+    CircuitOpenException,
+    RateLimitedException,
+    TransportError,
+)
+from sift.hooks import Hooks, RequestInfo, _current_timings
+from sift.pool import PooledHTTPAdapter, PoolStats, _KeepAlive
+from sift.rate_limit import RateLimiter
+from sift.retry import RetryPolicy
+from sift.single_flight import SingleFlight
+from sift.transport import (
+    HttpRequest,
+    RequestsTransport,
+    Transport,
+    TransportResponse,
+)
+from sift.utils import (
+    JSONCodec,
+    StdlibJSONCodec,
+    get_json_codec,
+    quote_path as _q,
+)
 from sift.version import API_VERSION, VERSION
 
+if t.TYPE_CHECKING:
+    from contextlib import AbstractContextManager
+
+    from sift.tracing import Tracing, _Call
+
 
 def _assert_non_empty_str(
     val: object,
@@ -35,6 +79,30 @@ def _assert_non_empty_str(
         raise error_cls(error)
 
 
+@functools.lru_cache(maxsize=None)
+def _default_tracing() -> Tracing | None:
+    # calls are traced if the OpenTelemetry API is installed, with the global
+    # tracer provider
+    try:
+        from sift.tracing import Tracing
+    except ImportError:
+        return None
+
+    return Tracing()
+
+
+def _get_tracing(tracing: bool | Tracing | None) -> Tracing | None:
+    if tracing is None:
+        return _default_tracing()
+
+    if tracing is True:
+        from sift.tracing import Tracing
+
+        return Tracing()
+
+    return tracing or None
+
+
 def _assert_non_empty_dict(val: object, name: str) -> None:
     error = f"{name} must be a non-empty mapping (dict)"
 
@@ -45,57 +113,188 @@ def _assert_non_empty_dict(val: object, name: str) -> None:
         raise ValueError(error)
 
 
+def _body_size(data: str | bytes | None) -> int:
+    # the size in bytes of a request body, as encoded in UTF-8 when sent
+    if not data:
+        return 0
+
+    if isinstance(data, str) and not data.isascii():
+        return len(data.encode())
+
+    return len(data)
+
+
+class HttpResponse(t.Protocol):
+    """The subset of an HTTP library's response object that `Response` reads.
+
+    Both `requests.Response` and `httpx.Response` satisfy it.
+    """
+
+    @property
+    def url(self) -> t.Any:
+        """The URL of the request."""
+
+    @property
+    def status_code(self) -> int:
+        """The HTTP status code."""
+
+    @property
+    def text(self) -> str:
+        """The decoded response body."""
+
+    @property
+    def content(self) -> bytes:
+        """The raw response body."""
+
+    def json(self) -> t.Any:
+        """The response body parsed as JSON."""
+
+
+_STDLIB_JSON = StdlibJSONCodec()
+
+_PYTHON_VERSION = sys.version.split(" ")[0]
+
+
+class _BasicAuth(HTTPBasicAuth):
+    """An `HTTPBasicAuth` encoding its `Authorization` header once."""
+
+    def __init__(self, username: str, password: str) -> None:
+        super().__init__(username, password)
+        credentials = f"{username}:{password}".encode("latin1")
+        self._header = f"Basic {base64.b64encode(credentials).decode()}"
+
+    def __call__(self, r: PreparedRequest) -> PreparedRequest:
+        r.headers["Authorization"] = self._header
+        return r
+
+
 class Response:
+    """The result of a successful call to the Sift API.
+
+    The body is parsed on first access of `body`, `api_status`,
+    `api_error_message` or `request`, and the `request` echoed by the API on
+    first access of `request`, so callers only checking `is_ok()` don't pay
+    for parsing.
+    """
+
     HTTP_CODES_WITHOUT_BODY = (204, 304)
 
-    def __init__(self, http_response: requests.Response) -> None:
+    __slots__ = (
+        "url",
+        "http_status_code",
+        "_http_response",
+        "_codec",
+        "_body",
+        "_request",
+        "_parsed",
+    )
+
+    def __init__(
+        self,
+        http_response: HttpResponse,
+        codec: JSONCodec | None = None,
+    ) -> None:
         """
-        Raises ApiException on invalid JSON in Response body or non-2XX HTTP
-        status code.
+        Raises ApiException on non-2XX HTTP status code, or on invalid JSON
+        in Response body when the body is first accessed. The body is parsed
+        with `codec` if given, or else with the `json()` method of the HTTP
+        library's response.
         """
 
-        self.url: str = http_response.url
+        self.url: str = str(http_response.url)
         self.http_status_code: int = http_response.status_code
-        self.api_status: int | None = None
-        self.api_error_message: str | None = None
-        self.body: dict[str, t.Any] | None = None
-        self.request: dict[str, t.Any] | None = None
-
-        if (
-            self.http_status_code not in self.HTTP_CODES_WITHOUT_BODY
-        ) and http_response.text:
+        self._http_response = http_response
+        self._codec = codec
+        self._body: dict[str, t.Any] | None = None
+        self._request: dict[str, t.Any] | None = None
+        # 0: not parsed, 1: body parsed, 2: body and request parsed
+        self._parsed = 0
+
+        if not 200 <= self.http_status_code < 300:
             try:
-                self.body = http_response.json()
-
-                if "status" in self.body:
-                    self.api_status = self.body["status"]
-
-                if "error_message" in self.body:
-                    self.api_error_message = self.body["error_message"]
-
-                if isinstance(self.body.get("request"), str):
-                    self.request = json.loads(self.body["request"])
-            except ValueError:
-                raise ApiException(
-                    f"Failed to parse json response from {self.url}",
-                    url=self.url,
-                    http_status_code=self.http_status_code,
-                    body=self.body,
-                    api_status=self.api_status,
-                    api_error_message=self.api_error_message,
-                    request=self.request,
-                )
+                self._parse_body()
             finally:
-                if not 200 <= self.http_status_code < 300:
-                    raise ApiException(
-                        f"{self.url} returned non-2XX http status code {self.http_status_code}",
-                        url=self.url,
-                        http_status_code=self.http_status_code,
-                        body=self.body,
-                        api_status=self.api_status,
-                        api_error_message=self.api_error_message,
-                        request=self.request,
-                    )
+                raise self._exception(
+                    f"{self.url} returned non-2XX http status code "
+                    f"{self.http_status_code}"
+                )
+
+    @property
+    def body(self) -> dict[str, t.Any] | None:
+        if not self._parsed:
+            self._parse_body()
+
+        return self._body
+
+    @property
+    def api_status(self) -> int | None:
+        body = self.body
+        return body.get("status") if body is not None else None
+
+    @property
+    def api_error_message(self) -> str | None:
+        body = self.body
+        return body.get("error_message") if body is not None else None
+
+    @property
+    def request(self) -> dict[str, t.Any] | None:
+        if self._parsed < 2:
+            self._parse_request()
+
+        return self._request
+
+    def _parse_body(self) -> None:
+        http_response = self._http_response
+        codec = self._codec
+
+        try:
+            if (
+                self.http_status_code not in self.HTTP_CODES_WITHOUT_BODY
+            ) and (http_response.content if codec else http_response.text):
+                self._body = (
+                    codec.loads(http_response.content)
+                    if codec
+                    else http_response.json()
+                )
+        except ValueError:
+            # left unparsed, so that every access raises
+            raise self._exception(
+                f"Failed to parse json response from {self.url}"
+            )
+
+        # shared responses may be parsed concurrently, to the same result
+        self._parsed = 1
+
+    def _parse_request(self) -> None:
+        body = self.body
+
+        try:
+            if body is not None and isinstance(body.get("request"), str):
+                self._request = (self._codec or _STDLIB_JSON).loads(
+                    body["request"]
+                )
+        except ValueError:
+            raise self._exception(
+                f"Failed to parse json response from {self.url}"
+            )
+
+        self._parsed = 2
+
+    def _exception(self, message: str) -> ApiException:
+        # with what was parsed so far
+        body = self._body
+
+        return ApiException(
+            message,
+            url=self.url,
+            http_status_code=self.http_status_code,
+            body=body,
+            api_status=body.get("status") if body is not None else None,
+            api_error_message=(
+                body.get("error_message") if body is not None else None
+            ),
+            request=self._request,
+        )
 
     def __str__(self) -> str:
         body = (
@@ -107,50 +306,288 @@ class Response:
         return f'{body}"http_status_code": {self.http_status_code}'
 
     def is_ok(self) -> bool:
-        return self.api_status == 0 or self.http_status_code in (200, 204)
+        # the status code first, which doesn't require parsing the body
+        return self.http_status_code in (200, 204) or self.api_status == 0
 
 
-class Client:
-    api_key: str
-    account_id: str
+class StatusResponse(Response):
+    """A `Response` holding only the API status of a `track()` call made
+    with `status_only=True`.
+
+    Its `body` and `request` are None: the response body is scanned for
+    `status` and `error_message` as it is received, without being decoded
+    nor parsed.
+    """
+
+    __slots__ = ("_api_status", "_api_error_message")
 
     def __init__(
         self,
-        api_key: str | None = None,
-        api_url: str = API_URL,
-        timeout: float | tuple[float, float] = 2,
-        account_id: str | None = None,
-        version: str = API_VERSION,
-        session: requests.Session | None = None,
+        http_response: HttpResponse,
+        api_status: int | None,
+        api_error_message: str | None,
     ) -> None:
-        """Initialize the client.
+        self.url = str(http_response.url)
+        self.http_status_code = http_response.status_code
+        self._codec = None
+        self._body = None
+        self._request = None
+        self._parsed = 2
+        self._api_status = api_status
+        self._api_error_message = api_error_message
 
-        Args:
-            api_key:
-                The Sift Science API key associated with your account. You can
-                obtain it from https://console.sift.com/developer/api-keys
+    @property
+    def api_status(self) -> int | None:
+        return self._api_status
 
-            api_url (optional):
-                Base URL, including scheme and host, for sending events.
-                Defaults to 'https://api.sift.com'.
+    @property
+    def api_error_message(self) -> str | None:
+        return self._api_error_message
 
-            timeout (optional):
-                How many seconds to wait for the server to send data before
-                giving up, as a float, or a (connect timeout, read timeout) tuple.
-                Defaults to 2 seconds.
 
-            account_id (optional):
-                The ID of your Sift Science account. You can obtain
-                it from https://developers.sift.com/console/account/profile
+# bytes read at a time from the responses of status only calls
+_STATUS_CHUNK_SIZE = 4096
 
-            version (optional):
-                The version of the Sift Science API to call.
-                Defaults to the latest version.
 
-            session (optional):
-                requests.Session object
-                https://requests.readthedocs.io/en/latest/user/advanced/#session-objects
-        """
+class _StatusScanner:
+    """Finds `status` and `error_message` in the chunks of a response body.
+
+    The echoed `request` is a JSON string, in which the quotes of keys are
+    escaped, so its fields don't match. Chunks are only kept until both
+    fields are found.
+    """
+
+    _STATUS = re.compile(rb'"status"\s*:\s*(-?\d+)\s*[,}]')
+    _ERROR_MESSAGE = re.compile(rb'"error_message"\s*:\s*("(?:[^"\\]|\\.)*")')
+
+    def __init__(self) -> None:
+        self.api_status: int | None = None
+        self.api_error_message: str | None = None
+        self._buffer = b""
+        self._done = False
+
+    def feed(self, chunk: bytes) -> None:
+        if self._done:
+            return
+
+        self._buffer += chunk
+
+        if self.api_status is None:
+            match = self._STATUS.search(self._buffer)
+
+            if match:
+                self.api_status = int(match.group(1))
+
+        if self.api_error_message is None:
+            match = self._ERROR_MESSAGE.search(self._buffer)
+
+            if match:
+                self.api_error_message = json.loads(match.group(1))
+
+        if self.api_status is not None and self.api_error_message is not None:
+            self._done = True
+            self._buffer = b""
+
+
+_R = t.TypeVar("_R")
+
+# An event for `track_many`: (event, properties) or
+# (event, properties, keyword arguments for `track`)
+TrackItem = t.Union[
+    t.Tuple[str, Mapping[str, t.Any]],
+    t.Tuple[str, Mapping[str, t.Any], t.Optional[Mapping[str, t.Any]]],
+]
+
+
+class Endpoint(t.NamedTuple):
+    """Static description of an API method of the client."""
+
+    # the name of the client method
+    name: str
+    # the group of endpoints sharing a circuit, see CircuitBreaker
+    family: str
+    # whether repeating a request has no further effect on Sift's side, so
+    # it can be retried even if the failed attempt may have been processed
+    idempotent: bool
+    # the path of the endpoint without IDs, for `sift.hooks.RequestInfo` and
+    # tracing
+    path: str
+
+
+ENDPOINTS: dict[str, Endpoint] = {
+    endpoint.name: endpoint
+    for endpoint in (
+        Endpoint(
+            "track",
+            "events",
+            idempotent=False,
+            path="/v{version}/events",
+        ),
+        Endpoint(
+            "score",
+            "score",
+            idempotent=True,
+            path="/v{version}/score/{user_id}",
+        ),
+        Endpoint(
+            "get_user_score",
+            "score",
+            idempotent=True,
+            path="/v{version}/users/{user_id}/score",
+        ),
+        Endpoint(
+            "rescore_user",
+            "score",
+            idempotent=True,
+            path="/v{version}/users/{user_id}/score",
+        ),
+        Endpoint(
+            "label",
+            "labels",
+            idempotent=False,
+            path="/v{version}/users/{user_id}/labels",
+        ),
+        Endpoint(
+            "unlabel",
+            "labels",
+            idempotent=True,
+            path="/v{version}/users/{user_id}/labels",
+        ),
+        Endpoint(
+            "get_workflow_status",
+            "workflows",
+            idempotent=True,
+            path="/v3/accounts/{account_id}/workflows/runs/{run_id}",
+        ),
+        Endpoint(
+            "get_decisions",
+            "decisions",
+            idempotent=True,
+            path="/v3/accounts/{account_id}/decisions",
+        ),
+        Endpoint(
+            "apply_user_decision",
+            "decisions",
+            idempotent=False,
+            path="/v3/accounts/{account_id}/users/{user_id}/decisions",
+        ),
+        Endpoint(
+            "apply_order_decision",
+            "decisions",
+            idempotent=False,
+            path="/v3/accounts/{account_id}/users/{user_id}/orders/{order_id}/decisions",
+        ),
+        Endpoint(
+            "get_user_decisions",
+            "decisions",
+            idempotent=True,
+            path="/v3/accounts/{account_id}/users/{user_id}/decisions",
+        ),
+        Endpoint(
+            "get_order_decisions",
+            "decisions",
+            idempotent=True,
+            path="/v3/accounts/{account_id}/orders/{order_id}/decisions",
+        ),
+        Endpoint(
+            "get_content_decisions",
+            "decisions",
+            idempotent=True,
+            path="/v3/accounts/{account_id}/users/{user_id}/content/{content_id}/decisions",
+        ),
+        Endpoint(
+            "get_session_decisions",
+            "decisions",
+            idempotent=True,
+            path="/v3/accounts/{account_id}/users/{user_id}/sessions/{session_id}/decisions",
+        ),
+        Endpoint(
+            "apply_session_decision",
+            "decisions",
+            idempotent=False,
+            path="/v3/accounts/{account_id}/users/{user_id}/sessions/{session_id}/decisions",
+        ),
+        Endpoint(
+            "apply_content_decision",
+            "decisions",
+            idempotent=False,
+            path="/v3/accounts/{account_id}/users/{user_id}/content/{content_id}/decisions",
+        ),
+        Endpoint(
+            "create_psp_merchant_profile",
+            "psp_management",
+            idempotent=False,
+            path="/v3/accounts/{account_id}/psp_management/merchants",
+        ),
+        Endpoint(
+            "update_psp_merchant_profile",
+            "psp_management",
+            idempotent=True,
+            path="/v3/accounts/{account_id}/psp_management/merchants/{merchant_id}",
+        ),
+        Endpoint(
+            "get_psp_merchant_profiles",
+            "psp_management",
+            idempotent=True,
+            path="/v3/accounts/{account_id}/psp_management/merchants",
+        ),
+        Endpoint(
+            "get_a_psp_merchant_profile",
+            "psp_management",
+            idempotent=True,
+            path="/v3/accounts/{account_id}/psp_management/merchants/{merchant_id}",
+        ),
+        Endpoint(
+            "verification_send",
+            "verification",
+            idempotent=False,
+            path="/v1/verification/send",
+        ),
+        Endpoint(
+            "verification_resend",
+            "verification",
+            idempotent=False,
+            path="/v1/verification/resend",
+        ),
+        Endpoint(
+            "verification_check",
+            "verification",
+            idempotent=False,
+            path="/v1/verification/check",
+        ),
+    )
+}
+
+
+class BaseClient(abc.ABC, t.Generic[_R]):
+    """Validation, URL building and request assembly shared by `Client` and
+    `sift.async_client.AsyncClient`.
+
+    Every API method builds its request and hands it over to `_request`, so
+    the return type of the API methods is whatever `_request` returns:
+    a `Response` for the blocking client and an awaitable resolving to
+    a `Response` for the asyncio one.
+    """
+
+    account_id: str
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        api_url: str = API_URL,
+        timeout: float | tuple[float, float] = 2,
+        account_id: str | None = None,
+        version: str = API_VERSION,
+        retry: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        rate_limiter: RateLimiter | None = None,
+        score_cache: ScoreCache | None = None,
+        json_codec: str | JSONCodec = "json",
+        track_status_only: bool = False,
+        compression: Compression | None = None,
+        hooks: Hooks | None = None,
+        tracing: bool | Tracing | None = None,
+    ) -> None:
         _assert_non_empty_str(api_url, "api_url")
 
         if api_key is None:
@@ -158,12 +595,242 @@ class Client:
 
         _assert_non_empty_str(api_key, "api_key")
 
-        self.session = session or requests.Session()
+        self._headers_by_version: dict[
+            str, tuple[dict[str, str], dict[str, str]]
+        ] = {}
         self.api_key = t.cast(str, api_key)
         self.url = api_url
         self.timeout = timeout
         self.account_id = t.cast(str, account_id or sift.account_id)
         self.version = version
+        self.retry = retry
+        self.circuit_breaker = circuit_breaker
+        self.rate_limiter = rate_limiter
+        self.score_cache = score_cache
+        self.json_codec = (
+            get_json_codec(json_codec)
+            if isinstance(json_codec, str)
+            else json_codec
+        )
+        self.track_status_only = track_status_only
+        self.compression = compression
+        self.hooks = hooks
+        self.tracing = _get_tracing(tracing)
+
+    @abc.abstractmethod
+    def _request(
+        self,
+        method: str,
+        url: str,
+        *,
+        endpoint: str,
+        retry: RetryPolicy | None = None,
+        cache_key: ScoreCacheKey | None = None,
+        invalidates: str | None = None,
+        status_only: bool = False,
+        event_type: str | None = None,
+        params: dict[str, t.Any] | None = None,
+        data: str | bytes | None = None,
+        headers: dict[str, str] | None = None,
+        auth: HTTPBasicAuth | None = None,
+        timeout: float | tuple[float, float] | None = None,
+    ) -> _R:
+        """Sends a request to the Sift API, retrying it according to `retry`
+        or the client's policy, paced by the client's rate limiter, unless the
+        circuit of the endpoint family is open. `endpoint` is the name of the
+        calling API method, a key of `ENDPOINTS`.
+
+        With a score cache, the response is looked up in and stored under
+        `cache_key`, and the cached scores of the user `invalidates` are
+        dropped once the request completes. With `status_only`, the response
+        is a `StatusResponse`. `event_type` is the type of the tracked event,
+        for tracing. Other arguments follow the `requests` conventions.
+        """
+
+    def _compress(self, kwargs: dict[str, t.Any]) -> None:
+        # compresses the body of a `_request` call and sets its headers
+        compression = t.cast(Compression, self.compression)
+        headers = kwargs["headers"] = {
+            **(kwargs.get("headers") or {}),
+            "Accept-Encoding": ACCEPT_ENCODING,
+        }
+        data = kwargs.get("data")
+        compressed = compression.compress(data) if data else None
+
+        if compressed is not None:
+            kwargs["data"] = compressed
+            headers["Content-Encoding"] = compression.encoding
+
+    def _retry_delay(
+        self,
+        error: ApiException,
+        endpoint: str,
+        retry: RetryPolicy | None,
+        attempt: int,
+        started: float,
+        request_sent: bool,
+        retry_after: str | None,
+    ) -> float | None:
+        policy = self.retry if retry is None else retry
+
+        if policy is None:
+            return None
+
+        delay = policy.retry_delay(
+            error,
+            ENDPOINTS[endpoint].idempotent,
+            attempt,
+            time.monotonic() - started,
+            request_sent=request_sent,
+            retry_after=retry_after,
+        )
+
+        if delay is not None and self.tracing is not None:
+            self.tracing._count_retry()
+
+        return delay
+
+    def _rate_limit_delay(self, url: str, endpoint: str) -> float:
+        if self.rate_limiter is None:
+            return 0.0
+
+        family = ENDPOINTS[endpoint].family
+        delay = self.rate_limiter.reserve(family)
+
+        if delay is None:
+            raise RateLimitedException(url, family)
+
+        return delay
+
+    def _check_circuit(self, url: str, endpoint: str) -> int | None:
+        # returns the generation of the circuit to pass to `_record_outcome`
+        if self.circuit_breaker is None:
+            return None
+
+        family = ENDPOINTS[endpoint].family
+        retry_after, generation = self.circuit_breaker._allow(family)
+
+        if retry_after is not None:
+            raise CircuitOpenException(url, family, retry_after)
+
+        return generation
+
+    def _record_outcome(
+        self,
+        endpoint: str,
+        started: float,
+        error: ApiException | None,
+        generation: int | None,
+    ) -> None:
+        if self.circuit_breaker is not None:
+            self.circuit_breaker._record(
+                ENDPOINTS[endpoint].family,
+                is_failure(error),
+                time.monotonic() - started,
+                generation,
+            )
+
+    def _request_info(
+        self,
+        method: str,
+        url: str,
+        endpoint: str,
+        attempt: int,
+        kwargs: Mapping[str, t.Any],
+    ) -> RequestInfo:
+        # the description of an attempt passed to hooks
+        data = kwargs.get("data")
+
+        return RequestInfo(
+            endpoint,
+            ENDPOINTS[endpoint].family,
+            method.upper(),
+            self._url_template(url, endpoint),
+            _body_size(data),
+            attempt,
+            dict(kwargs.get("headers") or {}),
+        )
+
+    def _url_template(self, url: str, endpoint: str) -> str:
+        # the path of the endpoint with the API version of `url`
+        path = ENDPOINTS[endpoint].path
+
+        if path.startswith("/v{version}/") and url.startswith(f"{self.url}/v"):
+            start = len(self.url) + 2
+            end = url.index("/", start)
+            path = path.replace("{version}", url[start:end], 1)
+
+        return path
+
+    def _span(
+        self,
+        method: str,
+        url: str,
+        endpoint: str,
+        event_type: str | None,
+        kwargs: dict[str, t.Any],
+    ) -> AbstractContextManager[_Call]:
+        # the tracing span of a call, see `sift.tracing`
+        return t.cast("Tracing", self.tracing)._span(
+            endpoint,
+            ENDPOINTS[endpoint].family,
+            method.upper(),
+            self._url_template(url, endpoint),
+            event_type,
+            kwargs,
+        )
+
+    @staticmethod
+    def _after_response(
+        hooks: Hooks,
+        info: RequestInfo,
+        http_response: HttpResponse | None,
+    ) -> None:
+        # stops timing the attempt, then runs the after_response hooks if it
+        # got a response
+        info.timings._finish()
+        _current_timings.set(None)
+
+        if http_response is not None:
+            info.status = http_response.status_code
+            hooks._after_response(info)
+
+    def _track_item(self, item: TrackItem) -> _R:
+        event, properties, *rest = item
+        options = rest[0] if rest else None
+
+        return self.track(event, properties, **(options or {}))
+
+    @staticmethod
+    def _assert_max_concurrency(max_concurrency: int) -> None:
+        if not isinstance(max_concurrency, int):
+            raise TypeError("max_concurrency must be an integer")
+
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be a positive integer")
+
+    @staticmethod
+    def _assert_warm_up(
+        n_connections: int, keep_alive_interval: float | None
+    ) -> None:
+        if not isinstance(n_connections, int):
+            raise TypeError("n_connections must be an integer")
+
+        if n_connections < 1:
+            raise ValueError("n_connections must be a positive integer")
+
+        if keep_alive_interval is not None and keep_alive_interval <= 0:
+            raise ValueError("keep_alive_interval must be a positive number")
+
+    @staticmethod
+    def _flight_key(
+        url: str,
+        params: Mapping[str, t.Any] | None,
+    ) -> tuple[str, tuple[tuple[str, str], ...]]:
+        # identifies a GET request for `single_flight`
+        return url, tuple(
+            sorted((k, str(v)) for k, v in (params or {}).items())
+        )
 
     @staticmethod
     def _get_fields_param(
@@ -180,27 +847,47 @@ class Client:
         ]
 
     @property
-    def _auth(self) -> HTTPBasicAuth:
-        return HTTPBasicAuth(self.api_key, "")
+    def api_key(self) -> str:
+        return self._api_key
+
+    @api_key.setter
+    def api_key(self, api_key: str) -> None:
+        self._api_key = api_key
+        self._auth: HTTPBasicAuth = _BasicAuth(api_key, "")
 
     def _user_agent(self, version: str | None = None) -> str:
         return (
             f"SiftScience/v{version or self.version} "
             f"sift-python/{VERSION} "
-            f"Python/{sys.version.split(' ')[0]}"
+            f"Python/{_PYTHON_VERSION}"
         )
 
     def _default_headers(self, version: str | None = None) -> dict[str, str]:
-        return {
-            "User-Agent": self._user_agent(version),
-        }
+        return self._headers(version or self.version)[0]
 
     def _post_headers(self, version: str | None = None) -> dict[str, str]:
-        return {
-            **self._default_headers(version),
-            "Content-type": "application/json",
-            "Accept": "*/*",
-        }
+        return self._headers(version or self.version)[1]
+
+    def _headers(self, version: str) -> tuple[dict[str, str], dict[str, str]]:
+        # the default and POST headers of an API version, built once; they
+        # are shared by every call, which must not modify them
+        headers = self._headers_by_version.get(version)
+
+        if headers is None:
+            default_headers = {
+                "User-Agent": self._user_agent(version),
+            }
+            post_headers = {
+                **default_headers,
+                "Content-type": "application/json",
+                "Accept": "*/*",
+            }
+            headers = self._headers_by_version[version] = (
+                default_headers,
+                post_headers,
+            )
+
+        return headers
 
     def _api_url(self, version: str, endpoint: str) -> str:
         return f"{self.url}/{version}{endpoint}"
@@ -368,11 +1055,14 @@ class Client:
         version: str | None = None,
         include_score_percentiles: bool = False,
         include_warnings: bool = False,
-    ) -> Response:
+        retry: RetryPolicy | None = None,
+        status_only: bool | None = None,
+    ) -> _R:
         """
         Track an event and associated properties to the Sift Science client.
 
-        This call is blocking.
+        This call is blocking. Use sift.dispatcher.Dispatcher to send events
+        from background threads instead.
 
         Visit https://developers.sift.com/docs/python/events-api/
         for more information on what types of events you can send and fields
@@ -441,6 +1131,17 @@ class Client:
                 They are not critical enough to reject the whole request,
                 but important enough to be fixed.
 
+            retry (optional):
+                A sift.retry.RetryPolicy for this call, overriding the
+                client's policy.
+
+            status_only (optional):
+                Set to True to only read the API status of the response, and
+                get a sift.client.StatusResponse without body. It can't be
+                combined with the options adding data to the response.
+                Defaults to the client's `track_status_only`, which is
+                ignored when such options are set.
+
         Returns:
             A sift.client.Response object if the call to the Sift API is successful
 
@@ -450,6 +1151,21 @@ class Client:
         _assert_non_empty_str(event, "event")
         _assert_non_empty_dict(properties, "properties")
 
+        needs_body = (
+            return_score
+            or return_action
+            or return_workflow_status
+            or include_warnings
+        )
+
+        if status_only is None:
+            status_only = self.track_status_only and not needs_body
+        elif status_only and needs_body:
+            raise ValueError(
+                "status_only can't be combined with return_score, "
+                "return_action, return_workflow_status or include_warnings"
+            )
+
         if version is None:
             version = self.version
 
@@ -492,18 +1208,19 @@ class Client:
         if include_fields:
             params["fields"] = ",".join(include_fields)
 
-        try:
-            response = self.session.post(
-                path,
-                data=json.dumps(_properties, cls=DecimalEncoder),
-                headers=self._post_headers(version),
-                timeout=timeout,
-                params=params,
-            )
-        except requests.exceptions.RequestException as e:
-            raise ApiException(str(e), path)
-
-        return Response(response)
+        return self._request(
+            "post",
+            path,
+            endpoint="track",
+            event_type=event,
+            invalidates=properties.get("$user_id") if return_score else None,
+            status_only=status_only,
+            data=self.json_codec.dumps(_properties),
+            headers=self._post_headers(version),
+            timeout=timeout,
+            params=params,
+            retry=retry,
+        )
 
     def score(
         self,
@@ -512,7 +1229,8 @@ class Client:
         abuse_types: Sequence[str] | None = None,
         version: str | None = None,
         include_score_percentiles: bool = False,
-    ) -> Response:
+        retry: RetryPolicy | None = None,
+    ) -> _R:
         """
         Retrieves a user's fraud score from the Sift Science API.
 
@@ -544,6 +1262,10 @@ class Client:
                 if `include_score_percentiles` is True then add a new
                 parameter called `fields` in the query parameter
 
+            retry (optional):
+                A sift.retry.RetryPolicy for this call, overriding the
+                client's policy.
+
         Returns:
             A sift.client.Response object if the call to the Sift API is successful
 
@@ -568,18 +1290,16 @@ class Client:
 
         url = self._score_url(user_id, version)
 
-        try:
-            response = self.session.get(
-                url,
-                params=params,
-                auth=self._auth,
-                headers=self._default_headers(version),
-                timeout=timeout,
-            )
-        except requests.exceptions.RequestException as e:
-            raise ApiException(str(e), url)
-
-        return Response(response)
+        return self._request(
+            "get",
+            url,
+            endpoint="score",
+            params=params,
+            auth=self._auth,
+            headers=self._default_headers(version),
+            timeout=timeout,
+            retry=retry,
+        )
 
     def get_user_score(
         self,
@@ -587,7 +1307,8 @@ class Client:
         timeout: float | tuple[float, float] | None = None,
         abuse_types: Sequence[str] | None = None,
         include_score_percentiles: bool = False,
-    ) -> Response:
+        retry: RetryPolicy | None = None,
+    ) -> _R:
         """
         Fetches the latest score(s) computed for the specified user and
         abuse types from the Sift Science API. As opposed to client.score()
@@ -620,6 +1341,10 @@ class Client:
                 if include_score_percentiles is True then add a new parameter
                 called fields in the query parameter
 
+            retry (optional):
+                A sift.retry.RetryPolicy for this call, overriding the
+                client's policy.
+
         Returns:
             A sift.client.Response object if the call to the Sift API is successful
 
@@ -640,25 +1365,30 @@ class Client:
         if include_score_percentiles:
             params["fields"] = "SCORE_PERCENTILES"
 
-        try:
-            response = self.session.get(
-                url,
-                params=params,
-                auth=self._auth,
-                headers=self._default_headers(),
-                timeout=timeout,
-            )
-        except requests.exceptions.RequestException as e:
-            raise ApiException(str(e), url)
-
-        return Response(response)
+        return self._request(
+            "get",
+            url,
+            endpoint="get_user_score",
+            cache_key=(
+                user_id,
+                tuple(abuse_types) if abuse_types else None,
+                include_score_percentiles,
+                self.api_key,
+            ),
+            params=params,
+            auth=self._auth,
+            headers=self._default_headers(),
+            timeout=timeout,
+            retry=retry,
+        )
 
     def rescore_user(
         self,
         user_id: str,
         timeout: float | tuple[float, float] | None = None,
         abuse_types: Sequence[str] | None = None,
-    ) -> Response:
+        retry: RetryPolicy | None = None,
+    ) -> _R:
         """
         Rescores the specified user for the specified abuse types and returns
         the resulting score(s).
@@ -683,6 +1413,10 @@ class Client:
                 specified, a score will be returned for every abuse_type
                 to which you are subscribed.
 
+            retry (optional):
+                A sift.retry.RetryPolicy for this call, overriding the
+                client's policy.
+
         Returns:
             A sift.client.Response object if the call to the Sift API is successful
 
@@ -700,18 +1434,17 @@ class Client:
         if abuse_types:
             params["abuse_types"] = ",".join(abuse_types)
 
-        try:
-            response = self.session.post(
-                url,
-                params=params,
-                auth=self._auth,
-                headers=self._default_headers(),
-                timeout=timeout,
-            )
-        except requests.exceptions.RequestException as e:
-            raise ApiException(str(e), url)
-
-        return Response(response)
+        return self._request(
+            "post",
+            url,
+            endpoint="rescore_user",
+            invalidates=user_id,
+            params=params,
+            auth=self._auth,
+            headers=self._default_headers(),
+            timeout=timeout,
+            retry=retry,
+        )
 
     def label(
         self,
@@ -719,7 +1452,8 @@ class Client:
         properties: Mapping[str, t.Any],
         timeout: float | tuple[float, float] | None = None,
         version: str | None = None,
-    ) -> Response:
+        retry: RetryPolicy | None = None,
+    ) -> _R:
         """
         Labels a user as either good or bad through the Sift Science API.
 
@@ -743,6 +1477,10 @@ class Client:
             version (optional):
                 Use a different version of the Sift Science API for this call.
 
+            retry (optional):
+                A sift.retry.RetryPolicy for this call, overriding the
+                client's policy.
+
         Returns:
             A sift.client.Response object if the call to the Sift API is successful
 
@@ -750,16 +1488,30 @@ class Client:
             ApiException: If the call to the Sift API is not successful
         """
         _assert_non_empty_str(user_id, "user_id")
+        _assert_non_empty_dict(properties, "properties")
 
         if version is None:
             version = self.version
 
-        return self.track(
-            "$label",
-            properties,
-            path=self._labels_url(user_id, version),
+        if timeout is None:
+            timeout = self.timeout
+
+        _properties = {
+            **properties,
+            "$api_key": self.api_key,
+            "$type": "$label",
+        }
+
+        return self._request(
+            "post",
+            self._labels_url(user_id, version),
+            endpoint="label",
+            invalidates=user_id,
+            data=self.json_codec.dumps(_properties),
+            headers=self._post_headers(version),
             timeout=timeout,
-            version=version,
+            params={},
+            retry=retry,
         )
 
     def unlabel(
@@ -768,7 +1520,8 @@ class Client:
         timeout: float | tuple[float, float] | None = None,
         abuse_type: str | None = None,
         version: str | None = None,
-    ) -> Response:
+        retry: RetryPolicy | None = None,
+    ) -> _R:
         """
         Unlabels a user through the Sift Science API.
 
@@ -793,6 +1546,10 @@ class Client:
             version (optional):
                 Use a different version of the Sift Science API for this call.
 
+            retry (optional):
+                A sift.retry.RetryPolicy for this call, overriding the
+                client's policy.
+
         Returns:
             A sift.client.Response object if the call to the Sift API is successful
 
@@ -813,24 +1570,23 @@ class Client:
         if abuse_type:
             params["abuse_type"] = abuse_type
 
-        try:
-            response = self.session.delete(
-                url,
-                params=params,
-                auth=self._auth,
-                headers=self._default_headers(version),
-                timeout=timeout,
-            )
-        except requests.exceptions.RequestException as e:
-            raise ApiException(str(e), url)
-
-        return Response(response)
+        return self._request(
+            "delete",
+            url,
+            endpoint="unlabel",
+            params=params,
+            auth=self._auth,
+            headers=self._default_headers(version),
+            timeout=timeout,
+            retry=retry,
+        )
 
     def get_workflow_status(
         self,
         run_id: str,
         timeout: float | tuple[float, float] | None = None,
-    ) -> Response:
+        retry: RetryPolicy | None = None,
+    ) -> _R:
         """Gets the status of a workflow run.
 
         Args:
@@ -841,6 +1597,10 @@ class Client:
                 How many seconds to wait for the server to send data before
                 giving up, as a float, or a (connect timeout, read timeout) tuple.
 
+            retry (optional):
+                A sift.retry.RetryPolicy for this call, overriding the
+                client's policy.
+
         Returns:
             A sift.client.Response object if the call to the Sift API is successful
 
@@ -855,17 +1615,15 @@ class Client:
         if timeout is None:
             timeout = self.timeout
 
-        try:
-            response = self.session.get(
-                url,
-                auth=self._auth,
-                headers=self._default_headers(),
-                timeout=timeout,
-            )
-        except requests.exceptions.RequestException as e:
-            raise ApiException(str(e), url)
-
-        return Response(response)
+        return self._request(
+            "get",
+            url,
+            endpoint="get_workflow_status",
+            auth=self._auth,
+            headers=self._default_headers(),
+            timeout=timeout,
+            retry=retry,
+        )
 
     def get_decisions(
         self,
@@ -874,7 +1632,8 @@ class Client:
         start_from: int | None = None,
         abuse_types: Sequence[str] | None = None,
         timeout: float | tuple[float, float] | None = None,
-    ) -> Response:
+        retry: RetryPolicy | None = None,
+    ) -> _R:
         """Get decisions available to the customer
 
         Args:
@@ -896,6 +1655,10 @@ class Client:
                 How many seconds to wait for the server to send data before
                 giving up, as a float, or a (connect timeout, read timeout) tuple.
 
+            retry (optional):
+                A sift.retry.RetryPolicy for this call, overriding the
+                client's policy.
+
         Returns:
             A sift.client.Response object if the call to the Sift API is successful
 
@@ -935,25 +1698,24 @@ class Client:
 
         url = self._decisions_url(self.account_id)
 
-        try:
-            response = self.session.get(
-                url,
-                params=params,
-                auth=self._auth,
-                headers=self._default_headers(),
-                timeout=timeout,
-            )
-        except requests.exceptions.RequestException as e:
-            raise ApiException(str(e), url)
-
-        return Response(response)
+        return self._request(
+            "get",
+            url,
+            endpoint="get_decisions",
+            params=params,
+            auth=self._auth,
+            headers=self._default_headers(),
+            timeout=timeout,
+            retry=retry,
+        )
 
     def apply_user_decision(
         self,
         user_id: str,
         properties: Mapping[str, t.Any],
         timeout: float | tuple[float, float] | None = None,
-    ) -> Response:
+        retry: RetryPolicy | None = None,
+    ) -> _R:
         """Apply decision to a user
 
         Args:
@@ -969,6 +1731,10 @@ class Client:
                 How many seconds to wait for the server to send data before
                 giving up, as a float, or a (connect timeout, read timeout) tuple.
 
+            retry (optional):
+                A sift.retry.RetryPolicy for this call, overriding the
+                client's policy.
+
         Returns:
             A sift.client.Response object if the call to the Sift API is successful
 
@@ -984,18 +1750,17 @@ class Client:
 
         url = self._user_decisions_url(self.account_id, user_id)
 
-        try:
-            response = self.session.post(
-                url,
-                data=json.dumps(properties),
-                auth=self._auth,
-                headers=self._post_headers(),
-                timeout=timeout,
-            )
-        except requests.exceptions.RequestException as e:
-            raise ApiException(str(e), url)
-
-        return Response(response)
+        return self._request(
+            "post",
+            url,
+            endpoint="apply_user_decision",
+            invalidates=user_id,
+            data=self.json_codec.dumps(properties),
+            auth=self._auth,
+            headers=self._post_headers(),
+            timeout=timeout,
+            retry=retry,
+        )
 
     def apply_order_decision(
         self,
@@ -1003,7 +1768,8 @@ class Client:
         order_id: str,
         properties: Mapping[str, t.Any],
         timeout: float | tuple[float, float] | None = None,
-    ) -> Response:
+        retry: RetryPolicy | None = None,
+    ) -> _R:
         """Apply decision to order
 
         Args:
@@ -1024,6 +1790,10 @@ class Client:
                 How many seconds to wait for the server to send data before
                 giving up, as a float, or a (connect timeout, read timeout) tuple.
 
+            retry (optional):
+                A sift.retry.RetryPolicy for this call, overriding the
+                client's policy.
+
         Returns:
             A sift.client.Response object if the call to the Sift API is successful
 
@@ -1044,24 +1814,23 @@ class Client:
             self.account_id, user_id, order_id
         )
 
-        try:
-            response = self.session.post(
-                url,
-                data=json.dumps(properties),
-                auth=self._auth,
-                headers=self._post_headers(),
-                timeout=timeout,
-            )
-        except requests.exceptions.RequestException as e:
-            raise ApiException(str(e), url)
-
-        return Response(response)
+        return self._request(
+            "post",
+            url,
+            endpoint="apply_order_decision",
+            data=self.json_codec.dumps(properties),
+            auth=self._auth,
+            headers=self._post_headers(),
+            timeout=timeout,
+            retry=retry,
+        )
 
     def get_user_decisions(
         self,
         user_id: str,
         timeout: float | tuple[float, float] | None = None,
-    ) -> Response:
+        retry: RetryPolicy | None = None,
+    ) -> _R:
         """Gets the decisions for a user.
 
         Args:
@@ -1072,6 +1841,10 @@ class Client:
                 How many seconds to wait for the server to send data before
                 giving up, as a float, or a (connect timeout, read timeout) tuple.
 
+            retry (optional):
+                A sift.retry.RetryPolicy for this call, overriding the
+                client's policy.
+
         Returns:
             A sift.client.Response object if the call to the Sift API is successful
 
@@ -1087,23 +1860,22 @@ class Client:
 
         url = self._user_decisions_url(self.account_id, user_id)
 
-        try:
-            response = self.session.get(
-                url,
-                auth=self._auth,
-                headers=self._default_headers(),
-                timeout=timeout,
-            )
-        except requests.exceptions.RequestException as e:
-            raise ApiException(str(e), url)
-
-        return Response(response)
+        return self._request(
+            "get",
+            url,
+            endpoint="get_user_decisions",
+            auth=self._auth,
+            headers=self._default_headers(),
+            timeout=timeout,
+            retry=retry,
+        )
 
     def get_order_decisions(
         self,
         order_id: str,
         timeout: float | tuple[float, float] | None = None,
-    ) -> Response:
+        retry: RetryPolicy | None = None,
+    ) -> _R:
         """Gets the decisions for an order.
 
         Args:
@@ -1114,6 +1886,10 @@ class Client:
                 How many seconds to wait for the server to send data before
                 giving up, as a float, or a (connect timeout, read timeout) tuple.
 
+            retry (optional):
+                A sift.retry.RetryPolicy for this call, overriding the
+                client's policy.
+
         Returns:
             A sift.client.Response object if the call to the Sift API is successful
 
@@ -1129,24 +1905,23 @@ class Client:
 
         url = self._order_decisions_url(self.account_id, order_id)
 
-        try:
-            response = self.session.get(
-                url,
-                auth=self._auth,
-                headers=self._default_headers(),
-                timeout=timeout,
-            )
-        except requests.exceptions.RequestException as e:
-            raise ApiException(str(e), url)
-
-        return Response(response)
+        return self._request(
+            "get",
+            url,
+            endpoint="get_order_decisions",
+            auth=self._auth,
+            headers=self._default_headers(),
+            timeout=timeout,
+            retry=retry,
+        )
 
     def get_content_decisions(
         self,
         user_id: str,
         content_id: str,
         timeout: float | tuple[float, float] | None = None,
-    ) -> Response:
+        retry: RetryPolicy | None = None,
+    ) -> _R:
         """Gets the decisions for a piece of content.
 
         Args:
@@ -1160,6 +1935,10 @@ class Client:
                 How many seconds to wait for the server to send data before
                 giving up, as a float, or a (connect timeout, read timeout) tuple.
 
+            retry (optional):
+                A sift.retry.RetryPolicy for this call, overriding the
+                client's policy.
+
         Returns:
             A sift.client.Response object if the call to the Sift API is successful
 
@@ -1176,24 +1955,23 @@ class Client:
 
         url = self._content_decisions_url(self.account_id, user_id, content_id)
 
-        try:
-            response = self.session.get(
-                url,
-                auth=self._auth,
-                headers=self._default_headers(),
-                timeout=timeout,
-            )
-        except requests.exceptions.RequestException as e:
-            raise ApiException(str(e), url)
-
-        return Response(response)
+        return self._request(
+            "get",
+            url,
+            endpoint="get_content_decisions",
+            auth=self._auth,
+            headers=self._default_headers(),
+            timeout=timeout,
+            retry=retry,
+        )
 
     def get_session_decisions(
         self,
         user_id: str,
         session_id: str,
         timeout: float | tuple[float, float] | None = None,
-    ) -> Response:
+        retry: RetryPolicy | None = None,
+    ) -> _R:
         """Gets the decisions for a user's session.
 
         Args:
@@ -1207,6 +1985,10 @@ class Client:
                 How many seconds to wait for the server to send data before
                 giving up, as a float, or a (connect timeout, read timeout) tuple.
 
+            retry (optional):
+                A sift.retry.RetryPolicy for this call, overriding the
+                client's policy.
+
         Returns:
             A sift.client.Response object if the call to the Sift API is successful
 
@@ -1223,17 +2005,15 @@ class Client:
 
         url = self._session_decisions_url(self.account_id, user_id, session_id)
 
-        try:
-            response = self.session.get(
-                url,
-                auth=self._auth,
-                headers=self._default_headers(),
-                timeout=timeout,
-            )
-        except requests.exceptions.RequestException as e:
-            raise ApiException(str(e), url)
-
-        return Response(response)
+        return self._request(
+            "get",
+            url,
+            endpoint="get_session_decisions",
+            auth=self._auth,
+            headers=self._default_headers(),
+            timeout=timeout,
+            retry=retry,
+        )
 
     def apply_session_decision(
         self,
@@ -1241,7 +2021,8 @@ class Client:
         session_id: str,
         properties: Mapping[str, t.Any],
         timeout: float | tuple[float, float] | None = None,
-    ) -> Response:
+        retry: RetryPolicy | None = None,
+    ) -> _R:
         """Apply decision to a session.
 
         Args:
@@ -1262,6 +2043,10 @@ class Client:
                 How many seconds to wait for the server to send data before
                 giving up, as a float, or a (connect timeout, read timeout) tuple.
 
+            retry (optional):
+                A sift.retry.RetryPolicy for this call, overriding the
+                client's policy.
+
         Returns:
             A sift.client.Response object if the call to the Sift API is successful
 
@@ -1280,18 +2065,16 @@ class Client:
 
         url = self._session_decisions_url(self.account_id, user_id, session_id)
 
-        try:
-            response = self.session.post(
-                url,
-                data=json.dumps(properties),
-                auth=self._auth,
-                headers=self._post_headers(),
-                timeout=timeout,
-            )
-        except requests.exceptions.RequestException as e:
-            raise ApiException(str(e), url)
-
-        return Response(response)
+        return self._request(
+            "post",
+            url,
+            endpoint="apply_session_decision",
+            data=self.json_codec.dumps(properties),
+            auth=self._auth,
+            headers=self._post_headers(),
+            timeout=timeout,
+            retry=retry,
+        )
 
     def apply_content_decision(
         self,
@@ -1299,7 +2082,8 @@ class Client:
         content_id: str,
         properties: Mapping[str, t.Any],
         timeout: float | tuple[float, float] | None = None,
-    ) -> Response:
+        retry: RetryPolicy | None = None,
+    ) -> _R:
         """Apply decision to a piece of content.
 
         Args:
@@ -1320,6 +2104,10 @@ class Client:
                 How many seconds to wait for the server to send data before
                 giving up, as a float, or a (connect timeout, read timeout) tuple.
 
+            retry (optional):
+                A sift.retry.RetryPolicy for this call, overriding the
+                client's policy.
+
         Returns:
             A sift.client.Response object if the call to the Sift API is successful
 
@@ -1337,24 +2125,23 @@ class Client:
 
         url = self._content_decisions_url(self.account_id, user_id, content_id)
 
-        try:
-            response = self.session.post(
-                url,
-                data=json.dumps(properties),
-                auth=self._auth,
-                headers=self._post_headers(),
-                timeout=timeout,
-            )
-        except requests.exceptions.RequestException as e:
-            raise ApiException(str(e), url)
-
-        return Response(response)
+        return self._request(
+            "post",
+            url,
+            endpoint="apply_content_decision",
+            data=self.json_codec.dumps(properties),
+            auth=self._auth,
+            headers=self._post_headers(),
+            timeout=timeout,
+            retry=retry,
+        )
 
     def create_psp_merchant_profile(
         self,
         properties: Mapping[str, t.Any],
         timeout: float | tuple[float, float] | None = None,
-    ) -> Response:
+        retry: RetryPolicy | None = None,
+    ) -> _R:
         """Create a new PSP Merchant profile
 
         Args:
@@ -1365,6 +2152,10 @@ class Client:
                 How many seconds to wait for the server to send data before
                 giving up, as a float, or a (connect timeout, read timeout) tuple.
 
+            retry (optional):
+                A sift.retry.RetryPolicy for this call, overriding the
+                client's policy.
+
         Returns:
             A sift.client.Response object if the call to the Sift API is successful
 
@@ -1379,25 +2170,24 @@ class Client:
 
         url = self._psp_merchant_url(self.account_id)
 
-        try:
-            response = self.session.post(
-                url,
-                data=json.dumps(properties),
-                auth=self._auth,
-                headers=self._post_headers(),
-                timeout=timeout,
-            )
-        except requests.exceptions.RequestException as e:
-            raise ApiException(str(e), url)
-
-        return Response(response)
+        return self._request(
+            "post",
+            url,
+            endpoint="create_psp_merchant_profile",
+            data=self.json_codec.dumps(properties),
+            auth=self._auth,
+            headers=self._post_headers(),
+            timeout=timeout,
+            retry=retry,
+        )
 
     def update_psp_merchant_profile(
         self,
         merchant_id: str,
         properties: Mapping[str, t.Any],
         timeout: float | tuple[float, float] | None = None,
-    ) -> Response:
+        retry: RetryPolicy | None = None,
+    ) -> _R:
         """Update already existing PSP Merchant profile
 
         Args:
@@ -1412,6 +2202,10 @@ class Client:
                 How many seconds to wait for the server to send data before
                 giving up, as a float, or a (connect timeout, read timeout) tuple.
 
+            retry (optional):
+                A sift.retry.RetryPolicy for this call, overriding the
+                client's policy.
+
         Returns:
             A sift.client.Response object if the call to the Sift API is successful
 
@@ -1426,25 +2220,24 @@ class Client:
 
         url = self._psp_merchant_id_url(self.account_id, merchant_id)
 
-        try:
-            response = self.session.put(
-                url,
-                data=json.dumps(properties),
-                auth=self._auth,
-                headers=self._post_headers(),
-                timeout=timeout,
-            )
-        except requests.exceptions.RequestException as e:
-            raise ApiException(str(e), url)
-
-        return Response(response)
+        return self._request(
+            "put",
+            url,
+            endpoint="update_psp_merchant_profile",
+            data=self.json_codec.dumps(properties),
+            auth=self._auth,
+            headers=self._post_headers(),
+            timeout=timeout,
+            retry=retry,
+        )
 
     def get_psp_merchant_profiles(
         self,
         batch_token: str | None = None,
         batch_size: int | None = None,
         timeout: float | tuple[float, float] | None = None,
-    ) -> Response:
+        retry: RetryPolicy | None = None,
+    ) -> _R:
         """Gets all PSP merchant profiles (paginated).
 
         Args:
@@ -1458,6 +2251,10 @@ class Client:
                 How many seconds to wait for the server to send data before
                 giving up, as a float, or a (connect timeout, read timeout) tuple.
 
+            retry (optional):
+                A sift.retry.RetryPolicy for this call, overriding the
+                client's policy.
+
         Returns:
             A sift.client.Response object if the call to the Sift API is successful
 
@@ -1480,24 +2277,23 @@ class Client:
         if batch_token:
             params["batch_token"] = batch_token
 
-        try:
-            response = self.session.get(
-                url,
-                auth=self._auth,
-                headers=self._default_headers(),
-                params=params,
-                timeout=timeout,
-            )
-        except requests.exceptions.RequestException as e:
-            raise ApiException(str(e), url)
-
-        return Response(response)
+        return self._request(
+            "get",
+            url,
+            endpoint="get_psp_merchant_profiles",
+            auth=self._auth,
+            headers=self._default_headers(),
+            params=params,
+            timeout=timeout,
+            retry=retry,
+        )
 
     def get_a_psp_merchant_profile(
         self,
         merchant_id: str,
         timeout: float | tuple[float, float] | None = None,
-    ) -> Response:
+        retry: RetryPolicy | None = None,
+    ) -> _R:
         """Gets a PSP merchant profile by merchant id.
 
         Args:
@@ -1509,6 +2305,10 @@ class Client:
                 How many seconds to wait for the server to send data before
                 giving up, as a float, or a (connect timeout, read timeout) tuple.
 
+            retry (optional):
+                A sift.retry.RetryPolicy for this call, overriding the
+                client's policy.
+
         Returns:
             A sift.client.Response object if the call to the Sift API is successful
 
@@ -1523,24 +2323,23 @@ class Client:
 
         url = self._psp_merchant_id_url(self.account_id, merchant_id)
 
-        try:
-            response = self.session.get(
-                url,
-                auth=self._auth,
-                headers=self._default_headers(),
-                timeout=timeout,
-            )
-        except requests.exceptions.RequestException as e:
-            raise ApiException(str(e), url)
-
-        return Response(response)
+        return self._request(
+            "get",
+            url,
+            endpoint="get_a_psp_merchant_profile",
+            auth=self._auth,
+            headers=self._default_headers(),
+            timeout=timeout,
+            retry=retry,
+        )
 
     def verification_send(
         self,
         properties: Mapping[str, t.Any],
         timeout: float | tuple[float, float] | None = None,
         version: str | None = None,
-    ) -> Response:
+        retry: RetryPolicy | None = None,
+    ) -> _R:
         """
         The send call triggers the generation of an OTP code that is stored
         by Sift and email/sms the code to the user.
@@ -1591,6 +2390,10 @@ class Client:
             version (optional):
                 Use a different version of the Sift Science API for this call.
 
+            retry (optional):
+                A sift.retry.RetryPolicy for this call, overriding the
+                client's policy.
+
         Returns:
             A sift.client.Response object if the call to the Sift API is successful
 
@@ -1608,25 +2411,24 @@ class Client:
 
         url = self._verification_send_url()
 
-        try:
-            response = self.session.post(
-                url,
-                data=json.dumps(properties),
-                auth=self._auth,
-                headers=self._post_headers(version),
-                timeout=timeout,
-            )
-        except requests.exceptions.RequestException as e:
-            raise ApiException(str(e), url)
-
-        return Response(response)
+        return self._request(
+            "post",
+            url,
+            endpoint="verification_send",
+            data=self.json_codec.dumps(properties),
+            auth=self._auth,
+            headers=self._post_headers(version),
+            timeout=timeout,
+            retry=retry,
+        )
 
     def verification_resend(
         self,
         properties: Mapping[str, t.Any],
         timeout: float | tuple[float, float] | None = None,
         version: str | None = None,
-    ) -> Response:
+        retry: RetryPolicy | None = None,
+    ) -> _R:
         """
         A user can ask for a new OTP (one-time password) if they haven't
         received the previous one, or in case the previous OTP expired.
@@ -1653,6 +2455,10 @@ class Client:
             version (optional):
                 Use a different version of the Sift Science API for this call.
 
+            retry (optional):
+                A sift.retry.RetryPolicy for this call, overriding the
+                client's policy.
+
         Returns:
             A sift.client.Response object if the call to the Sift API is successful
 
@@ -1670,25 +2476,24 @@ class Client:
 
         url = self._verification_resend_url()
 
-        try:
-            response = self.session.post(
-                url,
-                data=json.dumps(properties),
-                auth=self._auth,
-                headers=self._post_headers(version),
-                timeout=timeout,
-            )
-        except requests.exceptions.RequestException as e:
-            raise ApiException(str(e), url)
-
-        return Response(response)
+        return self._request(
+            "post",
+            url,
+            endpoint="verification_resend",
+            data=self.json_codec.dumps(properties),
+            auth=self._auth,
+            headers=self._post_headers(version),
+            timeout=timeout,
+            retry=retry,
+        )
 
     def verification_check(
         self,
         properties: Mapping[str, t.Any],
         timeout: float | tuple[float, float] | None = None,
         version: str | None = None,
-    ) -> Response:
+        retry: RetryPolicy | None = None,
+    ) -> _R:
         """
         The verification_check call is used for checking the OTP provided by
         the end user to Sift. Sift then compares the OTP, checks rate limits
@@ -1720,6 +2525,10 @@ class Client:
             version (optional):
                 Use a different version of the Sift Science API for this call.
 
+            retry (optional):
+                A sift.retry.RetryPolicy for this call, overriding the
+                client's policy.
+
         Returns:
             A sift.client.Response object if the call to the Sift API is successful
 
@@ -1736,15 +2545,618 @@ class Client:
 
         url = self._verification_check_url()
 
+        return self._request(
+            "post",
+            url,
+            endpoint="verification_check",
+            data=self.json_codec.dumps(properties),
+            auth=self._auth,
+            headers=self._post_headers(version),
+            timeout=timeout,
+            retry=retry,
+        )
+
+
+class Client(BaseClient[Response]):
+    def __init__(
+        self,
+        api_key: str | None = None,
+        api_url: str = API_URL,
+        timeout: float | tuple[float, float] = 2,
+        account_id: str | None = None,
+        version: str = API_VERSION,
+        session: requests.Session | None = None,
+        retry: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        rate_limiter: RateLimiter | None = None,
+        score_cache: ScoreCache | None = None,
+        coalesce_reads: bool = False,
+        json_codec: str | JSONCodec = "json",
+        track_status_only: bool = False,
+        compression: Compression | None = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 32,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        http2: bool = False,
+        transport: Transport | None = None,
+        hooks: Hooks | None = None,
+        tracing: bool | Tracing | None = None,
+    ) -> None:
+        """Initialize the client.
+
+        Args:
+            api_key:
+                The Sift Science API key associated with your account. You can
+                obtain it from https://console.sift.com/developer/api-keys
+
+            api_url (optional):
+                Base URL, including scheme and host, for sending events.
+                Defaults to 'https://api.sift.com'.
+
+            timeout (optional):
+                How many seconds to wait for the server to send data before
+                giving up, as a float, or a (connect timeout, read timeout) tuple.
+                Defaults to 2 seconds.
+
+            account_id (optional):
+                The ID of your Sift Science account. You can obtain
+                it from https://developers.sift.com/console/account/profile
+
+            version (optional):
+                The version of the Sift Science API to call.
+                Defaults to the latest version.
+
+            session (optional):
+                requests.Session object
+                https://requests.readthedocs.io/en/latest/user/advanced/#session-objects
+                The connection pool arguments below don't apply to it.
+
+            retry (optional):
+                A sift.retry.RetryPolicy applied to every call, unless
+                overridden by the `retry` argument of a call.
+                Defaults to no retries.
+
+            circuit_breaker (optional):
+                A sift.circuit_breaker.CircuitBreaker failing calls right away
+                while their endpoint family is unhealthy.
+
+            rate_limiter (optional):
+                A sift.rate_limit.RateLimiter pacing calls, per endpoint
+                family, to stay within the account's rate limits.
+
+            score_cache (optional):
+                A sift.cache.ScoreCache serving `get_user_score()` calls
+                from memory. Scores are cached per API key, so clients of
+                different Sift accounts may share it.
+
+            coalesce_reads (optional):
+                Set to True to let concurrent identical GET requests, such as
+                `get_user_score()` calls for the same user, share a single
+                HTTP request and its response. See sift.single_flight.
+
+            json_codec (optional):
+                The JSON codec serializing request bodies and parsing
+                responses: "json" for the standard library, "orjson",
+                "ujson", "simdjson", "auto" for the fastest one installed, or
+                a sift.utils.JSONCodec object. See sift.utils.get_json_codec.
+                Defaults to "json".
+
+            track_status_only (optional):
+                Set to True to make `track()` calls only read the API status
+                of responses, unless they request a score, actions,
+                a workflow status or warnings. See the `status_only`
+                argument of `track()`.
+
+            compression (optional):
+                A sift.compression.Compression compressing large request
+                bodies. Defaults to sending them uncompressed.
+
+            pool_connections (optional):
+                The number of hosts to keep a pool of connections for.
+                Defaults to 10.
+
+            pool_maxsize (optional):
+                The maximum number of idle connections kept per host; set it
+                to the number of threads sharing the client. Defaults to 32.
+
+            pool_block (optional):
+                Whether to wait for a connection to be free when
+                `pool_maxsize` are in use, instead of opening a connection
+                which is closed after use. Defaults to False.
+
+            keep_alive (optional):
+                Whether to reuse connections, with TCP keep-alive probes
+                detecting dead ones. Defaults to True.
+
+            http2 (optional):
+                Set to True to send calls over HTTP/2 with a
+                sift.http2.HTTP2Transport, multiplexing concurrent calls over
+                a few connections. Requires the `http2` extra:
+                pip install "Sift[http2]". Defaults to False.
+
+            transport (optional):
+                A sift.transport.Transport sending the HTTP requests of the
+                client, instead of a requests.Session. The session and
+                connection pool arguments don't apply to it.
+
+            hooks (optional):
+                A sift.hooks.Hooks whose functions are called around every
+                attempt to call the API, e.g. to export metrics.
+
+            tracing (optional):
+                Whether to wrap every API call in an OpenTelemetry span, see
+                sift.tracing, or a sift.tracing.Tracing creating the spans.
+                Defaults to tracing calls if the OpenTelemetry API is
+                installed.
+        """
+        super().__init__(
+            api_key,
+            api_url,
+            timeout,
+            account_id,
+            version,
+            retry,
+            circuit_breaker,
+            rate_limiter,
+            score_cache,
+            json_codec,
+            track_status_only,
+            compression,
+            hooks,
+            tracing,
+        )
+
+        # counters of the connection pool, unless a session or transport is
+        # provided
+        self.pool_stats: PoolStats | None = None
+
+        if transport is None and session is None and http2:
+            from sift.http2 import HTTP2Transport
+
+            transport = HTTP2Transport(
+                pool_maxsize=pool_maxsize,
+                pool_block=pool_block,
+                keep_alive=keep_alive,
+            )
+            self.pool_stats = transport.stats
+        elif transport is None and session is None:
+            adapter = PooledHTTPAdapter(
+                pool_connections, pool_maxsize, pool_block, keep_alive
+            )
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self.pool_stats = adapter.stats
+
+        self.transport: Transport = (
+            RequestsTransport(t.cast(requests.Session, session))
+            if transport is None
+            else transport
+        )
+        self.single_flight: SingleFlight[Response] | None = (
+            SingleFlight() if coalesce_reads else None
+        )
+        self._keep_alive: _KeepAlive | None = None
+
+    @property
+    def session(self) -> requests.Session:
+        """The requests.Session of the default transport."""
+        if not isinstance(self.transport, RequestsTransport):
+            raise AttributeError(
+                f"{type(self.transport).__name__} has no requests.Session"
+            )
+
+        return self.transport.session
+
+    @session.setter
+    def session(self, session: requests.Session) -> None:
+        self.transport = RequestsTransport(session)
+
+    def warm_up(
+        self,
+        n_connections: int = 1,
+        keep_alive_interval: float | None = None,
+    ) -> int:
+        """
+        Opens connections to `api_url` ahead of traffic, e.g. on startup, so
+        that the first calls don't wait for DNS resolution and TCP and TLS
+        handshakes.
+
+        Args:
+            n_connections (optional):
+                The number of connections to open, up to `pool_maxsize`;
+                connections which are already open count towards it.
+                Defaults to 1.
+
+            keep_alive_interval (optional):
+                Set to a number of seconds to check the connections from
+                a background thread at this interval while the client is idle,
+                sending a HEAD request over each open connection so that
+                neither the server nor a load balancer closes them, and
+                reopening the closed ones. Choose an interval below their idle
+                timeout. Stopped by `close()`. Defaults to no keep-alive.
+
+        Returns:
+            The number of connections opened.
+
+        Raises:
+            ValueError: If the client doesn't send its calls with
+                a requests.Session using a sift.pool.PooledHTTPAdapter for
+                `api_url`.
+            ApiException: If a connection failed.
+        """
+        self._assert_warm_up(n_connections, keep_alive_interval)
+        transport = self.transport
+
+        if not isinstance(transport, RequestsTransport) or not isinstance(
+            transport.session.get_adapter(self.url), PooledHTTPAdapter
+        ):
+            raise ValueError(
+                "warm_up() needs a session using a sift.pool.PooledHTTPAdapter"
+            )
+
+        session = transport.session
+        adapter = t.cast(PooledHTTPAdapter, session.get_adapter(self.url))
+        opened = self._warm_up(session, adapter, n_connections)
+
+        if keep_alive_interval is not None:
+            if self._keep_alive is not None:
+                self._keep_alive.stop()
+
+            self._keep_alive = _KeepAlive(
+                lambda: self._warm_up(
+                    session, adapter, n_connections, ping=True
+                ),
+                keep_alive_interval,
+                adapter.stats,
+            )
+
+        return opened
+
+    def _warm_up(
+        self,
+        session: requests.Session,
+        adapter: PooledHTTPAdapter,
+        n_connections: int,
+        ping: bool = False,
+    ) -> int:
+        timeout = (
+            self.timeout[0]
+            if isinstance(self.timeout, tuple)
+            else self.timeout
+        )
+
+        # the settings of calls, which the connections are pooled by
+        settings = session.merge_environment_settings(
+            self.url, {}, None, None, None
+        )
+
+        try:
+            return adapter.warm_up(
+                self.url,
+                n_connections,
+                timeout,
+                ping,
+                settings["verify"],
+                settings["cert"],
+                settings["proxies"],
+            )
+        except (OSError, urllib3.exceptions.HTTPError) as e:
+            raise ApiException(str(e), self.url)
+
+    def close(self) -> None:
+        """Stops the keep-alive started by `warm_up()` and closes the
+        connections of the transport."""
+        if self._keep_alive is not None:
+            self._keep_alive.stop()
+            self._keep_alive = None
+
+        self.transport.close()
+
+    def _request(
+        self,
+        method: str,
+        url: str,
+        *,
+        endpoint: str,
+        event_type: str | None = None,
+        **kwargs: t.Any,
+    ) -> Response:
+        if self.tracing is None:
+            return self._call(method, url, endpoint=endpoint, **kwargs)
+
+        with self._span(method, url, endpoint, event_type, kwargs) as call:
+            response = self._call(method, url, endpoint=endpoint, **kwargs)
+            call.status = response.http_status_code
+            return response
+
+    def _call(
+        self,
+        method: str,
+        url: str,
+        *,
+        endpoint: str,
+        retry: RetryPolicy | None = None,
+        cache_key: ScoreCacheKey | None = None,
+        invalidates: str | None = None,
+        status_only: bool = False,
+        **kwargs: t.Any,
+    ) -> Response:
+        if status_only:
+            kwargs["stream"] = True
+
+        if self.compression is not None:
+            self._compress(kwargs)
+
+        if self.score_cache is None:
+            return self._fetch(method, url, endpoint, retry, **kwargs)
+
+        if cache_key is not None:
+            cached, token = self.score_cache.get(cache_key)
+
+            if cached is not None:
+                return cached
+
+            response = None
+
+            try:
+                response = self._fetch(method, url, endpoint, retry, **kwargs)
+                return response
+            finally:
+                self.score_cache.put(cache_key, response, token)
+
         try:
-            response = self.session.post(
-                url,
-                data=json.dumps(properties),
-                auth=self._auth,
-                headers=self._post_headers(version),
-                timeout=timeout,
+            return self._fetch(method, url, endpoint, retry, **kwargs)
+        finally:
+            if invalidates:
+                self.score_cache.invalidate(invalidates)
+
+    def _fetch(
+        self,
+        method: str,
+        url: str,
+        endpoint: str,
+        retry: RetryPolicy | None,
+        **kwargs: t.Any,
+    ) -> Response:
+        if self.single_flight is None or method != "get":
+            return self._send(method, url, endpoint, retry, **kwargs)
+
+        return self.single_flight.do(
+            self._flight_key(url, kwargs.get("params")),
+            lambda: self._send(method, url, endpoint, retry, **kwargs),
+        )
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        endpoint: str,
+        retry: RetryPolicy | None,
+        **kwargs: t.Any,
+    ) -> Response:
+        started = time.monotonic()
+        attempt = 1
+        # skip the instrumentation without hooks registered
+        hooks = self.hooks or None
+
+        while True:
+            info = (
+                None
+                if hooks is None
+                else self._request_info(method, url, endpoint, attempt, kwargs)
             )
-        except requests.exceptions.RequestException as e:
-            raise ApiException(str(e), url)
 
-        return Response(response)
+            try:
+                wait = self._rate_limit_delay(url, endpoint)
+
+                if wait:
+                    time.sleep(wait)
+
+                generation = self._check_circuit(url, endpoint)
+            except ApiException as e:
+                if hooks is not None:
+                    hooks._on_error(t.cast(RequestInfo, info), e, None)
+
+                raise
+
+            attempt_started = time.monotonic()
+            http_response = None
+            request_sent = True
+
+            try:
+                try:
+                    if info is None:
+                        request = HttpRequest(method, url, **kwargs)
+                    else:
+                        request = self._before_request(
+                            t.cast(Hooks, hooks), info, method, url, kwargs
+                        )
+
+                    http_response = self.transport.send(request)
+                    status = (
+                        self._scan_status(http_response)
+                        if kwargs.get("stream")
+                        else None
+                    )
+                except TransportError as e:
+                    request_sent = e.request_sent
+                    raise ApiException(str(e), url)
+                finally:
+                    if info is not None:
+                        self._after_response(
+                            t.cast(Hooks, hooks), info, http_response
+                        )
+
+                response = (
+                    StatusResponse(http_response, *status)
+                    if status
+                    else Response(http_response, self.json_codec)
+                )
+            except ApiException as e:
+                self._record_outcome(endpoint, attempt_started, e, generation)
+                delay = self._retry_delay(
+                    e,
+                    endpoint,
+                    retry,
+                    attempt,
+                    started,
+                    request_sent,
+                    (
+                        http_response.headers.get("Retry-After")
+                        if http_response is not None
+                        else None
+                    ),
+                )
+
+                if hooks is not None:
+                    hooks._on_error(t.cast(RequestInfo, info), e, delay)
+
+                if delay is None:
+                    raise
+            else:
+                self._record_outcome(
+                    endpoint, attempt_started, None, generation
+                )
+                return response
+
+            time.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _before_request(
+        hooks: Hooks,
+        info: RequestInfo,
+        method: str,
+        url: str,
+        kwargs: dict[str, t.Any],
+    ) -> HttpRequest:
+        # runs the before_request hooks and starts timing the attempt, for
+        # the transport to report its connection and response times
+        hooks._before_request(info)
+        request = HttpRequest(
+            method, url, **{**kwargs, "headers": info.headers}
+        )
+        _current_timings.set(info.timings)
+        info.timings._start()
+        return request
+
+    @staticmethod
+    def _scan_status(
+        http_response: TransportResponse,
+    ) -> tuple[int | None, str | None] | None:
+        # reads a streamed response, returning the API status of a 2XX
+        # response, or None to parse it as a `Response`
+        if not 200 <= http_response.status_code < 300:
+            return None
+
+        scanner = _StatusScanner()
+
+        # reading to the end returns the connection to the pool
+        for chunk in http_response.iter_content(_STATUS_CHUNK_SIZE):
+            scanner.feed(chunk)
+
+        return scanner.api_status, scanner.api_error_message
+
+    def track_many(
+        self,
+        events: Iterable[TrackItem],
+        max_concurrency: int = 10,
+        ordered: bool = True,
+        concurrency: AdaptiveConcurrency | None = None,
+    ) -> Iterator[tuple[int, Response | ApiException]]:
+        """
+        Tracks a stream of events, keeping up to `max_concurrency` requests
+        in flight over the client's session.
+
+        `events` is consumed lazily, so it may be a generator over a large
+        backfill. Each item is an `(event, properties)` or an
+        `(event, properties, options)` tuple, where `options` is a mapping
+        of keyword arguments for `track()`, e.g. `{"return_score": True}`.
+
+        Args:
+            events:
+                An iterable of events to track.
+
+            max_concurrency (optional):
+                The maximum number of requests in flight. Keep it at or below
+                the client's `pool_maxsize`, the connections kept open per
+                host, to reuse connections. Defaults to 10.
+
+            ordered (optional):
+                Whether results are yielded in the order of `events`. When
+                False, results are yielded as soon as they are available.
+                Defaults to True.
+
+            concurrency (optional):
+                A sift.concurrency.AdaptiveConcurrency adjusting the number of
+                requests in flight, up to `max_concurrency`, to the observed
+                latency and errors.
+
+        Yields:
+            (index, result) tuples, where `index` is the position of the event
+            in `events` and `result` is a sift.client.Response object if the
+            call was successful or the ApiException raised otherwise.
+
+        Raises:
+            TypeError, ValueError: If an event has invalid arguments
+        """
+        self._assert_max_concurrency(max_concurrency)
+
+        def send(item: TrackItem) -> Response | ApiException:
+            started = time.monotonic()
+
+            try:
+                response = self._track_item(item)
+            except ApiException as e:
+                if concurrency is not None:
+                    concurrency.record(time.monotonic() - started, e)
+
+                return e
+
+            if concurrency is not None:
+                concurrency.record(time.monotonic() - started)
+
+            return response
+
+        def window_size() -> int:
+            if concurrency is None:
+                return max_concurrency
+
+            return min(max_concurrency, concurrency.limit)
+
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            if ordered:
+                window: deque[tuple[int, Future[Response | ApiException]]]
+                window = deque()
+
+                for index, item in enumerate(events):
+                    while len(window) >= window_size():
+                        head, future = window.popleft()
+                        yield head, future.result()
+
+                    window.append((index, executor.submit(send, item)))
+
+                while window:
+                    head, future = window.popleft()
+                    yield head, future.result()
+            else:
+                pending: dict[Future[Response | ApiException], int] = {}
+
+                def completed() -> (
+                    Iterator[tuple[int, Response | ApiException]]
+                ):
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+                    for future in done:
+                        yield pending.pop(future), future.result()
+
+                for index, item in enumerate(events):
+                    while len(pending) >= window_size():
+                        yield from completed()
+
+                    pending[executor.submit(send, item)] = index
+
+                while pending:
+                    yield from completed()
@@ -0,0 +1,172 @@
+"""Adaptive concurrency limiting.
+
+`AdaptiveConcurrency` finds how many requests can be in flight without
+overloading the Sift API, with additive increase / multiplicative decrease
+(AIMD): the limit grows by one after a limit's worth of healthy responses and
+is cut by `decrease_factor` on signs of overload. Overload is a rate-limited
+or server-side error, a connection error or timeout, or a response slower
+than `latency_tolerance` times the baseline latency, the lowest recently
+observed.
+
+It governs `client.track_many()` and `sift.dispatcher.Dispatcher` when
+passed as their `concurrency` argument.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+from sift.exceptions import ApiException
+from sift.retry import API_STATUS_RATE_LIMITED, SERVER_ERROR_API_STATUSES
+
+# how fast the baseline latency follows slower responses, so it adapts to
+# lasting changes such as a new network path
+_BASELINE_DRIFT = 0.01
+
+
+def is_overload(error: ApiException | None) -> bool:
+    """Whether a call outcome is a sign of the Sift API being overloaded."""
+    if error is None:
+        return False
+
+    return (
+        error.http_status_code is None
+        or error.http_status_code == 429
+        or error.http_status_code >= 500
+        or error.api_status == API_STATUS_RATE_LIMITED
+        or error.api_status in SERVER_ERROR_API_STATUSES
+    )
+
+
+class AdaptiveConcurrency:
+    """An AIMD limit on the number of requests in flight.
+
+    Bulk loops read `limit` and report every call with `record()`. Worker
+    pools, whose size is the upper bound of the limit, additionally wrap
+    calls in `acquire()` and `release()`.
+
+    Attributes:
+        in_flight: The number of calls between `acquire()` and `release()`.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        decrease_factor: float = 0.7,
+        latency_tolerance: float = 2.0,
+    ) -> None:
+        """Initialize the limiter.
+
+        Args:
+            initial_limit (optional):
+                The limit to start from. Defaults to 4.
+
+            min_limit (optional):
+                The lowest limit. Defaults to 1.
+
+            max_limit (optional):
+                The highest limit. Defaults to 64.
+
+            decrease_factor (optional):
+                The factor, between 0 and 1, the limit is multiplied by on
+                overload. Defaults to 0.7.
+
+            latency_tolerance (optional):
+                How many times slower than the baseline latency a response
+                may be before it is a sign of overload. Defaults to 2.
+        """
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError(
+                "limits must satisfy 1 <= min_limit <= initial_limit "
+                "<= max_limit"
+            )
+
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor must be between 0 and 1")
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+
+        self.in_flight = 0
+
+        self._limit = float(initial_limit)
+        self._baseline: float | None = None
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """The current number of requests allowed in flight."""
+        return int(self._limit)
+
+    def record(
+        self,
+        latency: float,
+        error: ApiException | None = None,
+    ) -> None:
+        """
+        Adjusts the limit to the outcome of a call.
+
+        Args:
+            latency:
+                The duration of the call in seconds.
+
+            error (optional):
+                The exception the call failed with.
+        """
+        now = time.monotonic()
+
+        with self._cond:
+            if self._baseline is None or latency < self._baseline:
+                self._baseline = latency
+            else:
+                self._baseline += (latency - self._baseline) * _BASELINE_DRIFT
+
+            if (
+                is_overload(error)
+                or latency > self._baseline * self.latency_tolerance
+            ):
+                # calls sent before the last decrease don't reflect it yet
+                if now - self._last_decrease >= latency:
+                    self._limit = max(
+                        self.min_limit, self._limit * self.decrease_factor
+                    )
+                    self._last_decrease = now
+            else:
+                self._limit = min(
+                    self.max_limit, self._limit + 1 / self._limit
+                )
+
+            self._cond.notify_all()
+
+    def acquire(self, timeout: float | None = None) -> bool:
+        """
+        Waits until fewer than `limit` calls are in flight and counts a new
+        one.
+
+        Args:
+            timeout (optional):
+                How many seconds to wait. Defaults to waiting indefinitely.
+
+        Returns:
+            True if the call may be made, False if the timeout expired.
+        """
+        with self._cond:
+            if not self._cond.wait_for(
+                lambda: self.in_flight < self.limit, timeout
+            ):
+                return False
+
+            self.in_flight += 1
+            return True
+
+    def release(self) -> None:
+        """Counts the end of a call allowed by `acquire()`."""
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
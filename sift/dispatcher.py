@@ -0,0 +1,394 @@
+"""Non-blocking event submission.
+
+`Dispatcher` accepts events into a bounded in-memory queue and sends them
+from background worker threads, so the caller doesn't wait for the Sift API
+round-trip. It suits fire-and-forget events such as `$login` or
+`$add_item_to_cart`, whose responses are never read.
+
+With a `sift.spool.Spool`, submitted events are written to disk before being
+queued, so events which were dropped, failed to be sent or were still queued
+when the process died are not lost: events which failed with a transient
+error, see `sift.spool.is_transient()`, are retried every `replay_interval`
+seconds and the rest is sent on the next startup. Events which failed with
+a permanent error, e.g. rejected as invalid by the Sift API, are
+acknowledged in the spool after `on_error` was called and never retried.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import typing as t
+from collections import deque
+from collections.abc import Callable, Mapping
+
+from sift.client import (
+    Client,
+    TrackItem,
+    _assert_non_empty_dict,
+    _assert_non_empty_str,
+)
+from sift.concurrency import AdaptiveConcurrency
+from sift.exceptions import ApiException
+from sift.spool import Spool, is_transient
+
+logger = logging.getLogger(__name__)
+
+OverflowPolicy = t.Literal["block", "drop_oldest", "drop_newest"]
+
+
+class Dispatcher:
+    """Sends events submitted with `submit()` from background threads.
+
+    Example:
+
+        dispatcher = Dispatcher(client, max_queue_size=10_000)
+        dispatcher.submit("$login", {"$user_id": "billy_jones_301"})
+        ...
+        dispatcher.close(timeout=5)
+
+    Attributes:
+        sent: The number of events accepted by the Sift API.
+        failed: The number of events whose `track()` call raised.
+        dropped: The number of events discarded because the queue was full.
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        max_queue_size: int = 10000,
+        workers: int = 4,
+        overflow: OverflowPolicy = "block",
+        block_timeout: float | None = None,
+        on_error: Callable[[TrackItem, Exception], None] | None = None,
+        spool: Spool | None = None,
+        replay_interval: float = 60.0,
+        concurrency: AdaptiveConcurrency | None = None,
+    ) -> None:
+        """Initialize the dispatcher and start its worker threads.
+
+        Args:
+            client:
+                The client used to send events. Its session is shared by
+                all workers, so keep `workers` at or below its connection
+                pool size.
+
+            max_queue_size (optional):
+                The maximum number of events waiting to be sent.
+                Defaults to 10000.
+
+            workers (optional):
+                The number of worker threads sending events.
+                Defaults to 4.
+
+            overflow (optional):
+                What `submit()` does when the queue is full:
+                "block" waits for a free slot (up to `block_timeout`),
+                "drop_oldest" discards the oldest queued event,
+                "drop_newest" discards the submitted event.
+                Defaults to "block".
+
+            block_timeout (optional):
+                With the "block" policy, how many seconds `submit()` waits
+                for a free slot before discarding the submitted event.
+                Defaults to waiting indefinitely.
+
+            on_error (optional):
+                Called from a worker thread with the event and the exception
+                when sending an event fails.
+
+            spool (optional):
+                A spool events are appended to before being queued and
+                acknowledged in once sent. Events left in the spool by
+                a previous run are queued on startup.
+
+            replay_interval (optional):
+                With a spool, how many seconds to wait before queueing events
+                which failed with a transient error again.
+                Defaults to 60 seconds.
+
+            concurrency (optional):
+                A sift.concurrency.AdaptiveConcurrency adjusting how many
+                workers send events at once, up to `workers`, to the observed
+                latency and errors.
+        """
+        if max_queue_size < 1:
+            raise ValueError("max_queue_size must be a positive integer")
+
+        if workers < 1:
+            raise ValueError("workers must be a positive integer")
+
+        if overflow not in ("block", "drop_oldest", "drop_newest"):
+            raise ValueError(
+                "overflow must be one of {block, drop_oldest, drop_newest}"
+            )
+
+        self.client = client
+        self.max_queue_size = max_queue_size
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.on_error = on_error
+        self.spool = spool
+        self.replay_interval = replay_interval
+        self.concurrency = concurrency
+
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+
+        # (spool sequence number, event) pairs
+        self._queue: deque[tuple[int | None, TrackItem]] = deque()
+        # spooled events which failed with a transient error, waiting for a
+        # replay; when it overflows events are only kept in the spool until
+        # next startup
+        self._retry: deque[tuple[int, TrackItem]] = deque(
+            maxlen=max_queue_size
+        )
+        self._in_flight = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._workers = [
+            threading.Thread(
+                target=self._run,
+                name=f"sift-dispatcher-{i}",
+                daemon=True,
+            )
+            for i in range(workers)
+        ]
+
+        if spool is not None:
+            self._workers.append(
+                threading.Thread(
+                    target=self._replay,
+                    args=(spool, spool.next_seq),
+                    name="sift-dispatcher-replay",
+                    daemon=True,
+                )
+            )
+
+        for worker in self._workers:
+            worker.start()
+
+    def __enter__(self) -> Dispatcher:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @property
+    def queue_size(self) -> int:
+        """The number of events waiting to be sent."""
+        return len(self._queue)
+
+    def submit(
+        self,
+        event: str,
+        properties: Mapping[str, t.Any],
+        **options: t.Any,
+    ) -> bool:
+        """
+        Queues an event to be sent with `client.track()`.
+
+        Args:
+            event:
+                The name of the event to send.
+
+            properties:
+                A mapping of additional event-specific attributes to track.
+
+            options (optional):
+                Keyword arguments for `client.track()`. With a spool, they
+                must be JSON serializable.
+
+        Returns:
+            False if the event was discarded because the queue is full,
+            True otherwise.
+
+        Raises:
+            RuntimeError: If the dispatcher is closed
+            ValueError: If an option can't be spooled
+        """
+        _assert_non_empty_str(event, "event")
+        _assert_non_empty_dict(properties, "properties")
+
+        item: TrackItem = (event, properties, options)
+        seq = None
+
+        if self._closed:
+            raise RuntimeError("Dispatcher is closed")
+
+        if self.spool is not None:
+            seq = self.spool.append(item)
+
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Dispatcher is closed")
+
+            if len(self._queue) >= self.max_queue_size:
+                if self.overflow == "drop_newest":
+                    self.dropped += 1
+                    return False
+
+                if self.overflow == "drop_oldest":
+                    self._queue.popleft()
+                    self.dropped += 1
+                elif not self._cond.wait_for(
+                    lambda: self._closed
+                    or len(self._queue) < self.max_queue_size,
+                    self.block_timeout,
+                ):
+                    self.dropped += 1
+                    return False
+                elif self._closed:
+                    raise RuntimeError("Dispatcher is closed")
+
+            self._queue.append((seq, item))
+            self._cond.notify_all()
+
+        return True
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Waits until every queued event has been sent.
+
+        Args:
+            timeout (optional):
+                How many seconds to wait. Defaults to waiting indefinitely.
+
+        Returns:
+            True if all events were sent before the deadline, False otherwise.
+        """
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._queue and not self._in_flight, timeout
+            )
+
+    def close(self, timeout: float | None = None) -> bool:
+        """
+        Stops accepting events, sends the queued ones and stops the workers.
+        Events still queued when the deadline passes are discarded and
+        counted as dropped.
+
+        Args:
+            timeout (optional):
+                How many seconds to wait for queued events to be sent.
+                Defaults to waiting indefinitely.
+
+        Returns:
+            True if all events were sent before the deadline, False otherwise.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+        flushed = self.flush(timeout)
+
+        with self._cond:
+            self.dropped += len(self._queue)
+            self._queue.clear()
+            self._cond.notify_all()
+
+        for worker in self._workers:
+            worker.join(
+                None
+                if deadline is None
+                else max(deadline - time.monotonic(), 0)
+            )
+
+        return flushed
+
+    def _put(self, seq: int, item: TrackItem) -> bool:
+        # spooled events wait for a free slot whatever the overflow policy
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self._closed or len(self._queue) < self.max_queue_size
+            )
+
+            if self._closed:
+                return False
+
+            self._queue.append((seq, item))
+            self._cond.notify_all()
+
+        return True
+
+    def _replay(self, spool: Spool, start_seq: int) -> None:
+        for seq, item in spool.pending(before=start_seq):
+            if not self._put(seq, item):
+                return
+
+        while True:
+            with self._cond:
+                if self._cond.wait_for(
+                    lambda: self._closed, self.replay_interval
+                ):
+                    return
+
+                retry = list(self._retry)
+                self._retry.clear()
+
+            for seq, item in retry:
+                if not self._put(seq, item):
+                    return
+
+    def _run(self) -> None:
+        while True:
+            if self.concurrency is not None:
+                self.concurrency.acquire()
+
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._closed)
+
+                if not self._queue:
+                    if self.concurrency is not None:
+                        self.concurrency.release()
+
+                    return
+
+                seq, item = self._queue.popleft()
+                self._in_flight += 1
+                self._cond.notify_all()
+
+            started = time.monotonic()
+            error: Exception | None = None
+
+            try:
+                self.client._track_item(item)
+            except Exception as e:
+                error = e
+
+                if self.on_error is not None:
+                    try:
+                        self.on_error(item, e)
+                    except Exception:
+                        logger.exception("Dispatcher on_error callback failed")
+
+            if (
+                seq is not None
+                and self.spool is not None
+                and (error is None or not is_transient(error))
+            ):
+                # permanent errors would fail the same way when replayed
+                self.spool.ack(seq)
+
+            if self.concurrency is not None:
+                self.concurrency.record(
+                    time.monotonic() - started,
+                    error if isinstance(error, ApiException) else None,
+                )
+                self.concurrency.release()
+
+            with self._cond:
+                if error is None:
+                    self.sent += 1
+                else:
+                    self.failed += 1
+
+                    if seq is not None and is_transient(error):
+                        self._retry.append((seq, item))
+
+                self._in_flight -= 1
+                self._cond.notify_all()
@@ -22,3 +22,57 @@ class ApiException(Exception):
         self.api_status = api_status
         self.api_error_message = api_error_message
         self.request = request
+
+
+class CircuitOpenException(ApiException):
+    """Raised without calling the Sift API when the circuit of the endpoint
+    family is open, see `sift.circuit_breaker.CircuitBreaker`.
+    """
+
+    def __init__(self, url: str, family: str, retry_after: float) -> None:
+        ApiException.__init__(
+            self,
+            f"Circuit for {family} endpoints is open, "
+            f"retry in {retry_after:.1f} seconds",
+            url,
+        )
+
+        self.family = family
+        self.retry_after = retry_after
+
+
+class RateLimitedException(ApiException):
+    """Raised without calling the Sift API when the client-side rate limit of
+    the endpoint family would delay the call for longer than allowed, see
+    `sift.rate_limit.RateLimiter`.
+    """
+
+    def __init__(self, url: str, family: str) -> None:
+        ApiException.__init__(
+            self,
+            f"Client-side rate limit for {family} endpoints exceeded",
+            url,
+        )
+
+        self.family = family
+
+
+class TransportError(Exception):
+    """Raised by a `sift.transport.Transport` when a request failed without
+    a response, e.g. on a connection error or a timeout. The client raises
+    it again as an `ApiException`.
+    """
+
+    def __init__(self, message: str, request_sent: bool = True) -> None:
+        """
+        Args:
+            message: The description of the error.
+
+            request_sent (optional):
+                False if the request certainly didn't reach the server, e.g.
+                the connection failed, which makes it safe to retry whatever
+                the method. Defaults to True.
+        """
+        Exception.__init__(self, message)
+
+        self.request_sent = request_sent
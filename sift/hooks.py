@@ -0,0 +1,257 @@
+"""Instrumentation hooks around the API calls of the client.
+
+A `Hooks` holds the functions called at each step of an attempt to call the
+Sift API, e.g. to export per-endpoint latency, status and error metrics:
+
+    hooks = Hooks()
+
+    def record(request: RequestInfo) -> None:
+        statsd.timing(
+            f"sift.{request.endpoint}.{request.status}",
+            request.timings.total,
+        )
+
+    hooks.register("after_response", record)
+    client = sift.Client(api_key="...", hooks=hooks)
+
+The functions of an event are called in the order they were registered:
+
+- `before_request(request)`: before an attempt sends its request. It may add
+  headers to `request.headers`, e.g. to propagate a trace context.
+- `after_response(request)`: once an attempt got an HTTP response, whatever
+  its status, which is in `request.status`.
+- `on_error(request, error)`: when an attempt failed with an
+  `ApiException`, be it an HTTP error, a connection error or a timeout, or
+  a call rejected by the client's circuit breaker or rate limiter.
+- `on_retry(request, error, delay)`: after `on_error`, when the failed
+  attempt is retried in `delay` seconds.
+
+Exceptions raised by hooks are logged rather than failing the call. Clients
+without hooks, or whose hooks have no functions registered, skip the
+instrumentation altogether.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import logging
+import time
+import typing as t
+
+if t.TYPE_CHECKING:
+    from sift.exceptions import ApiException
+
+logger = logging.getLogger(__name__)
+
+EVENTS = ("before_request", "after_response", "on_error", "on_retry")
+
+Hook = t.Callable[..., None]
+
+
+class Timings:
+    """The durations, in seconds, of an attempt.
+
+    Attributes:
+        connect: The time spent opening a connection, including the TLS
+            handshake, 0 if the request reused one. None if the transport
+            doesn't report it.
+        ttfb: The time to first byte: from sending the request to receiving
+            the response headers, including `connect`. None if the
+            transport doesn't report it.
+        total: The time from sending the request to having read the
+            response, or to the failure.
+    """
+
+    __slots__ = (
+        "connect",
+        "ttfb",
+        "total",
+        "_started",
+        "_connect_started",
+        "_response_at",
+    )
+
+    def __init__(self) -> None:
+        self.connect: float | None = None
+        self.ttfb: float | None = None
+        self.total = 0.0
+        self._started = 0.0
+        self._connect_started = 0.0
+        self._response_at: float | None = None
+
+    def __repr__(self) -> str:
+        return (
+            f"<Timings connect={self.connect} ttfb={self.ttfb} "
+            f"total={self.total}>"
+        )
+
+    def _start(self) -> None:
+        self._started = time.perf_counter()
+
+    def _finish(self) -> None:
+        self.total = time.perf_counter() - self._started
+
+        if self._response_at is not None:
+            self.ttfb = self._response_at - self._started
+
+            if self.connect is None:
+                self.connect = 0.0
+
+    def _connecting(self) -> None:
+        self._connect_started = time.perf_counter()
+
+    def _connected(self) -> None:
+        # called at each step of opening a connection, e.g. once the TCP
+        # connection is open, then once the TLS handshake is done
+        now = time.perf_counter()
+        self.connect = (self.connect or 0.0) + now - self._connect_started
+        self._connect_started = now
+
+    def _response_received(self) -> None:
+        self._response_at = time.perf_counter()
+
+
+# the timings of the attempt in progress in the current thread or task, set
+# while the client's hooks are active, for transports to report connection
+# and response times
+_current_timings: contextvars.ContextVar[Timings | None] = (
+    contextvars.ContextVar("sift_timings", default=None)
+)
+
+
+def current_timings() -> Timings | None:
+    """The `Timings` of the attempt in progress, for transports to report
+    the connect time and time to first byte, or None if no hook is active."""
+    return _current_timings.get()
+
+
+def _report_trace(event: str) -> None:
+    # reports httpcore's trace events of a request, see the `trace` request
+    # extension of httpx, to the timings of the current attempt
+    timings = _current_timings.get()
+
+    if timings is None:
+        return
+
+    if event == "connection.connect_tcp.started":
+        timings._connecting()
+    elif event in (
+        "connection.connect_tcp.complete",
+        "connection.start_tls.complete",
+    ):
+        timings._connected()
+    elif event.endswith(".receive_response_headers.complete"):
+        timings._response_received()
+
+
+class RequestInfo:
+    """An attempt to call the Sift API, as passed to hooks.
+
+    Attributes:
+        endpoint: The name of the client method, e.g. "get_user_score".
+        family: The endpoint family, e.g. "score", as in
+            `sift.client.ENDPOINTS`.
+        method: The HTTP method, e.g. "GET".
+        url_template: The path of the endpoint without IDs, e.g.
+            "/v205/users/{user_id}/score", to label metrics with.
+        payload_size: The size in bytes of the request body, once
+            compressed.
+        attempt: The number of the attempt, 1 for the first.
+        headers: The request headers, without `Authorization`;
+            `before_request` hooks may add to them.
+        status: The HTTP status of the response, None without response.
+        timings: The durations of the attempt, complete once it got
+            a response or failed.
+    """
+
+    __slots__ = (
+        "endpoint",
+        "family",
+        "method",
+        "url_template",
+        "payload_size",
+        "attempt",
+        "headers",
+        "status",
+        "timings",
+    )
+
+    def __init__(
+        self,
+        endpoint: str,
+        family: str,
+        method: str,
+        url_template: str,
+        payload_size: int,
+        attempt: int,
+        headers: dict[str, str],
+    ) -> None:
+        self.endpoint = endpoint
+        self.family = family
+        self.method = method
+        self.url_template = url_template
+        self.payload_size = payload_size
+        self.attempt = attempt
+        self.headers = headers
+        self.status: int | None = None
+        self.timings = Timings()
+
+    def __repr__(self) -> str:
+        return (
+            f"<RequestInfo {self.method} {self.url_template} "
+            f"attempt={self.attempt} status={self.status}>"
+        )
+
+
+class Hooks:
+    """The functions called around the API calls of a client, see the
+    module documentation. A `Hooks` can be shared by several clients."""
+
+    def __init__(self) -> None:
+        self._hooks: dict[str, list[Hook]] = {event: [] for event in EVENTS}
+
+    def register(self, event: str, hook: Hook) -> Hook:
+        """Calls `hook` on `event`, one of "before_request",
+        "after_response", "on_error" and "on_retry", and returns it."""
+        if event not in self._hooks:
+            raise ValueError(f"event must be one of {', '.join(EVENTS)}")
+
+        self._hooks[event] = [*self._hooks[event], hook]
+        return hook
+
+    def unregister(self, event: str, hook: Hook) -> None:
+        """Stops calling `hook` on `event`."""
+        if event not in self._hooks:
+            raise ValueError(f"event must be one of {', '.join(EVENTS)}")
+
+        # compared by equality, for bound methods
+        self._hooks[event] = [h for h in self._hooks[event] if h != hook]
+
+    def __bool__(self) -> bool:
+        return any(self._hooks.values())
+
+    def _before_request(self, request: RequestInfo) -> None:
+        self._call("before_request", request)
+
+    def _after_response(self, request: RequestInfo) -> None:
+        self._call("after_response", request)
+
+    def _on_error(
+        self,
+        request: RequestInfo,
+        error: ApiException,
+        delay: float | None,
+    ) -> None:
+        self._call("on_error", request, error)
+
+        if delay is not None:
+            self._call("on_retry", request, error, delay)
+
+    def _call(self, event: str, *args: t.Any) -> None:
+        # the lists are replaced rather than modified, so they can be
+        # iterated without lock while hooks are registered
+        for hook in self._hooks[event]:
+            try:
+                hook(*args)
+            except Exception:
+                logger.exception("%s hook %r failed", event, hook)
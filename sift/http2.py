@@ -0,0 +1,175 @@
+"""HTTP/2 transport.
+
+Over HTTP/1.1, every call in flight needs a connection of its own, so sending
+many events at once, with `track_many()` or a `Dispatcher`, opens as many
+connections. `HTTP2Transport` sends the calls of `sift.Client` over HTTP/2
+with httpx instead, multiplexing the concurrent calls over a few connections.
+
+It requires the `http2` extra: pip install "Sift[http2]"
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import typing as t
+from collections.abc import Iterator
+
+try:
+    import httpx
+except ImportError as e:
+    raise ImportError(
+        "HTTP2Transport requires the httpx and h2 packages. "
+        'Install them with `pip install "Sift[http2]"`.'
+    ) from e
+
+from sift.exceptions import TransportError
+from sift.hooks import _report_trace
+from sift.pool import PoolStats, httpx_limits, httpx_timeout
+from sift.transport import HttpRequest, _AuthHeaders
+
+
+class HTTP2Response:
+    """The response of an `HTTP2Transport` request."""
+
+    __slots__ = ("_response",)
+
+    def __init__(self, response: httpx.Response) -> None:
+        self._response = response
+
+    @property
+    def url(self) -> str:
+        return str(self._response.url)
+
+    @property
+    def status_code(self) -> int:
+        return self._response.status_code
+
+    @property
+    def headers(self) -> httpx.Headers:
+        return self._response.headers
+
+    @property
+    def content(self) -> bytes:
+        return self._response.read()
+
+    @property
+    def text(self) -> str:
+        self._response.read()
+        return self._response.text
+
+    def json(self) -> t.Any:
+        self._response.read()
+        return self._response.json()
+
+    def iter_content(self, chunk_size: int = 1) -> Iterator[bytes]:
+        try:
+            yield from self._response.iter_bytes(chunk_size)
+        except httpx.HTTPError as e:
+            raise TransportError(str(e))
+        finally:
+            self._response.close()
+
+
+class HTTP2Transport:
+    """A `sift.transport.Transport` sending requests over HTTP/2 with an
+    `httpx.Client`.
+
+    Example:
+
+        client = sift.Client(api_key="...", http2=True)
+
+    or, to configure the `httpx.Client`:
+
+        client = sift.Client(
+            api_key="...",
+            transport=HTTP2Transport(httpx.Client(http2=True, proxy="...")),
+        )
+
+    Attributes:
+        stats: The counters of the connection pool.
+    """
+
+    def __init__(
+        self,
+        client: httpx.Client | None = None,
+        pool_maxsize: int = 32,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+    ) -> None:
+        """Initialize the transport.
+
+        Args:
+            client (optional):
+                The `httpx.Client` sending requests, created with
+                `http2=True`. The connection pool arguments below don't
+                apply to it.
+
+            pool_maxsize (optional):
+                The maximum number of idle connections kept open. As each
+                HTTP/2 connection carries many concurrent requests, a few
+                are usually open. Defaults to 32.
+
+            pool_block (optional):
+                Whether to limit the connections to `pool_maxsize`, waiting
+                for a stream to be free once they are all saturated.
+                Defaults to False.
+
+            keep_alive (optional):
+                Whether to reuse connections. Defaults to True.
+        """
+        if client is None:
+            if importlib.util.find_spec("h2") is None:
+                raise ImportError(
+                    "HTTP2Transport requires the h2 package. "
+                    'Install it with `pip install "Sift[http2]"`.'
+                )
+
+            client = httpx.Client(
+                http2=True,
+                limits=httpx_limits(pool_maxsize, pool_block, keep_alive),
+            )
+
+        self.client = client
+        self.stats = PoolStats()
+        self._auth_headers = _AuthHeaders()
+
+    def send(self, request: HttpRequest) -> HTTP2Response:
+        httpx_request = self.client.build_request(
+            request.method.upper(),
+            request.url,
+            params=request.params,
+            content=request.data,
+            headers={
+                **(request.headers or {}),
+                **self._auth_headers.get(request),
+            },
+            timeout=httpx_timeout(request.timeout),
+            extensions={"trace": self._trace},
+        )
+        self.stats._count_request()
+
+        try:
+            response = self.client.send(
+                httpx_request,
+                stream=request.stream,
+            )
+        except httpx.HTTPError as e:
+            raise TransportError(
+                str(e),
+                request_sent=not isinstance(
+                    e, (httpx.ConnectError, httpx.ConnectTimeout)
+                ),
+            )
+
+        return HTTP2Response(response)
+
+    def close(self) -> None:
+        """Closes the connections."""
+        self.client.close()
+
+    def _trace(self, event: str, info: dict[str, t.Any]) -> None:
+        # httpcore's tracing of the connections of a request
+        if event == "connection.connect_tcp.complete":
+            self.stats._count_new_connection()
+
+        _report_trace(event)
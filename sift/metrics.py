@@ -0,0 +1,310 @@
+"""Latency histograms and counters of the API calls of the client.
+
+`Metrics` registers its functions on a `sift.hooks.Hooks` and keeps, per
+endpoint family ("events", "score", "decisions", ...) and status class
+("2xx", "4xx", "5xx", or "error" for attempts without response), a
+histogram of the duration of the attempts to call the Sift API, and
+counters of the retried attempts and of the calls rejected by the client's
+circuit breaker or rate limiter:
+
+    metrics = Metrics()
+    hooks = Hooks()
+    metrics.register(hooks)
+    client = sift.Client(api_key="...", hooks=hooks)
+
+    metrics.snapshot()["requests"]["score"]["2xx"]["p99"]
+    metrics.prometheus()  # the Prometheus text exposition format
+
+The histograms have fixed buckets, so recording an attempt takes constant
+time and memory, and quantiles are estimated by interpolating within the
+bucket they fall in, as Prometheus' `histogram_quantile()` does.
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+import typing as t
+from collections.abc import Sequence
+
+from sift.exceptions import (
+    ApiException,
+    CircuitOpenException,
+    RateLimitedException,
+)
+from sift.hooks import Hooks, RequestInfo
+
+# upper bounds in seconds of the buckets of the latency histograms, finer
+# around the usual latencies of the API to estimate p99 and p99.9
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.075,
+    0.1,
+    0.15,
+    0.2,
+    0.3,
+    0.5,
+    0.75,
+    1.0,
+    1.5,
+    2.0,
+    3.0,
+    5.0,
+    10.0,
+)
+
+QUANTILES = {"p50": 0.5, "p90": 0.9, "p99": 0.99, "p999": 0.999}
+
+
+def status_class(status: int | None) -> str:
+    """The status class of an HTTP status, e.g. "2xx", or "error" if the
+    attempt got no response."""
+    return "error" if status is None else f"{status // 100}xx"
+
+
+def _check_buckets(buckets: Sequence[float]) -> tuple[float, ...]:
+    if not buckets or list(buckets) != sorted(set(buckets)):
+        raise ValueError("buckets must be sorted and distinct")
+
+    return tuple(buckets)
+
+
+class Histogram:
+    """A histogram with fixed buckets, safe to update from several
+    threads."""
+
+    __slots__ = ("buckets", "_counts", "_sum", "_lock")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        """Initialize the histogram.
+
+        Args:
+            buckets (optional):
+                The sorted upper bounds of the buckets, without +Inf.
+                Defaults to `DEFAULT_BUCKETS`.
+        """
+        self.buckets = _check_buckets(buckets)
+        # the last count is of the values above the last bound
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Records `value`."""
+        index = bisect.bisect_left(self.buckets, value)
+
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    @property
+    def count(self) -> int:
+        return sum(self._counts)
+
+    def quantile(self, q: float) -> float | None:
+        """The estimated `q` quantile, e.g. 0.99, of the recorded values, or
+        None if there is none. Values above the last bucket are estimated
+        as its upper bound."""
+        with self._lock:
+            counts = list(self._counts)
+
+        return self._quantile(counts, q)
+
+    def snapshot(self) -> dict[str, t.Any]:
+        """The count and sum of the recorded values, their estimated
+        `QUANTILES`, and the cumulative count of each bucket by upper
+        bound, ending with +Inf."""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+
+        cumulative = 0
+        buckets = {}
+
+        for bound, count in zip((*self.buckets, float("inf")), counts):
+            cumulative += count
+            buckets[bound] = cumulative
+
+        return {
+            "count": cumulative,
+            "sum": total,
+            **{
+                name: self._quantile(counts, q)
+                for name, q in QUANTILES.items()
+            },
+            "buckets": buckets,
+        }
+
+    def _quantile(self, counts: list[int], q: float) -> float | None:
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+
+        total = sum(counts)
+
+        if not total:
+            return None
+
+        rank = q * total
+        cumulative = 0
+
+        for index, count in enumerate(counts):
+            if cumulative + count >= rank and count:
+                break
+
+            cumulative += count
+
+        if index == len(self.buckets):
+            return self.buckets[-1]
+
+        lower = self.buckets[index - 1] if index else 0.0
+        upper = self.buckets[index]
+        return lower + (upper - lower) * (rank - cumulative) / count
+
+
+class Metrics:
+    """Latency histograms and counters of API calls per endpoint family and
+    status class, see the module documentation. A `Metrics` can be
+    registered on the hooks of several clients, which it aggregates."""
+
+    def __init__(
+        self,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        namespace: str = "sift_client",
+    ) -> None:
+        """Initialize the metrics.
+
+        Args:
+            buckets (optional):
+                The upper bounds in seconds of the buckets of the latency
+                histograms. Defaults to `DEFAULT_BUCKETS`.
+
+            namespace (optional):
+                The prefix of the names of the metrics in the Prometheus
+                format. Defaults to "sift_client".
+        """
+        self.buckets = _check_buckets(buckets)
+        self.namespace = namespace
+        self._histograms: dict[tuple[str, str], Histogram] = {}
+        self._retries: dict[str, int] = {}
+        self._rejected: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def register(self, hooks: Hooks) -> None:
+        """Records the API calls of the clients using `hooks`."""
+        hooks.register("after_response", self._after_response)
+        hooks.register("on_error", self._on_error)
+        hooks.register("on_retry", self._on_retry)
+
+    def unregister(self, hooks: Hooks) -> None:
+        """Stops recording the API calls of the clients using `hooks`."""
+        hooks.unregister("after_response", self._after_response)
+        hooks.unregister("on_error", self._on_error)
+        hooks.unregister("on_retry", self._on_retry)
+
+    def histogram(self, family: str, status_class: str) -> Histogram:
+        """The latency histogram of an endpoint family and status class."""
+        key = (family, status_class)
+        # looked up without lock once created
+        histogram = self._histograms.get(key)
+
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(
+                    key, Histogram(self.buckets)
+                )
+
+        return histogram
+
+    def snapshot(self) -> dict[str, t.Any]:
+        """The metrics as a dict:
+
+        {
+            "requests": {
+                family: {status_class: Histogram.snapshot(), ...},
+                ...
+            },
+            "retries": {family: count, ...},
+            "rejected": {family: count, ...},
+        }
+        """
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            retries = dict(sorted(self._retries.items()))
+            rejected = dict(sorted(self._rejected.items()))
+
+        requests: dict[str, dict[str, t.Any]] = {}
+
+        for (family, status), histogram in histograms:
+            requests.setdefault(family, {})[status] = histogram.snapshot()
+
+        return {"requests": requests, "retries": retries, "rejected": rejected}
+
+    def prometheus(self) -> str:
+        """The metrics in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        duration = f"{self.namespace}_request_duration_seconds"
+        lines = [
+            f"# HELP {duration} Duration of the attempts to call the Sift "
+            "API.",
+            f"# TYPE {duration} histogram",
+        ]
+
+        for family, statuses in snapshot["requests"].items():
+            for status, histogram in statuses.items():
+                labels = f'family="{family}",status_class="{status}"'
+
+                for bound, count in histogram["buckets"].items():
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(
+                        f'{duration}_bucket{{{labels},le="{le}"}} {count}'
+                    )
+
+                lines.append(f"{duration}_sum{{{labels}}} {histogram['sum']}")
+                lines.append(
+                    f"{duration}_count{{{labels}}} {histogram['count']}"
+                )
+
+        for name, help_text in (
+            ("retries", "Attempts to call the Sift API that were retried."),
+            (
+                "rejected",
+                "Calls rejected by the circuit breaker or the rate limiter.",
+            ),
+        ):
+            metric = f"{self.namespace}_{name}_total"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+
+            for family, count in snapshot[name].items():
+                lines.append(f'{metric}{{family="{family}"}} {count}')
+
+        return "\n".join(lines) + "\n"
+
+    def _after_response(self, request: RequestInfo) -> None:
+        self.histogram(request.family, status_class(request.status)).observe(
+            request.timings.total
+        )
+
+    def _on_error(self, request: RequestInfo, error: ApiException) -> None:
+        if request.status is not None:
+            # recorded by _after_response
+            return
+
+        if isinstance(error, (CircuitOpenException, RateLimitedException)):
+            self._count(self._rejected, request.family)
+        else:
+            self.histogram(request.family, "error").observe(
+                request.timings.total
+            )
+
+    def _on_retry(
+        self, request: RequestInfo, error: ApiException, delay: float
+    ) -> None:
+        self._count(self._retries, request.family)
+
+    def _count(self, counters: dict[str, int], family: str) -> None:
+        with self._lock:
+            counters[family] = counters.get(family, 0) + 1
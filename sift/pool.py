@@ -0,0 +1,412 @@
+"""Connection pooling.
+
+`sift.Client` sends its calls through a `PooledHTTPAdapter`, which sizes the
+connection pool for multi-threaded use and counts new and reused
+connections in a `PoolStats`. `sift.AsyncClient` configures its
+`httpx.AsyncClient` with the equivalent `httpx_limits()`.
+
+`warm_up()` opens connections ahead of traffic, and optionally keeps them
+open while the client is idle by pinging them from the background, so that
+calls don't wait for DNS resolution and TCP and TLS handshakes.
+"""
+
+from __future__ import annotations
+
+import http.client
+import logging
+import socket
+import threading
+import typing as t
+from collections.abc import Callable, MutableMapping
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool
+from urllib3.poolmanager import PoolManager
+
+from sift.exceptions import ApiException
+from sift.hooks import current_timings
+
+if t.TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class PoolStats:
+    """Connection usage counters, safe to read from any thread.
+
+    Attributes:
+        requests: The number of requests sent.
+        new_connections: The number of connections opened.
+        warmed_connections: The number of connections opened ahead of
+            traffic by `warm_up()`, included in `new_connections`.
+    """
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.new_connections = 0
+        self.warmed_connections = 0
+        self._lock = threading.Lock()
+
+    @property
+    def reused_connections(self) -> int:
+        """The number of requests sent over an already open connection."""
+        return max(
+            self.requests - self.new_connections + self.warmed_connections, 0
+        )
+
+    @property
+    def reuse_ratio(self) -> float:
+        """The share of requests sent over an already open connection."""
+        return (
+            self.reused_connections / self.requests if self.requests else 0.0
+        )
+
+    def as_dict(self) -> dict[str, int]:
+        """The counters, e.g. for exporting them as metrics."""
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "warmed_connections": self.warmed_connections,
+            "reused_connections": self.reused_connections,
+        }
+
+    def _count_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def _count_new_connection(self) -> None:
+        with self._lock:
+            self.new_connections += 1
+
+    def _count_warmed_connection(self) -> None:
+        with self._lock:
+            self.warmed_connections += 1
+
+
+class _CountingPoolManager(PoolManager):
+    # a PoolManager counting the connections opened by its pools; urllib3
+    # reconnects a dropped connection object in place, so connects are
+    # counted rather than connection objects. It also reports the connect
+    # time and time to first byte of requests to the client's hooks
+
+    def __init__(self, stats: PoolStats, **kwargs: t.Any) -> None:
+        super().__init__(**kwargs)
+        self.stats = stats
+
+    def _new_pool(
+        self,
+        scheme: str,
+        host: str,
+        port: int,
+        request_context: dict[str, t.Any] | None = None,
+    ) -> HTTPConnectionPool:
+        pool = super()._new_pool(scheme, host, port, request_context)
+        new_conn = pool._new_conn
+
+        def counting_new_conn() -> t.Any:
+            conn = new_conn()
+            connect = conn.connect
+            getresponse = conn.getresponse
+
+            def counting_connect() -> None:
+                self.stats._count_new_connection()
+                timings = current_timings()
+
+                if timings is None:
+                    connect()
+                    return
+
+                timings._connecting()
+
+                try:
+                    connect()
+                finally:
+                    timings._connected()
+
+            def timed_getresponse(*args: t.Any, **kwargs: t.Any) -> t.Any:
+                response = getresponse(*args, **kwargs)
+                timings = current_timings()
+
+                if timings is not None:
+                    timings._response_received()
+
+                return response
+
+            conn.connect = counting_connect  # type: ignore[method-assign]
+            conn.getresponse = timed_getresponse  # type: ignore[method-assign]
+            return conn
+
+        pool._new_conn = counting_new_conn  # type: ignore[method-assign]
+        return pool
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """A `requests` transport adapter with a configurable connection pool,
+    TCP keep-alive and connection statistics."""
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 32,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+    ) -> None:
+        """Initialize the adapter.
+
+        Args:
+            pool_connections (optional):
+                The number of hosts to keep a pool of connections for.
+                Defaults to 10.
+
+            pool_maxsize (optional):
+                The maximum number of idle connections kept per host; set it
+                to the number of threads sharing the client. Defaults to 32.
+
+            pool_block (optional):
+                Whether to wait for a connection to be free when
+                `pool_maxsize` are in use, instead of opening a connection
+                which is closed after use. Defaults to False.
+
+            keep_alive (optional):
+                Whether to reuse connections, with TCP keep-alive probes
+                detecting dead ones. Defaults to True.
+        """
+        if pool_connections < 1 or pool_maxsize < 1:
+            raise ValueError(
+                "pool_connections and pool_maxsize must be positive integers"
+            )
+
+        self.keep_alive = keep_alive
+        self.stats = PoolStats()
+
+        super().__init__(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+
+    def init_poolmanager(
+        self,
+        connections: int,
+        maxsize: int,
+        block: bool = False,
+        **pool_kwargs: t.Any,
+    ) -> None:
+        if self.keep_alive:
+            pool_kwargs.setdefault(
+                "socket_options",
+                [
+                    *HTTPConnection.default_socket_options,
+                    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+                ],
+            )
+
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+        self.poolmanager = _CountingPoolManager(
+            self.stats,
+            num_pools=connections,
+            maxsize=maxsize,
+            block=block,
+            **pool_kwargs,
+        )
+
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        *args: t.Any,
+        **kwargs: t.Any,
+    ) -> requests.Response:
+        if not self.keep_alive:
+            request.headers["Connection"] = "close"
+
+        self.stats._count_request()
+        return super().send(request, *args, **kwargs)
+
+    def warm_up(
+        self,
+        url: str,
+        n_connections: int = 1,
+        timeout: float | None = None,
+        ping: bool = False,
+        verify: bool | str | None = True,
+        cert: str | tuple[str, str] | None = None,
+        proxies: MutableMapping[str, str] | None = None,
+    ) -> int:
+        """
+        Opens connections to the host of `url` and returns them to the pool,
+        up to `n_connections` open connections (and at most `pool_maxsize`).
+
+        Args:
+            url: A URL of the host to connect to.
+
+            n_connections (optional):
+                The number of connections to have open. Defaults to 1.
+
+            timeout (optional):
+                How many seconds to wait for each connection or ping.
+                Defaults to waiting indefinitely.
+
+            ping (optional):
+                Whether to send a HEAD request over the connections which are
+                already open, resetting the idle timers which would get them
+                closed by the server or a load balancer. Defaults to False.
+
+            verify, cert, proxies (optional):
+                The settings requests are sent with, which select the pool;
+                see `requests.Session.merge_environment_settings()`.
+
+        Returns:
+            The number of connections opened.
+
+        Raises:
+            OSError, urllib3.exceptions.HTTPError: If a connection failed.
+        """
+        pool = self._connection_pool(
+            url, True if verify is None else verify, cert, proxies
+        )
+        path = urlsplit(url).path or "/"
+        conns: list[HTTPConnection] = []
+        opened = 0
+
+        try:
+            for _ in range(min(n_connections, self._pool_maxsize)):
+                conns.append(t.cast(HTTPConnection, pool._get_conn(timeout)))
+
+            for conn in conns:
+                if _is_connected(conn) and ping:
+                    try:
+                        _ping(conn, path, timeout)
+                        continue
+                    except (OSError, http.client.HTTPException):
+                        # closed by the other end in the meantime
+                        conn.close()
+                elif _is_connected(conn):
+                    continue
+
+                conn.timeout = timeout
+                conn.connect()
+                self.stats._count_warmed_connection()
+                opened += 1
+        finally:
+            # in reverse, to leave the pool's order unchanged
+            for conn in reversed(conns):
+                pool._put_conn(conn)
+
+        return opened
+
+    def _connection_pool(
+        self,
+        url: str,
+        verify: bool | str,
+        cert: str | tuple[str, str] | None,
+        proxies: MutableMapping[str, str] | None,
+    ) -> HTTPConnectionPool:
+        # the pool requests sends a request to `url` through
+        if hasattr(self, "get_connection_with_tls_context"):
+            # requests >= 2.32.2
+            request = requests.Request("HEAD", url).prepare()
+            return t.cast(
+                HTTPConnectionPool,
+                self.get_connection_with_tls_context(
+                    request, verify, proxies, cert
+                ),
+            )
+
+        pool = t.cast(HTTPConnectionPool, self.get_connection(url, proxies))
+        self.cert_verify(pool, url, verify, cert)
+        return pool
+
+
+def _is_connected(conn: HTTPConnection) -> bool:
+    # urllib3 < 2 has no `is_connected`; its pool closes the connections
+    # dropped by the other end when they are taken out of it
+    is_connected = getattr(conn, "is_connected", None)
+
+    if is_connected is None:
+        return conn.sock is not None
+
+    return bool(is_connected)
+
+
+def _ping(conn: HTTPConnection, path: str, timeout: float | None) -> None:
+    # a request over an open connection, reading the response to the end
+    if conn.sock is not None:
+        conn.sock.settimeout(timeout)
+
+    conn.request("HEAD", path, headers={"Connection": "keep-alive"})
+    conn.getresponse().read()
+
+
+class _KeepAlive:
+    # calls `ping` every `interval` seconds from a background thread, unless
+    # requests were sent in the meantime, which keeps connections open anyway
+
+    def __init__(
+        self,
+        ping: Callable[[], object],
+        interval: float,
+        stats: PoolStats,
+    ) -> None:
+        self.ping = ping
+        self.interval = interval
+        self.stats = stats
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="sift-keep-alive", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        requests = self.stats.requests
+
+        while not self._stopped.wait(self.interval):
+            if self.stats.requests == requests:
+                try:
+                    self.ping()
+                except ApiException:
+                    logger.warning("Keep-alive ping failed", exc_info=True)
+
+            requests = self.stats.requests
+
+
+def httpx_limits(
+    pool_maxsize: int = 32,
+    pool_block: bool = False,
+    keep_alive: bool = True,
+) -> httpx.Limits:
+    """
+    The `httpx.Limits` matching the arguments of `PooledHTTPAdapter`. httpx
+    pools connections across hosts, so there is no `pool_connections`.
+    """
+    import httpx
+
+    return httpx.Limits(
+        max_connections=pool_maxsize if pool_block else None,
+        max_keepalive_connections=pool_maxsize if keep_alive else 0,
+    )
+
+
+def httpx_timeout(
+    timeout: float | tuple[float, float] | None,
+) -> httpx.Timeout:
+    """
+    The `httpx.Timeout` of a `requests` timeout: seconds, or a (connect
+    timeout, read timeout) tuple.
+    """
+    import httpx
+
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+
+    return httpx.Timeout(timeout)
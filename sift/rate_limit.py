@@ -0,0 +1,253 @@
+"""Client-side rate limiting.
+
+A `RateLimiter` paces calls with token buckets, one per endpoint family
+("events", "score", "decisions", ...) and a default one for the other
+families, so a client stays within the throughput Sift allows for the
+account instead of being answered with HTTP 429.
+
+Buckets hand out reservations: a call takes a token right away, possibly
+going into debt, and waits until the token would have been available. Calls
+are therefore served in order and waiting is a single sleep, which works the
+same with `time.sleep()` and `asyncio.sleep()`.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+import typing as t
+from collections.abc import Mapping
+
+if sys.platform != "win32":
+    import fcntl
+
+
+class Bucket(t.Protocol):
+    """A source of tokens, e.g. `TokenBucket`."""
+
+    def reserve(self, max_wait: float | None = None) -> float | None:
+        """
+        Takes a token.
+
+        Args:
+            max_wait (optional):
+                The maximum number of seconds the caller is ready to wait for
+                the token. Defaults to waiting as long as needed.
+
+        Returns:
+            The number of seconds to wait before using the token, or None
+            if it would be more than `max_wait`, in which case no token is
+            taken.
+        """
+
+
+class TokenBucket:
+    """Lets through `rate` calls per second on average and up to `burst`
+    calls at once.
+
+    It is thread-safe and may be shared by several clients of a process.
+    """
+
+    def __init__(self, rate: float, burst: int | None = None) -> None:
+        """Initialize a full bucket.
+
+        Args:
+            rate:
+                The number of tokens added per second.
+
+            burst (optional):
+                The capacity of the bucket. Defaults to one second worth of
+                tokens, and at least 1.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        if burst is not None and burst < 1:
+            raise ValueError("burst must be a positive integer")
+
+        self.rate = rate
+        self.burst = burst or max(int(rate), 1)
+
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait: float | None = None) -> float | None:
+        """See `Bucket.reserve()`."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens, wait = self._take(
+                self._tokens, now - self._updated, max_wait
+            )
+            self._updated = now
+
+            return wait
+
+    def _take(
+        self,
+        tokens: float,
+        elapsed: float,
+        max_wait: float | None,
+    ) -> tuple[float, float | None]:
+        # refills the bucket for `elapsed` seconds and takes a token if the
+        # wait is acceptable; returns the tokens left and the wait
+        tokens = min(self.burst, tokens + elapsed * self.rate)
+        wait = max((1 - tokens) / self.rate, 0.0)
+
+        if max_wait is not None and wait > max_wait:
+            return tokens, None
+
+        return tokens - 1, wait
+
+
+class SharedTokenBucket(TokenBucket):
+    """A `TokenBucket` shared by the processes of a host through
+    a memory-mapped file, e.g. by the workers of a pre-fork server.
+
+    Every process opens the bucket with the same `path`, `rate` and `burst`.
+    A bucket opened before the server forks can be used by the workers: each
+    process reopens the file on first use. Updates are serialized with an
+    exclusive `flock()` on the file, which the OS releases if a process dies.
+
+    Only available on POSIX systems.
+    """
+
+    # magic, tokens, CLOCK_MONOTONIC time of the last update
+    _STATE = struct.Struct("<4sdd")
+    _MAGIC = b"SFTB"
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        rate: float,
+        burst: int | None = None,
+    ) -> None:
+        """Open or create a shared bucket.
+
+        Args:
+            path:
+                The file holding the state of the bucket. It is created if
+                it doesn't exist. A file on a memory-backed file system, such
+                as /dev/shm on Linux, avoids disk writes.
+
+            rate:
+                The number of tokens added per second, for the whole host.
+
+            burst (optional):
+                The capacity of the bucket. Defaults to one second worth of
+                tokens, and at least 1.
+        """
+        if sys.platform == "win32":
+            raise NotImplementedError(
+                "SharedTokenBucket is not available on Windows"
+            )
+
+        super().__init__(rate, burst)
+
+        self.path = os.fspath(path)
+        self._pid = -1
+        self._fd = -1
+        self._mmap: mmap.mmap | None = None
+        self._open()
+
+    def _open(self) -> None:
+        # called on first use in every process: the open file description
+        # is shared with the parent process after a fork, and so would be
+        # its flock()
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+
+        if os.fstat(self._fd).st_size < self._STATE.size:
+            os.ftruncate(self._fd, self._STATE.size)
+
+        self._mmap = mmap.mmap(self._fd, self._STATE.size)
+
+    def reserve(self, max_wait: float | None = None) -> float | None:
+        """See `Bucket.reserve()`."""
+        if self._pid != os.getpid():
+            self._open()
+
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+
+            try:
+                state = t.cast(mmap.mmap, self._mmap)
+                now = time.monotonic()
+                magic, tokens, updated = self._STATE.unpack_from(state)
+
+                if magic != self._MAGIC or updated > now:
+                    # a new file, or one left over from before a reboot
+                    tokens, updated = self.burst, now
+
+                tokens, wait = self._take(tokens, now - updated, max_wait)
+                self._STATE.pack_into(state, 0, self._MAGIC, tokens, now)
+
+                return wait
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def close(self) -> None:
+        """Closes the file of the bucket in this process."""
+        if self._mmap is not None and self._pid == os.getpid():
+            self._mmap.close()
+            os.close(self._fd)
+            self._mmap = None
+
+
+class RateLimiter:
+    """Picks the bucket of each call by endpoint family.
+
+    Example:
+
+        RateLimiter(
+            default=TokenBucket(rate=100),
+            families={"score": TokenBucket(rate=10, burst=20)},
+        )
+    """
+
+    def __init__(
+        self,
+        default: Bucket | None = None,
+        families: Mapping[str, Bucket] | None = None,
+        max_wait: float | None = None,
+    ) -> None:
+        """Initialize the rate limiter.
+
+        Args:
+            default (optional):
+                The bucket of the endpoint families missing from `families`.
+                Defaults to not limiting them.
+
+            families (optional):
+                A mapping of endpoint family names, such as "events",
+                "labels", "score", "decisions", "workflows", "psp_management"
+                and "verification", to their bucket.
+
+            max_wait (optional):
+                The maximum number of seconds a call waits for a token before
+                failing with `RateLimitedException`; 0 fails right away.
+                Defaults to waiting as long as needed.
+        """
+        self.default = default
+        self.families = dict(families or {})
+        self.max_wait = max_wait
+
+    def reserve(self, family: str) -> float | None:
+        """
+        Takes a token for a call to an endpoint family.
+
+        Returns:
+            The number of seconds to wait before making the call, or None if
+            it would be more than `max_wait`.
+        """
+        bucket = self.families.get(family, self.default)
+
+        if bucket is None:
+            return 0.0
+
+        return bucket.reserve(self.max_wait)
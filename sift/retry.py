@@ -0,0 +1,222 @@
+"""Retrying failed API calls.
+
+A `RetryPolicy` decides whether a failed call is repeated and how long to
+wait before the next attempt. It is set on the client and can be overridden
+for a single call with the `retry` argument of every API method.
+"""
+
+from __future__ import annotations
+
+import datetime
+import email.utils
+import random
+import typing as t
+from collections.abc import Collection
+
+from sift.exceptions import ApiException
+
+# Sift API statuses, see https://developers.sift.com/docs/python/events-api/error-codes
+API_STATUS_RATE_LIMITED = 60
+SERVER_ERROR_API_STATUSES = (-4, -3, -2, -1)
+
+
+class RetryPolicy:
+    """Retries failed calls with jittered exponential backoff.
+
+    A failed call is retried when it failed with a connection error or
+    timeout, with one of `http_statuses`, or with one of `api_statuses`.
+
+    Calls to endpoints which aren't idempotent, such as applying decisions or
+    sending verification codes, are only retried if the request was surely
+    not processed: when the connection couldn't be established or the
+    request was rate limited (HTTP 429 or API status 60). Set
+    `retry_non_idempotent` to retry them on any retryable failure.
+
+    Attempt `n` waits for a random delay between 0 and
+    `min(max_backoff, backoff_factor * 2 ** (n - 1))` seconds ("full jitter"),
+    or for the delay requested by the Retry-After response header.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff_factor: float = 0.1,
+        max_backoff: float = 5.0,
+        deadline: float | None = None,
+        http_statuses: Collection[int] = (429, 500, 502, 503, 504),
+        api_statuses: Collection[int] = (
+            *SERVER_ERROR_API_STATUSES,
+            API_STATUS_RATE_LIMITED,
+        ),
+        retry_non_idempotent: bool = False,
+        respect_retry_after: bool = True,
+    ) -> None:
+        """Initialize the policy.
+
+        Args:
+            max_attempts (optional):
+                The maximum number of attempts, including the first one.
+                1 disables retries. Defaults to 3.
+
+            backoff_factor (optional):
+                The upper bound, in seconds, of the delay before the first
+                retry; it doubles with every retry. Defaults to 0.1.
+
+            max_backoff (optional):
+                The maximum delay between two attempts in seconds, including
+                delays requested by Retry-After. Defaults to 5 seconds.
+
+            deadline (optional):
+                The maximum number of seconds from the first attempt after
+                which no retry is started. Defaults to no deadline.
+
+            http_statuses (optional):
+                HTTP status codes of responses to retry.
+                Defaults to 429, 500, 502, 503 and 504.
+
+            api_statuses (optional):
+                Sift API statuses (the `status` field of response bodies) of
+                responses to retry. Defaults to -4, -3, -2, -1 (server-side
+                errors) and 60 (rate limited).
+
+            retry_non_idempotent (optional):
+                Whether to retry non-idempotent calls which may have been
+                processed. Defaults to False.
+
+            respect_retry_after (optional):
+                Whether to wait for the delay requested by the Retry-After
+                response header instead of the backoff delay.
+                Defaults to True.
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be a positive integer")
+
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.deadline = deadline
+        self.http_statuses = frozenset(http_statuses)
+        self.api_statuses = frozenset(api_statuses)
+        self.retry_non_idempotent = retry_non_idempotent
+        self.respect_retry_after = respect_retry_after
+
+    def is_retryable(
+        self,
+        error: ApiException,
+        idempotent: bool,
+        request_sent: bool = True,
+    ) -> bool:
+        """
+        Whether a failed call may be retried.
+
+        Args:
+            error:
+                The exception the call failed with.
+
+            idempotent:
+                Whether the called endpoint is idempotent.
+
+            request_sent (optional):
+                False if the call failed before the request was sent, e.g.
+                because the connection couldn't be established.
+        """
+        if error.http_status_code is None:
+            # connection error or timeout
+            retryable = True
+            processed = request_sent
+        else:
+            retryable = (
+                error.http_status_code in self.http_statuses
+                or error.api_status in self.api_statuses
+            )
+            # Sift rejects rate limited requests without processing them
+            processed = not (
+                error.http_status_code == 429
+                or error.api_status == API_STATUS_RATE_LIMITED
+            )
+
+        return retryable and (
+            idempotent or not processed or self.retry_non_idempotent
+        )
+
+    def backoff(self, attempt: int) -> float:
+        """The delay in seconds before the attempt following `attempt`."""
+        return random.uniform(
+            0, min(self.max_backoff, self.backoff_factor * 2 ** (attempt - 1))
+        )
+
+    def retry_delay(
+        self,
+        error: ApiException,
+        idempotent: bool,
+        attempt: int,
+        elapsed: float,
+        request_sent: bool = True,
+        retry_after: str | None = None,
+    ) -> float | None:
+        """
+        Decides whether to retry a failed call.
+
+        Args:
+            error:
+                The exception the call failed with.
+
+            idempotent:
+                Whether the called endpoint is idempotent.
+
+            attempt:
+                The number of the failed attempt, starting with 1.
+
+            elapsed:
+                The number of seconds since the first attempt started.
+
+            request_sent (optional):
+                False if the call failed before the request was sent.
+
+            retry_after (optional):
+                The value of the Retry-After response header.
+
+        Returns:
+            The number of seconds to wait before the next attempt, or None if
+            the call shouldn't be retried.
+        """
+        if attempt >= self.max_attempts or not self.is_retryable(
+            error, idempotent, request_sent
+        ):
+            return None
+
+        delay = (
+            _parse_retry_after(retry_after)
+            if self.respect_retry_after
+            else None
+        )
+
+        if delay is None:
+            delay = self.backoff(attempt)
+        elif delay > self.max_backoff:
+            # waiting for longer than allowed would only delay the failure
+            return None
+
+        if self.deadline is not None and elapsed + delay >= self.deadline:
+            return None
+
+        return delay
+
+
+def _parse_retry_after(value: t.Any) -> float | None:
+    # Retry-After is either a number of seconds or an HTTP date
+    if not isinstance(value, str):
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return max((date - now).total_seconds(), 0.0)
@@ -0,0 +1,129 @@
+"""Coalescing of concurrent identical calls.
+
+With `SingleFlight`, threads making a call which is already in flight wait
+for it and share its outcome instead of making their own. `AsyncSingleFlight`
+does the same for coroutines. Clients created with `coalesce_reads=True` use
+them for their GET requests, such as `get_user_score()`, `get_workflow_status()`
+and the `get_*_decisions()` methods.
+
+Shared `Response` objects must be treated as read-only.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import typing as t
+from collections.abc import Awaitable, Callable, Hashable
+
+_V = t.TypeVar("_V")
+
+
+class _Call(t.Generic[_V]):
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: _V | None = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight(t.Generic[_V]):
+    """Runs at most one call per key at a time across threads.
+
+    Attributes:
+        calls: The number of calls made.
+        shared: The number of callers served by another caller's call.
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.shared = 0
+
+        self._in_flight: dict[Hashable, _Call[_V]] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], _V]) -> _V:
+        """
+        Calls `fn`, unless a call with the same key is in flight, in which
+        case waits for it and returns its result or raises its exception.
+        """
+        with self._lock:
+            call = self._in_flight.get(key)
+
+            if call is None:
+                call = self._in_flight[key] = _Call()
+                self.calls += 1
+                leader = True
+            else:
+                self.shared += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+
+            if call.error is not None:
+                raise call.error
+
+            return t.cast(_V, call.result)
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            # later callers make a new call
+            with self._lock:
+                del self._in_flight[key]
+
+            call.done.set()
+
+
+class AsyncSingleFlight(t.Generic[_V]):
+    """Runs at most one call per key at a time across the tasks of an event
+    loop.
+
+    The call runs in its own task: a caller being cancelled doesn't cancel it
+    for the others.
+
+    Attributes:
+        calls: The number of calls made.
+        shared: The number of callers served by another caller's call.
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.shared = 0
+
+        self._in_flight: dict[Hashable, asyncio.Future[_V]] = {}
+
+    async def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Awaitable[_V]],
+    ) -> _V:
+        """
+        Awaits `fn()`, unless a call with the same key is in flight, in which
+        case awaits it instead.
+        """
+        future = self._in_flight.get(key)
+
+        if future is not None:
+            self.shared += 1
+        else:
+            future = asyncio.ensure_future(fn())
+            self._in_flight[key] = future
+            self.calls += 1
+            future.add_done_callback(lambda f: self._done(key, f))
+
+        return await asyncio.shield(future)
+
+    def _done(self, key: Hashable, future: asyncio.Future[_V]) -> None:
+        del self._in_flight[key]
+
+        # avoids "exception was never retrieved" warnings when every caller
+        # was cancelled
+        if not future.cancelled():
+            future.exception()
@@ -0,0 +1,465 @@
+"""Durable on-disk spool for events awaiting delivery.
+
+`Spool` is an append-only log of events split into segment files. An event
+is appended before it is sent and acknowledged once the Sift API accepted
+it, so events which failed to be sent, or were still in flight when the
+process died, are delivered on the next `replay()`. This gives at-least-once
+delivery: an event may be sent more than once, but it is not lost.
+
+Each record is a header (payload length, CRC32 of the payload, sequence
+number) followed by the event as JSON. Records are written with a single
+`os.write()`, so they survive a crash of the process as soon as `append()`
+returns. `fsync()` calls, which protect against power loss, are shared by
+concurrent appenders (group commit) and can be spaced out further with
+`sync_interval`.
+
+Acknowledgements are tracked in memory and persisted in a checkpoint file
+holding the highest sequence number below which every record is
+acknowledged. Segments made only of acknowledged records are deleted.
+
+Only events which failed with a transient error, see `is_transient()`, are
+kept for another delivery attempt. Events the Sift API rejected, e.g. as
+invalid, would be rejected again, so they are acknowledged and dropped.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import struct
+import threading
+import time
+import typing as t
+import zlib
+from collections.abc import Iterator, Mapping
+
+from sift.client import (
+    Client,
+    TrackItem,
+    _assert_non_empty_dict,
+    _assert_non_empty_str,
+)
+from sift.concurrency import is_overload
+from sift.exceptions import ApiException
+from sift.utils import DecimalEncoder
+
+logger = logging.getLogger(__name__)
+
+# payload length, CRC32 of the payload, sequence number
+_HEADER = struct.Struct(">IIQ")
+_SEGMENT_RE = re.compile(r"segment-(\d+)\.log")
+_CHECKPOINT = "checkpoint"
+
+
+def is_transient(error: Exception) -> bool:
+    """Whether an event which failed to be sent with `error` may be accepted
+    later: on a connection error or timeout, a rate limited or server-side
+    error, or a call rejected by the client's circuit breaker or rate
+    limiter. Other errors, such as HTTP 400 or 401 or an invalid event, are
+    permanent."""
+    return isinstance(error, ApiException) and is_overload(error)
+
+
+def _assert_serializable(options: Mapping[str, t.Any] | None) -> None:
+    # raises a ValueError naming the first option which isn't JSON
+    # serializable
+    for name, value in (options or {}).items():
+        try:
+            json.dumps(value, cls=DecimalEncoder)
+        except TypeError as e:
+            raise ValueError(
+                f"option {name!r} can't be spooled, only JSON serializable "
+                f"options can: {e}"
+            ) from e
+
+
+def _segment_name(first_seq: int) -> str:
+    return f"segment-{first_seq:020d}.log"
+
+
+def _read_records(path: str) -> Iterator[tuple[int, int, bytes]]:
+    """Yields (offset after the record, sequence number, payload) for every
+    valid record of a segment, stopping at the first torn or corrupt one.
+    """
+    with open(path, "rb") as f:
+        offset = 0
+
+        while True:
+            header = f.read(_HEADER.size)
+
+            if len(header) < _HEADER.size:
+                return
+
+            length, crc, seq = _HEADER.unpack(header)
+            payload = f.read(length)
+
+            if len(payload) < length or zlib.crc32(payload) != crc:
+                return
+
+            offset += _HEADER.size + length
+            yield offset, seq, payload
+
+
+class Spool:
+    """An append-only, segment-rotated log of events awaiting delivery.
+
+    Opening a spool recovers its state from `directory`: the checkpoint is
+    loaded and a torn record at the end of the last segment, left by a crash
+    in the middle of a write, is truncated.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        segment_size: int = 64 * 1024 * 1024,
+        sync_interval: float = 0.0,
+        checkpoint_interval: float = 1.0,
+    ) -> None:
+        """Open or create a spool.
+
+        Args:
+            directory:
+                The directory holding the segment and checkpoint files.
+                It is created if it doesn't exist. Only one Spool may use
+                a directory at a time.
+
+            segment_size (optional):
+                The size in bytes after which a new segment file is started.
+                Defaults to 64 MiB.
+
+            sync_interval (optional):
+                The minimum number of seconds between two fsync() calls.
+                With the default of 0, `append()` returns once the event is
+                fsync-ed to disk; concurrent appends share one fsync().
+                With a positive interval, `append()` doesn't wait for fsync(),
+                which only runs in the first `append()`, `flush()` or
+                `close()` once the interval has passed: on power failure
+                (but not on a crash of the process), the events appended
+                since the last fsync() may be lost. When appends stop,
+                these are only fsync-ed by `flush()` or `close()`.
+
+            checkpoint_interval (optional):
+                The minimum number of seconds between two writes of the
+                checkpoint file. Acknowledgements which are not checkpointed
+                yet when the process dies lead to the events being sent
+                again. Defaults to 1 second.
+        """
+        self.directory = os.fspath(directory)
+        self.segment_size = segment_size
+        self.sync_interval = sync_interval
+        self.checkpoint_interval = checkpoint_interval
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        # guards the segments, the write position and acknowledgements
+        self._lock = threading.Lock()
+        # held by the thread running fsync(), see `_sync()`
+        self._sync_lock = threading.Lock()
+
+        self._watermark = self._load_checkpoint()
+        self._acked: set[int] = set()
+        self._last_checkpoint = time.monotonic()
+        self._segments: list[tuple[int, str]] = []
+        self._next_seq = self._watermark + 1
+
+        self._recover()
+
+        _, path = self._segments[-1]
+        self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT)
+        self._segment_bytes = os.fstat(self._fd).st_size
+        self._retired_fds: list[int] = []
+        self._written = self._next_seq - 1
+        self._synced = self._written
+        self._last_sync = time.monotonic()
+        self._closed = False
+
+    def __enter__(self) -> Spool:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @property
+    def next_seq(self) -> int:
+        """The sequence number of the next appended event."""
+        return self._next_seq
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _load_checkpoint(self) -> int:
+        try:
+            with open(self._path(_CHECKPOINT)) as f:
+                return int(f.read())
+        except FileNotFoundError:
+            return 0
+
+    def _recover(self) -> None:
+        segments = sorted(
+            (int(match.group(1)), match.group(0))
+            for match in map(_SEGMENT_RE.fullmatch, os.listdir(self.directory))
+            if match
+        )
+
+        for i, (first_seq, name) in enumerate(segments):
+            path = self._path(name)
+            valid_size = 0
+
+            for valid_size, seq, _ in _read_records(path):
+                self._next_seq = max(self._next_seq, seq + 1)
+
+            if valid_size < os.path.getsize(path):
+                if i == len(segments) - 1:
+                    logger.warning("Truncating torn record in %s", path)
+                    os.truncate(path, valid_size)
+                else:
+                    logger.error("Skipping corrupt records in %s", path)
+
+            self._segments.append((first_seq, path))
+
+        if not self._segments:
+            self._segments.append(
+                (self._next_seq, self._path(_segment_name(self._next_seq)))
+            )
+
+    def append(self, item: TrackItem) -> int:
+        """
+        Appends an event to the spool.
+
+        Args:
+            item:
+                An `(event, properties)` or `(event, properties, options)`
+                tuple, as accepted by `client.track_many()`.
+
+        Returns:
+            The sequence number of the event, to be passed to `ack()` once it
+            has been delivered.
+
+        Raises:
+            ValueError: If an option can't be stored as JSON, e.g. a
+                `RetryPolicy` passed as `retry`.
+        """
+        event, properties, *rest = item
+        options = rest[0] if rest else None
+        _assert_non_empty_str(event, "event")
+        _assert_non_empty_dict(properties, "properties")
+
+        try:
+            payload = json.dumps(
+                [event, properties, options], cls=DecimalEncoder
+            ).encode()
+        except TypeError:
+            _assert_serializable(options)
+            raise
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Spool is closed")
+
+            seq = self._next_seq
+            self._next_seq += 1
+
+            if self._segment_bytes >= self.segment_size:
+                self._rotate(seq)
+
+            record = _HEADER.pack(len(payload), zlib.crc32(payload), seq)
+            self._segment_bytes += os.write(self._fd, record + payload)
+            self._written = seq
+
+        if (
+            not self.sync_interval
+            or time.monotonic() - self._last_sync >= self.sync_interval
+        ):
+            self._sync(seq)
+
+        return seq
+
+    def _rotate(self, first_seq: int) -> None:
+        # called with `_lock` held; the previous segment stays open until
+        # no fsync() can be running on it
+        path = self._path(_segment_name(first_seq))
+        self._retired_fds.append(self._fd)
+        self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT)
+        self._segment_bytes = 0
+        self._segments.append((first_seq, path))
+
+    def _sync(self, seq: int) -> None:
+        with self._sync_lock:
+            if self._synced >= seq:
+                # fsync-ed by the thread which held the lock before us
+                return
+
+            with self._lock:
+                target = self._written
+                fds = [*self._retired_fds, self._fd]
+                self._retired_fds.clear()
+
+            for fd in fds:
+                os.fsync(fd)
+
+            for fd in fds[:-1]:
+                os.close(fd)
+
+            self._synced = target
+            self._last_sync = time.monotonic()
+
+    def ack(self, seq: int) -> None:
+        """
+        Marks an event as delivered.
+
+        Args:
+            seq:
+                The sequence number returned by `append()` or `pending()`.
+        """
+        with self._lock:
+            if seq <= self._watermark:
+                return
+
+            self._acked.add(seq)
+
+            while self._watermark + 1 in self._acked:
+                self._watermark += 1
+                self._acked.remove(self._watermark)
+
+            if (
+                time.monotonic() - self._last_checkpoint
+                >= self.checkpoint_interval
+            ):
+                self._checkpoint()
+
+    def _checkpoint(self) -> None:
+        # called with `_lock` held
+        tmp_path = self._path(f"{_CHECKPOINT}.tmp")
+
+        with open(tmp_path, "w") as f:
+            f.write(str(self._watermark))
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmp_path, self._path(_CHECKPOINT))
+        self._last_checkpoint = time.monotonic()
+
+        # a segment only holds acknowledged events if the next one starts
+        # at or below the watermark; the active segment is never deleted
+        while (
+            len(self._segments) > 1
+            and self._segments[1][0] <= self._watermark + 1
+        ):
+            _, path = self._segments.pop(0)
+            os.remove(path)
+
+    def pending(
+        self,
+        before: int | None = None,
+    ) -> Iterator[tuple[int, TrackItem]]:
+        """
+        Reads the events which haven't been acknowledged yet from disk.
+
+        Args:
+            before (optional):
+                Only yield events whose sequence number is lower than
+                `before`, e.g. `spool.next_seq` at startup to only get events
+                from a previous run.
+
+        Yields:
+            (sequence number, (event, properties, options)) tuples in the
+            order events were appended.
+        """
+        with self._lock:
+            paths = [path for _, path in self._segments]
+
+        for path in paths:
+            try:
+                for _, seq, payload in _read_records(path):
+                    if before is not None and seq >= before:
+                        return
+
+                    if seq > self._watermark and seq not in self._acked:
+                        event, properties, options = json.loads(payload)
+                        yield seq, (event, properties, options)
+            except FileNotFoundError:
+                # deleted by a checkpoint since we listed the segments
+                continue
+
+    def replay(
+        self,
+        client: Client,
+        max_concurrency: int = 10,
+        before: int | None = None,
+    ) -> tuple[int, int]:
+        """
+        Sends the events which haven't been acknowledged yet and acknowledges
+        the ones accepted by the Sift API. Call it on startup to deliver the
+        events left over by a previous run, and periodically to retry failed
+        ones.
+
+        Args:
+            client:
+                The client used to send events.
+
+            max_concurrency (optional):
+                The maximum number of requests in flight. Defaults to 10.
+
+            before (optional):
+                Only send events whose sequence number is lower than
+                `before`.
+
+        Returns:
+            The number of events sent and the number of events which failed
+            to be sent. Failed events are acknowledged unless their error is
+            transient, see `is_transient()`.
+        """
+        seqs: list[int] = []
+        sent = failed = 0
+
+        def events() -> Iterator[TrackItem]:
+            for seq, item in self.pending(before):
+                seqs.append(seq)
+                yield item
+
+        for index, result in client.track_many(
+            events(), max_concurrency=max_concurrency, ordered=False
+        ):
+            if isinstance(result, ApiException):
+                failed += 1
+
+                if not is_transient(result):
+                    logger.warning(
+                        "Dropping spooled event %d rejected by the Sift API: "
+                        "%s",
+                        seqs[index],
+                        result,
+                    )
+                    self.ack(seqs[index])
+            else:
+                self.ack(seqs[index])
+                sent += 1
+
+        return sent, failed
+
+    def flush(self) -> None:
+        """Fsyncs appended events and writes the checkpoint."""
+        self._sync(self._written)
+
+        with self._lock:
+            self._checkpoint()
+
+    def close(self) -> None:
+        """Flushes the spool and closes its files."""
+        with self._sync_lock, self._lock:
+            if self._closed:
+                return
+
+            self._closed = True
+
+        self.flush()
+
+        with self._sync_lock, self._lock:
+            os.close(self._fd)
+
+            for fd in self._retired_fds:
+                os.close(fd)
+
+            self._retired_fds.clear()
@@ -0,0 +1,1079 @@
+"""A local stand-in for the Sift API, for tests, benchmarks and soak tests.
+
+`SiftServer` answers the calls of `sift.Client` and
+`sift.async_client.AsyncClient` to the events, score, labels, decisions,
+workflow status, PSP merchant and verification endpoints with responses
+shaped like Sift's, after a configurable latency, and records the requests
+it receives. Faults, such as rate limiting, server errors or malformed
+bodies, can be injected to see how the client, and the code using it,
+handles them:
+
+    with SiftServer(latency=lognormal_latency(0.03, 0.2)) as server:
+        client = sift.Client(
+            api_key="...", account_id="...", api_url=server.url
+        )
+        server.inject(Fault(429, probability=0.1))
+        ...
+        assert server.requests[0].endpoint == "track"
+
+Scores are derived from the user ID, so they are stable across calls, and
+labels, decisions and PSP merchant profiles sent to the server are returned
+by later calls. The server runs in a background thread of the process, or
+in a process of its own, e.g. to soak-test a service:
+
+    python -m sift.testing --port 8080 --latency 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import collections
+import gzip
+import json
+import math
+import random
+import re
+import threading
+import time
+import typing as t
+import zlib
+from collections.abc import Callable, Collection, Mapping, Sequence
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from sift.retry import API_STATUS_RATE_LIMITED
+
+Latency = t.Union[float, t.Callable[[], float]]
+
+ABUSE_TYPES = (
+    "payment_abuse",
+    "promotion_abuse",
+    "content_abuse",
+    "account_abuse",
+    "account_takeover",
+)
+
+# (method, path pattern, endpoint), the endpoint being the name of the client
+# method, as in sift.client.ENDPOINTS
+_SEGMENT = "([^/]+)"
+_ACCOUNT = f"/v3/accounts/{_SEGMENT}"
+_ROUTES = tuple(
+    (method, re.compile(pattern), endpoint)
+    for method, pattern, endpoint in (
+        ("POST", r"/v\d+/events", "track"),
+        ("GET", rf"/v\d+/score/{_SEGMENT}", "score"),
+        ("GET", rf"/v\d+/users/{_SEGMENT}/score", "get_user_score"),
+        ("POST", rf"/v\d+/users/{_SEGMENT}/score", "rescore_user"),
+        ("POST", rf"/v\d+/users/{_SEGMENT}/labels", "label"),
+        ("DELETE", rf"/v\d+/users/{_SEGMENT}/labels", "unlabel"),
+        (
+            "GET",
+            rf"{_ACCOUNT}/workflows/runs/{_SEGMENT}",
+            "get_workflow_status",
+        ),
+        ("GET", rf"{_ACCOUNT}/decisions", "get_decisions"),
+        (
+            "GET",
+            rf"{_ACCOUNT}/orders/{_SEGMENT}/decisions",
+            "get_order_decisions",
+        ),
+        (
+            "GET",
+            rf"{_ACCOUNT}/users/{_SEGMENT}/decisions",
+            "get_user_decisions",
+        ),
+        (
+            "POST",
+            rf"{_ACCOUNT}/users/{_SEGMENT}/decisions",
+            "apply_user_decision",
+        ),
+        (
+            "POST",
+            rf"{_ACCOUNT}/users/{_SEGMENT}/orders/{_SEGMENT}/decisions",
+            "apply_order_decision",
+        ),
+        (
+            "GET",
+            rf"{_ACCOUNT}/users/{_SEGMENT}/sessions/{_SEGMENT}/decisions",
+            "get_session_decisions",
+        ),
+        (
+            "POST",
+            rf"{_ACCOUNT}/users/{_SEGMENT}/sessions/{_SEGMENT}/decisions",
+            "apply_session_decision",
+        ),
+        (
+            "GET",
+            rf"{_ACCOUNT}/users/{_SEGMENT}/content/{_SEGMENT}/decisions",
+            "get_content_decisions",
+        ),
+        (
+            "POST",
+            rf"{_ACCOUNT}/users/{_SEGMENT}/content/{_SEGMENT}/decisions",
+            "apply_content_decision",
+        ),
+        (
+            "POST",
+            rf"{_ACCOUNT}/psp_management/merchants",
+            "create_psp_merchant_profile",
+        ),
+        (
+            "GET",
+            rf"{_ACCOUNT}/psp_management/merchants",
+            "get_psp_merchant_profiles",
+        ),
+        (
+            "GET",
+            rf"{_ACCOUNT}/psp_management/merchants/{_SEGMENT}",
+            "get_a_psp_merchant_profile",
+        ),
+        (
+            "PUT",
+            rf"{_ACCOUNT}/psp_management/merchants/{_SEGMENT}",
+            "update_psp_merchant_profile",
+        ),
+        ("POST", r"/v1/verification/send", "verification_send"),
+        ("POST", r"/v1/verification/resend", "verification_resend"),
+        ("POST", r"/v1/verification/check", "verification_check"),
+    )
+)
+
+# (id, name, entity type, abuse type, category)
+_DECISIONS = (
+    (
+        "user_looks_ok_payment_abuse",
+        "User looks OK",
+        "user",
+        "payment_abuse",
+        "accept",
+    ),
+    (
+        "user_looks_bad_payment_abuse",
+        "User looks bad",
+        "user",
+        "payment_abuse",
+        "block",
+    ),
+    (
+        "user_looks_bad_account_abuse",
+        "Ban account",
+        "user",
+        "account_abuse",
+        "block",
+    ),
+    (
+        "order_looks_ok_payment_abuse",
+        "Order looks OK",
+        "order",
+        "payment_abuse",
+        "accept",
+    ),
+    (
+        "order_looks_bad_payment_abuse",
+        "Cancel order",
+        "order",
+        "payment_abuse",
+        "block",
+    ),
+    (
+        "session_looks_bad_account_takeover",
+        "Lock session",
+        "session",
+        "account_takeover",
+        "block",
+    ),
+    (
+        "content_looks_bad_content_abuse",
+        "Remove content",
+        "content",
+        "content_abuse",
+        "block",
+    ),
+)
+
+# Sift API statuses of the errors answered for injected HTTP statuses
+_API_ERRORS = {
+    429: (API_STATUS_RATE_LIMITED, "Rate limit exceeded"),
+    500: (-1, "Unknown error"),
+    502: (-2, "Unexpected error"),
+    503: (-4, "Server too busy"),
+    504: (-3, "Not ready yet"),
+}
+
+API_STATUS_INVALID_API_KEY = 51
+API_STATUS_INVALID_CODE = 50
+
+
+def uniform_latency(low: float, high: float) -> Callable[[], float]:
+    """A latency, in seconds, uniformly distributed between `low` and
+    `high`."""
+    return lambda: random.uniform(low, high)
+
+
+def lognormal_latency(median: float, p99: float) -> Callable[[], float]:
+    """A latency, in seconds, log-normally distributed, as network latencies
+    usually are, with the given median and 99th percentile."""
+    if not 0 < median <= p99:
+        raise ValueError("median must be positive and at most p99")
+
+    mu = math.log(median)
+    # the 99th percentile of the standard normal distribution
+    sigma = (math.log(p99) - mu) / 2.326
+
+    return lambda: random.lognormvariate(mu, sigma)
+
+
+class Fault:
+    """An error answered by a `SiftServer` instead of the regular response.
+
+    Attributes:
+        remaining: How many more times the fault is answered, None if
+            unlimited.
+    """
+
+    def __init__(
+        self,
+        status: int | None = None,
+        probability: float = 1.0,
+        endpoints: Collection[str] | None = None,
+        times: int | None = None,
+        retry_after: int | None = None,
+        malformed_json: bool = False,
+        disconnect: bool = False,
+    ) -> None:
+        """Initialize the fault.
+
+        Args:
+            status (optional):
+                The HTTP status answered, with the body the Sift API answers
+                with it, e.g. API status 60 for 429. Defaults to 503, or 200
+                with `malformed_json`.
+
+            probability (optional):
+                The probability that a matching request gets the fault.
+                Defaults to 1.
+
+            endpoints (optional):
+                The names of the client methods whose requests get the
+                fault, e.g. {"track"}. Defaults to all of them.
+
+            times (optional):
+                How many requests get the fault before it is removed.
+                Defaults to no limit.
+
+            retry_after (optional):
+                The seconds sent in a Retry-After header.
+
+            malformed_json (optional):
+                Answer with a truncated JSON body.
+
+            disconnect (optional):
+                Close the connection without answering.
+        """
+        if not 0 <= probability <= 1:
+            raise ValueError("probability must be between 0 and 1")
+
+        if times is not None and times < 1:
+            raise ValueError("times must be a positive integer")
+
+        self.status = status or (200 if malformed_json else 503)
+        self.probability = probability
+        self.endpoints = frozenset(endpoints) if endpoints else None
+        self.remaining = times
+        self.retry_after = retry_after
+        self.malformed_json = malformed_json
+        self.disconnect = disconnect
+
+    def matches(self, endpoint: str | None) -> bool:
+        return self.endpoints is None or endpoint in self.endpoints
+
+
+class CapturedRequest:
+    """A request received by a `SiftServer`.
+
+    Attributes:
+        method: The HTTP method, e.g. "POST".
+        path: The path, without the query string.
+        query: The query string parameters.
+        headers: The headers.
+        body: The body, decompressed if it was sent compressed.
+        endpoint: The name of the client method the request is for, e.g.
+            "track", or None if the path is unknown.
+        time: When the request was received, as a UNIX timestamp.
+    """
+
+    __slots__ = (
+        "method",
+        "path",
+        "query",
+        "headers",
+        "body",
+        "endpoint",
+        "time",
+    )
+
+    def __init__(
+        self,
+        method: str,
+        path: str,
+        query: Mapping[str, str],
+        headers: Mapping[str, str],
+        body: bytes,
+        endpoint: str | None,
+    ) -> None:
+        self.method = method
+        self.path = path
+        self.query = query
+        self.headers = headers
+        self.body = body
+        self.endpoint = endpoint
+        self.time = time.time()
+
+    def json(self) -> t.Any:
+        """The body parsed as JSON."""
+        return json.loads(self.body)
+
+    def __repr__(self) -> str:
+        return f"<CapturedRequest {self.method} {self.path}>"
+
+
+class SiftServer:
+    """An HTTP server standing in for the Sift API.
+
+    Attributes:
+        url: The URL to use as the `api_url` of the client, once started.
+        faults: The injected faults, see `inject()`.
+        verification_code: The code accepted by the verification check
+            endpoint.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: Latency | Mapping[str, Latency] = 0.0,
+        api_key: str | None = None,
+        capture: bool = True,
+        max_captured: int | None = 10000,
+        seed: int | None = None,
+    ) -> None:
+        """Initialize the server.
+
+        Args:
+            host, port (optional):
+                The address to listen on. Defaults to a free port of the
+                loopback interface.
+
+            latency (optional):
+                How many seconds to wait before answering: a number,
+                a function returning one, such as `lognormal_latency()`, or
+                a mapping from client method names to either. Defaults to 0.
+
+            api_key (optional):
+                The API key accepted. Defaults to any API key.
+
+            capture (optional):
+                Whether to record the requests received in `requests`.
+                Defaults to True.
+
+            max_captured (optional):
+                How many requests are recorded, the oldest being dropped
+                first. None for no limit. Defaults to 10000.
+
+            seed (optional):
+                The seed of the random faults.
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.api_key = api_key
+        self.capture = capture
+        self.faults: list[Fault] = []
+        self.verification_code = "123456"
+        self.url = ""
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._requests: collections.deque[CapturedRequest] = collections.deque(
+            maxlen=max_captured
+        )
+        self._labels: dict[str, dict[str, dict[str, t.Any]]] = {}
+        self._decisions: dict[tuple[str, str], dict[str, dict[str, t.Any]]] = (
+            {}
+        )
+        self._merchants: dict[str, dict[str, dict[str, t.Any]]] = {}
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def requests(self) -> list[CapturedRequest]:
+        """The requests received, oldest first."""
+        with self._lock:
+            return list(self._requests)
+
+    def requests_to(self, endpoint: str) -> list[CapturedRequest]:
+        """The requests received for a client method, e.g. "track"."""
+        return [r for r in self.requests if r.endpoint == endpoint]
+
+    def clear(self) -> None:
+        """Forgets the requests received."""
+        with self._lock:
+            self._requests.clear()
+
+    def inject(self, fault: Fault) -> Fault:
+        """Answers the matching requests with a fault, until it is removed
+        with `clear_faults()` or has been answered `times` times."""
+        with self._lock:
+            self.faults.append(fault)
+
+        return fault
+
+    def clear_faults(self) -> None:
+        """Removes the injected faults."""
+        with self._lock:
+            self.faults.clear()
+
+    def start(self) -> SiftServer:
+        """Starts serving in a background thread."""
+        server = self._bind()
+        self._thread = threading.Thread(
+            target=server.serve_forever,
+            # how often stop() is checked for
+            kwargs={"poll_interval": 0.05},
+            name="sift-testing",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stops serving and closes the connections."""
+        if self._server is None:
+            return
+
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+
+        self._server.server_close()
+        self._server = None
+
+    def __enter__(self) -> SiftServer:
+        return self.start()
+
+    def __exit__(self, *args: object) -> None:
+        self.stop()
+
+    def _bind(self) -> ThreadingHTTPServer:
+        if self._server is not None:
+            raise RuntimeError("The server is already started")
+
+        server = _HTTPServer((self.host, self.port), _Handler)
+        server.sift_server = self  # type: ignore[attr-defined]
+        host, port = server.server_address[:2]
+        self._server = server
+        self.url = f"http://{host!s}:{port}"
+        return server
+
+    def _latency(self, endpoint: str | None) -> float:
+        latency = self.latency
+
+        if isinstance(latency, Mapping):
+            latency = latency.get(endpoint, 0.0) if endpoint else 0.0
+
+        return latency() if callable(latency) else latency
+
+    def _fault(self, endpoint: str | None) -> Fault | None:
+        with self._lock:
+            for fault in self.faults:
+                if not fault.matches(endpoint) or (
+                    self._random.random() >= fault.probability
+                ):
+                    continue
+
+                if fault.remaining is not None:
+                    fault.remaining -= 1
+
+                    if not fault.remaining:
+                        self.faults.remove(fault)
+
+                return fault
+
+        return None
+
+    def _capture(self, request: CapturedRequest) -> None:
+        if self.capture:
+            with self._lock:
+                self._requests.append(request)
+
+    def _authorized(self, request: CapturedRequest) -> bool:
+        if self.api_key is None:
+            return True
+
+        if request.endpoint in ("track", "label"):
+            try:
+                return bool(request.json().get("$api_key") == self.api_key)
+            except ValueError:
+                return False
+
+        authorization = request.headers.get("Authorization", "")
+
+        return authorization == _basic_auth(self.api_key)
+
+    def _respond(
+        self, request: CapturedRequest, ids: Sequence[str]
+    ) -> tuple[int, t.Any]:
+        # the HTTP status and the JSON body
+        endpoint = t.cast(str, request.endpoint)
+        body = request.json() if request.body else {}
+        now = int(time.time() * 1000)
+
+        if endpoint == "track":
+            return 200, self._track(request, body, now)
+
+        if endpoint in ("score", "get_user_score", "rescore_user"):
+            return 200, self._score(endpoint, ids[0], request.query)
+
+        if endpoint == "label":
+            abuse_type = body.get("$abuse_type", "payment_abuse")
+
+            with self._lock:
+                self._labels.setdefault(ids[0], {})[abuse_type] = {
+                    "is_bad": body.get("$is_bad"),
+                    "time": body.get("$time", now),
+                    "description": body.get("$description", ""),
+                }
+
+            return 200, {
+                "status": 0,
+                "error_message": "OK",
+                "time": now // 1000,
+                "request": request.body.decode(),
+            }
+
+        if endpoint == "unlabel":
+            with self._lock:
+                labels = self._labels.get(ids[0], {})
+                abuse_type = request.query.get("abuse_type")
+
+                if abuse_type is None:
+                    labels.clear()
+                else:
+                    labels.pop(abuse_type, None)
+
+            return 204, None
+
+        if endpoint == "get_workflow_status":
+            return 200, _workflow_status(ids[1], now)
+
+        if endpoint == "get_decisions":
+            return 200, _decisions(request.query)
+
+        if endpoint.startswith("apply_"):
+            return self._apply_decision(endpoint, ids, body, now)
+
+        if endpoint.endswith("_decisions"):
+            entity_type = endpoint.split("_")[1]
+
+            with self._lock:
+                decisions = dict(
+                    self._decisions.get((entity_type, ids[-1]), {})
+                )
+
+            return 200, {"decisions": decisions}
+
+        if "psp_merchant" in endpoint:
+            return self._merchant(endpoint, ids, body, request.query, now)
+
+        return 200, self._verification(endpoint, body, now)
+
+    def _track(
+        self, request: CapturedRequest, body: t.Any, now: int
+    ) -> dict[str, t.Any]:
+        response: dict[str, t.Any] = {
+            "status": 0,
+            "error_message": "OK",
+            "time": now // 1000,
+            "request": request.body.decode(),
+        }
+        query = request.query
+
+        if any(
+            query.get(name) == "true"
+            for name in (
+                "return_score",
+                "return_action",
+                "return_workflow_status",
+                "return_route_info",
+            )
+        ):
+            score = self._score("score", body.get("$user_id", ""), query)
+
+            if query.get("return_action") == "true":
+                score["actions"] = []
+
+            if query.get("return_workflow_status") == "true":
+                score["workflow_statuses"] = []
+
+            response["score_response"] = score
+
+        return response
+
+    def _score(
+        self, endpoint: str, user_id: str, query: Mapping[str, str]
+    ) -> dict[str, t.Any]:
+        abuse_types = (
+            query["abuse_types"].split(",")
+            if query.get("abuse_types")
+            else ABUSE_TYPES
+        )
+        scores = {
+            abuse_type: {
+                "score": _score(user_id, abuse_type),
+                "reasons": [
+                    {
+                        "name": "Number of users with the same device",
+                        "value": "1",
+                    }
+                ],
+            }
+            for abuse_type in abuse_types
+        }
+
+        with self._lock:
+            labels = dict(self._labels.get(user_id, {}))
+            decisions = dict(self._decisions.get(("user", user_id), {}))
+
+        if endpoint == "score":
+            return {
+                "status": 0,
+                "error_message": "OK",
+                "user_id": user_id,
+                "scores": scores,
+                "latest_labels": labels,
+            }
+
+        return {
+            "status": 0,
+            "error_message": "OK",
+            "entity_type": "user",
+            "entity_id": user_id,
+            "scores": scores,
+            "latest_decisions": {
+                abuse_type: {"id": decision["decision"]["id"]}
+                for abuse_type, decision in decisions.items()
+            },
+            "latest_labels": labels,
+        }
+
+    def _apply_decision(
+        self, endpoint: str, ids: Sequence[str], body: t.Any, now: int
+    ) -> tuple[int, t.Any]:
+        entity_type = endpoint.split("_")[1]
+        decision_id = body.get("decision_id")
+        abuse_type = next(
+            (d[3] for d in _DECISIONS if d[0] == decision_id), None
+        )
+
+        if abuse_type is None:
+            return 400, {
+                "error": "bad_request",
+                "description": f"Unknown decision_id: {decision_id}",
+            }
+
+        with self._lock:
+            self._decisions.setdefault((entity_type, ids[-1]), {})[
+                abuse_type
+            ] = {
+                "decision": {"id": decision_id},
+                "time": body.get("time", now),
+                "webhook_succeeded": False,
+            }
+
+        return 200, {
+            "entity": {"id": ids[-1], "type": entity_type},
+            "decision": {"id": decision_id},
+            "time": now,
+        }
+
+    def _merchant(
+        self,
+        endpoint: str,
+        ids: Sequence[str],
+        body: t.Any,
+        query: Mapping[str, str],
+        now: int,
+    ) -> tuple[int, t.Any]:
+        with self._lock:
+            merchants = self._merchants.setdefault(ids[0], {})
+
+            if endpoint == "get_psp_merchant_profiles":
+                profiles = sorted(merchants.items())
+                start = int(query.get("batch_token") or 0)
+                end = start + int(query.get("batch_size") or 100)
+                has_more = end < len(profiles)
+                response = {
+                    "merchants": [p for _, p in profiles[start:end]],
+                    "total_results": len(profiles),
+                    "has_more": has_more,
+                }
+
+                if has_more:
+                    response["next_ref"] = str(end)
+
+                return 200, response
+
+            merchant_id = (
+                body.get("$id", "")
+                if endpoint == "create_psp_merchant_profile"
+                else ids[1]
+            )
+            merchant = merchants.get(merchant_id)
+
+            if endpoint == "create_psp_merchant_profile" and merchant:
+                return 400, {
+                    "error": "bad_request",
+                    "description": f"Merchant {merchant_id} already exists",
+                }
+
+            if endpoint != "create_psp_merchant_profile" and not merchant:
+                return 404, {
+                    "error": "not_found",
+                    "description": f"Merchant {merchant_id} not found",
+                }
+
+            if endpoint == "get_a_psp_merchant_profile":
+                return 200, merchant
+
+            merchant = {
+                **(merchant or {"created_at": now, "created_by": "api"}),
+                **_strip_dollars(body),
+                "id": merchant_id,
+                "last_updated_at": now,
+                "last_updated_by": "api",
+            }
+            merchants[merchant_id] = merchant
+
+            return (
+                201 if endpoint == "create_psp_merchant_profile" else 200
+            ), merchant
+
+    def _verification(
+        self, endpoint: str, body: t.Any, now: int
+    ) -> dict[str, t.Any]:
+        if endpoint == "verification_check":
+            if body.get("$code") != self.verification_code:
+                return {
+                    "status": API_STATUS_INVALID_CODE,
+                    "error_message": "Invalid code",
+                    "checked_at": now,
+                }
+
+            return {"status": 0, "error_message": "OK", "checked_at": now}
+
+        return {
+            "status": 0,
+            "error_message": "OK",
+            "sent_at": now,
+            "segment_id": "143",
+            "segment_name": "Verification Template",
+            "brand_name": body.get("$brand_name", ""),
+            "site_country": body.get("$site_country", ""),
+            "content_language": body.get("$language", ""),
+        }
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # the default of 5 drops the connections of concurrent clients
+    request_queue_size = 128
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "SiftServer"
+    # the headers and the body are written separately, so delayed ACKs
+    # would hold back the body
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        self._handle()
+
+    do_POST = do_PUT = do_DELETE = do_GET
+
+    def do_HEAD(self) -> None:
+        # connection warm-up pings
+        self.send_response(404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _handle(self) -> None:
+        sift_server: SiftServer = self.server.sift_server  # type: ignore[attr-defined]
+        url = urlsplit(self.path)
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        encoding = self.headers.get("Content-Encoding")
+
+        if encoding == "gzip":
+            body = gzip.decompress(body)
+        elif encoding == "deflate":
+            body = zlib.decompress(body)
+
+        endpoint, ids = _route(self.command, url.path)
+        request = CapturedRequest(
+            self.command,
+            url.path,
+            dict(parse_qsl(url.query)),
+            dict(self.headers.items()),
+            body,
+            endpoint,
+        )
+        sift_server._capture(request)
+        fault = sift_server._fault(endpoint)
+        time.sleep(sift_server._latency(endpoint))
+
+        if fault is not None:
+            self._send_fault(fault)
+        elif endpoint is None:
+            self._send(
+                404,
+                {"error": "not_found", "description": "Unknown endpoint"},
+            )
+        elif not sift_server._authorized(request):
+            if url.path.startswith("/v3/"):
+                self._send(
+                    401,
+                    {"error": "unauthorized", "description": "Bad API key"},
+                )
+            else:
+                self._send(
+                    400,
+                    {
+                        "status": API_STATUS_INVALID_API_KEY,
+                        "error_message": "Invalid API key",
+                    },
+                )
+        else:
+            try:
+                status, response = sift_server._respond(request, ids)
+            except (ValueError, AttributeError):
+                status, response = 400, {
+                    "status": 53,
+                    "error_message": "Invalid JSON in request body",
+                }
+
+            self._send(status, response)
+
+    def _send_fault(self, fault: Fault) -> None:
+        if fault.disconnect:
+            self.close_connection = True
+            return
+
+        headers = {}
+
+        if fault.retry_after is not None:
+            headers["Retry-After"] = str(fault.retry_after)
+
+        if fault.malformed_json:
+            body = json.dumps({"status": 0, "error_message": "OK"}).encode()
+            end = len(body) // 2
+            self._send_body(fault.status, body[:end], headers)
+            return
+
+        api_status, message = _API_ERRORS.get(
+            fault.status, (-2, HTTPStatus(fault.status).phrase)
+        )
+        self._send(
+            fault.status,
+            {"status": api_status, "error_message": message},
+            headers,
+        )
+
+    def _send(
+        self,
+        status: int,
+        response: t.Any,
+        headers: Mapping[str, str] | None = None,
+    ) -> None:
+        body = b"" if response is None else json.dumps(response).encode()
+        self._send_body(status, body, headers)
+
+    def _send_body(
+        self,
+        status: int,
+        body: bytes,
+        headers: Mapping[str, str] | None = None,
+    ) -> None:
+        self.send_response(status)
+
+        if body:
+            self.send_header("Content-Type", "application/json")
+
+        self.send_header("Content-Length", str(len(body)))
+
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: t.Any) -> None:
+        pass
+
+
+def _route(method: str, path: str) -> tuple[str | None, tuple[str, ...]]:
+    # the endpoint and the IDs in the path
+    for route_method, pattern, endpoint in _ROUTES:
+        match = pattern.fullmatch(path)
+
+        if match and route_method == method:
+            return endpoint, tuple(unquote(id) for id in match.groups())
+
+    return None, ()
+
+
+def _basic_auth(api_key: str) -> str:
+    return "Basic " + base64.b64encode(f"{api_key}:".encode()).decode()
+
+
+def _score(user_id: str, abuse_type: str) -> float:
+    # stable across calls and processes, unlike hash()
+    return zlib.crc32(f"{user_id}:{abuse_type}".encode()) % 1000 / 1000
+
+
+def _strip_dollars(value: t.Any) -> t.Any:
+    # the PSP merchant API answers with the fields sent, without the "$"
+    if isinstance(value, dict):
+        return {k.lstrip("$"): _strip_dollars(v) for k, v in value.items()}
+
+    return value
+
+
+def _workflow_status(run_id: str, now: int) -> dict[str, t.Any]:
+    return {
+        "id": run_id,
+        "config": {"id": "pv3u5hyqcgpmk", "version": "1468367620871"},
+        "config_display_name": "Payment abuse review",
+        "abuse_types": ["payment_abuse"],
+        "state": "finished",
+        "entity": {"id": f"{run_id}_user", "type": "user"},
+        "history": [
+            {
+                "app": "decision",
+                "name": "Order looks OK",
+                "state": "finished",
+                "config": {"decision_id": "order_looks_ok_payment_abuse"},
+            },
+            {
+                "app": "event",
+                "name": "Event",
+                "state": "finished",
+                "config": {},
+            },
+        ],
+        "route": {"name": "Low risk"},
+        "created_at": now,
+    }
+
+
+def _decisions(query: Mapping[str, str]) -> dict[str, t.Any]:
+    entity_type = query.get("entity_type")
+    abuse_types = (
+        set(query["abuse_types"].split(","))
+        if query.get("abuse_types")
+        else None
+    )
+    decisions = [
+        {
+            "id": id,
+            "name": name,
+            "description": f"{name} ({abuse_type})",
+            "entity_type": entity_type_,
+            "abuse_type": abuse_type,
+            "category": category,
+            "webhook_url": "",
+            "created_at": 1468367620871,
+            "created_by": "admin@example.com",
+            "updated_at": 1468367620871,
+            "updated_by": "admin@example.com",
+        }
+        for id, name, entity_type_, abuse_type, category in _DECISIONS
+        if entity_type in (None, entity_type_)
+        and (abuse_types is None or abuse_type in abuse_types)
+    ]
+    start = int(query.get("from") or 0)
+    end = start + int(query.get("limit") or 100)
+    response: dict[str, t.Any] = {
+        "data": decisions[start:end],
+        "has_more": end < len(decisions),
+        "total_results": len(decisions),
+    }
+
+    if response["has_more"]:
+        response["next_ref"] = f"?from={end}&limit={end - start}"
+
+    return response
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m sift.testing",
+        description="Serves a local stand-in for the Sift API.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument(
+        "--latency", type=float, default=0, help="median latency in ms"
+    )
+    parser.add_argument(
+        "--p99", type=float, help="99th percentile latency in ms"
+    )
+    parser.add_argument("--api-key", help="the API key accepted")
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0,
+        help="the share of requests answered with a 503",
+    )
+    parser.add_argument(
+        "--rate-limit-rate",
+        type=float,
+        default=0,
+        help="the share of requests answered with a 429",
+    )
+    args = parser.parse_args(argv)
+
+    latency: Latency = args.latency / 1000
+
+    if args.p99:
+        latency = lognormal_latency(args.latency / 1000, args.p99 / 1000)
+
+    server = SiftServer(
+        args.host,
+        args.port,
+        latency=latency,
+        api_key=args.api_key,
+        capture=False,
+    )
+
+    if args.rate_limit_rate:
+        server.inject(Fault(429, probability=args.rate_limit_rate))
+
+    if args.error_rate:
+        server.inject(Fault(503, probability=args.error_rate))
+
+    http_server = server._bind()
+    print(f"Serving the Sift API on {server.url}", flush=True)
+
+    try:
+        http_server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
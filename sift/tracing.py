@@ -0,0 +1,140 @@
+"""OpenTelemetry tracing of the API calls of the client.
+
+Clients wrap each API call in a span named after the client method, e.g.
+"sift.track" or "sift.get_user_score", child of the current span, so traces
+show how much of a slow checkout was spent calling Sift. The span covers the
+retries of the call and their backoff, and has the attributes:
+
+- `sift.endpoint`: the client method, e.g. "track";
+- `sift.endpoint_family`: the endpoint family, e.g. "events", as in
+  `sift.client.ENDPOINTS`;
+- `sift.event_type`: the type of a tracked event, e.g. "$create_order";
+- `sift.retry_count`: the number of retried attempts;
+- `url.template`: the path of the endpoint without IDs, e.g.
+  "/v205/users/{user_id}/score";
+- `http.request.method` and `http.response.status_code`.
+
+The trace context of the span is propagated to the Sift API in the request
+headers, e.g. `traceparent`, by the global OpenTelemetry propagator.
+
+Clients trace their calls by default when the OpenTelemetry API is
+installed, and import nothing from it otherwise. Pass `tracing=False` to a
+client to disable tracing, or a `Tracing` to use a tracer provider other
+than the global one.
+
+It requires the `tracing` extra: pip install "Sift[tracing]"
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import typing as t
+from collections.abc import Iterator
+
+try:
+    from opentelemetry import propagate, trace
+except ImportError as e:
+    raise ImportError(
+        "Tracing requires the opentelemetry-api package. "
+        'Install it with `pip install "Sift[tracing]"`.'
+    ) from e
+
+from sift.exceptions import ApiException
+from sift.version import VERSION
+
+
+class _Call:
+    # the outcome of a traced call, reported by the client
+    __slots__ = ("status", "retries")
+
+    def __init__(self) -> None:
+        self.status: int | None = None
+        self.retries = 0
+
+
+# the traced call in progress in the current thread or task
+_current_call: contextvars.ContextVar[_Call | None] = contextvars.ContextVar(
+    "sift_call", default=None
+)
+
+
+class Tracing:
+    """Creates the spans of the API calls of clients, see the module
+    documentation. A `Tracing` can be shared by several clients."""
+
+    def __init__(
+        self, tracer_provider: trace.TracerProvider | None = None
+    ) -> None:
+        """Initialize the tracing.
+
+        Args:
+            tracer_provider (optional):
+                The OpenTelemetry tracer provider creating the spans.
+                Defaults to the global one.
+        """
+        self.tracer = trace.get_tracer("sift", VERSION, tracer_provider)
+
+    @contextlib.contextmanager
+    def _span(
+        self,
+        endpoint: str,
+        family: str,
+        method: str,
+        url_template: str,
+        event_type: str | None,
+        kwargs: dict[str, t.Any],
+    ) -> Iterator[_Call]:
+        # the span of a call to the API, whose trace context is added to
+        # the headers in `kwargs`, the arguments of the request
+        attributes: dict[str, t.Any] = {
+            "sift.endpoint": endpoint,
+            "sift.endpoint_family": family,
+            "url.template": url_template,
+            "http.request.method": method,
+        }
+
+        if event_type is not None:
+            attributes["sift.event_type"] = event_type
+
+        call = _Call()
+
+        with self.tracer.start_as_current_span(
+            f"sift.{endpoint}",
+            kind=trace.SpanKind.CLIENT,
+            attributes=attributes,
+        ) as span:
+            carrier: dict[str, str] = {}
+            propagate.inject(carrier)
+
+            if carrier:
+                kwargs["headers"] = {
+                    **(kwargs.get("headers") or {}),
+                    **carrier,
+                }
+
+            token = _current_call.set(call)
+
+            try:
+                yield call
+            except ApiException as e:
+                call.status = e.http_status_code
+                raise
+            finally:
+                _current_call.reset(token)
+
+                if span.is_recording():
+                    span.set_attribute("sift.retry_count", call.retries)
+
+                    if call.status is not None:
+                        span.set_attribute(
+                            "http.response.status_code", call.status
+                        )
+
+    @staticmethod
+    def _count_retry() -> None:
+        # counts a retried attempt of the call in progress
+        call = _current_call.get()
+
+        if call is not None:
+            call.retries += 1
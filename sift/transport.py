@@ -0,0 +1,402 @@
+"""Transports sending the HTTP requests of `sift.Client`.
+
+A transport turns an `HttpRequest` into a response holding the HTTP status,
+headers and body, or raises `sift.exceptions.TransportError` when it gets no
+response. Everything else, from building requests to retries and parsing
+responses, is left to the client, so any HTTP library, or an in-process
+fake, can send the calls of the client:
+
+    client = sift.Client(api_key="...", transport=Urllib3Transport())
+
+`RequestsTransport`, sending requests with a `requests.Session`, is the
+default. `Urllib3Transport` sends them with urllib3 directly, without the
+per-request overhead of requests, and `sift.http2.HTTP2Transport` over
+HTTP/2.
+"""
+
+from __future__ import annotations
+
+import json
+import typing as t
+from collections.abc import Iterator, Mapping
+from urllib.parse import urlencode
+
+import requests
+import urllib3
+from requests.auth import AuthBase
+from requests.structures import CaseInsensitiveDict
+
+from sift.exceptions import TransportError
+from sift.pool import PoolStats, _CountingPoolManager
+
+
+class HttpRequest:
+    """An HTTP request of the client, as handed to a transport.
+
+    Attributes:
+        method: The lowercase HTTP method, e.g. "post".
+        url: The URL, without the query string.
+        params: The query string parameters.
+        data: The body.
+        headers: The headers, without `Authorization`.
+        auth: The `requests` auth adding the `Authorization` header,
+            see `auth_headers()`.
+        timeout: How many seconds to wait for the server, as a float, or
+            a (connect timeout, read timeout) tuple.
+        stream: Whether the body is read with `iter_content()` rather than
+            `content`.
+    """
+
+    __slots__ = (
+        "method",
+        "url",
+        "params",
+        "data",
+        "headers",
+        "auth",
+        "timeout",
+        "stream",
+    )
+
+    def __init__(
+        self,
+        method: str,
+        url: str,
+        params: Mapping[str, t.Any] | None = None,
+        data: str | bytes | None = None,
+        headers: Mapping[str, str] | None = None,
+        auth: AuthBase | None = None,
+        timeout: float | tuple[float, float] | None = None,
+        stream: bool = False,
+    ) -> None:
+        self.method = method
+        self.url = url
+        self.params = params
+        self.data = data
+        self.headers = headers
+        self.auth = auth
+        self.timeout = timeout
+        self.stream = stream
+
+    def full_url(self) -> str:
+        """The URL with the query string of `params`, encoded as requests
+        does."""
+        params = {
+            k: v for k, v in (self.params or {}).items() if v is not None
+        }
+
+        return (
+            f"{self.url}?{urlencode(params, doseq=True)}"
+            if params
+            else self.url
+        )
+
+    def auth_headers(self) -> Mapping[str, str]:
+        """The headers added by `auth`."""
+        if self.auth is None:
+            return {}
+
+        request = requests.PreparedRequest()
+        request.headers = CaseInsensitiveDict()
+        self.auth(request)
+        return request.headers
+
+
+class TransportResponse(t.Protocol):
+    """A response of a transport.
+
+    `requests.Response` satisfies it.
+    """
+
+    @property
+    def url(self) -> t.Any:
+        """The URL of the request."""
+
+    @property
+    def status_code(self) -> int:
+        """The HTTP status code."""
+
+    @property
+    def headers(self) -> Mapping[str, str]:
+        """The response headers."""
+
+    @property
+    def text(self) -> str:
+        """The decoded response body."""
+
+    @property
+    def content(self) -> bytes:
+        """The raw response body."""
+
+    def json(self) -> t.Any:
+        """The response body parsed as JSON."""
+
+    def iter_content(self, chunk_size: int) -> Iterator[bytes]:
+        """
+        Reads the body of a streamed response, then releases its connection.
+
+        Raises:
+            TransportError: If reading failed.
+        """
+
+
+class Transport(t.Protocol):
+    """Sends the HTTP requests of `sift.Client`."""
+
+    def send(self, request: HttpRequest) -> TransportResponse:
+        """
+        Sends a request.
+
+        Raises:
+            TransportError: If no response was received.
+        """
+
+    def close(self) -> None:
+        """Closes the connections."""
+
+
+class BufferedResponse:
+    """A `TransportResponse` whose body is in memory, e.g. for fake
+    transports."""
+
+    __slots__ = ("url", "status_code", "headers", "content")
+
+    def __init__(
+        self,
+        url: str,
+        status_code: int,
+        headers: Mapping[str, str] | None = None,
+        content: bytes = b"",
+    ) -> None:
+        self.url = url
+        self.status_code = status_code
+        self.headers: Mapping[str, str] = CaseInsensitiveDict(headers or {})
+        self.content = content
+
+    @property
+    def text(self) -> str:
+        return self.content.decode()
+
+    def json(self) -> t.Any:
+        return json.loads(self.content)
+
+    def iter_content(self, chunk_size: int) -> Iterator[bytes]:
+        for start in range(0, len(self.content), chunk_size):
+            end = start + chunk_size
+            yield self.content[start:end]
+
+
+class RequestsTransport:
+    """The default transport, sending requests with a `requests.Session`."""
+
+    def __init__(self, session: requests.Session) -> None:
+        self.session = session
+
+    def send(self, request: HttpRequest) -> TransportResponse:
+        # only the arguments set, as the client did before transports
+        kwargs: dict[str, t.Any] = {}
+
+        for name in ("params", "data", "headers", "auth", "timeout"):
+            value = getattr(request, name)
+
+            if value is not None:
+                kwargs[name] = value
+
+        if request.stream:
+            kwargs["stream"] = True
+
+        try:
+            response = getattr(self.session, request.method)(
+                request.url, **kwargs
+            )
+        except requests.exceptions.RequestException as e:
+            raise TransportError(str(e), not _is_connect_error(e))
+
+        return _StreamedResponse(response) if request.stream else response
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class _StreamedResponse:
+    # a streamed requests.Response raising TransportError while read
+
+    __slots__ = ("_response",)
+
+    def __init__(self, response: requests.Response) -> None:
+        self._response = response
+
+    @property
+    def url(self) -> str:
+        return self._response.url
+
+    @property
+    def status_code(self) -> int:
+        return self._response.status_code
+
+    @property
+    def headers(self) -> Mapping[str, str]:
+        return self._response.headers
+
+    @property
+    def text(self) -> str:
+        return self._response.text
+
+    @property
+    def content(self) -> bytes:
+        return self._response.content
+
+    def json(self) -> t.Any:
+        return self._response.json()
+
+    def iter_content(self, chunk_size: int) -> Iterator[bytes]:
+        try:
+            yield from self._response.iter_content(chunk_size)
+        except requests.exceptions.RequestException as e:
+            raise TransportError(str(e))
+
+
+def _is_connect_error(e: requests.exceptions.RequestException) -> bool:
+    # whether the connection failed, so the request wasn't sent
+    if isinstance(e, requests.exceptions.ConnectTimeout):
+        return True
+
+    reason = getattr(e.args[0], "reason", None) if e.args else None
+
+    return isinstance(reason, urllib3.exceptions.NewConnectionError)
+
+
+class Urllib3Transport:
+    """A transport sending requests with urllib3 directly, skipping the
+    per-request work of requests: merging session settings, preparing
+    requests and running hooks.
+
+    It verifies TLS certificates with the system's CA certificates rather
+    than certifi's, and ignores proxy environment variables.
+
+    Attributes:
+        stats: The counters of the connection pool.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 32,
+        pool_block: bool = False,
+        **pool_kwargs: t.Any,
+    ) -> None:
+        """Initialize the transport.
+
+        Args:
+            pool_connections, pool_maxsize, pool_block (optional):
+                As for `sift.pool.PooledHTTPAdapter`.
+
+            **pool_kwargs (optional):
+                Other arguments of the `urllib3.PoolManager`, such as
+                `ssl_context`.
+        """
+        if pool_connections < 1 or pool_maxsize < 1:
+            raise ValueError(
+                "pool_connections and pool_maxsize must be positive integers"
+            )
+
+        self.stats = PoolStats()
+        self.pool_manager = _CountingPoolManager(
+            self.stats,
+            num_pools=pool_connections,
+            maxsize=pool_maxsize,
+            block=pool_block,
+            **pool_kwargs,
+        )
+        self._auth_headers = _AuthHeaders()
+
+    def send(self, request: HttpRequest) -> TransportResponse:
+        headers = {
+            **(request.headers or {}),
+            **self._auth_headers.get(request),
+        }
+        timeout = request.timeout
+
+        self.stats._count_request()
+
+        try:
+            response = self.pool_manager.request(
+                request.method.upper(),
+                request.full_url(),
+                body=request.data,
+                headers=headers,
+                timeout=(
+                    urllib3.Timeout(connect=timeout[0], read=timeout[1])
+                    if isinstance(timeout, tuple)
+                    else urllib3.Timeout(connect=timeout, read=timeout)
+                ),
+                retries=False,
+                redirect=False,
+                preload_content=not request.stream,
+            )
+        except urllib3.exceptions.ConnectTimeoutError as e:
+            # including NewConnectionError
+            raise TransportError(str(e), request_sent=False)
+        except (urllib3.exceptions.HTTPError, OSError) as e:
+            raise TransportError(str(e))
+
+        return Urllib3Response(request.url, response)
+
+    def close(self) -> None:
+        self.pool_manager.clear()
+
+
+class _AuthHeaders:
+    # the headers of the client's auth, which are the same for every request
+    # as long as its credentials don't change
+
+    def __init__(self) -> None:
+        self._auth: tuple[AuthBase, Mapping[str, str]] | None = None
+
+    def get(self, request: HttpRequest) -> Mapping[str, str]:
+        auth = request.auth
+
+        if auth is None:
+            return {}
+
+        if self._auth is None or self._auth[0] is not auth:
+            self._auth = (auth, dict(request.auth_headers()))
+
+        return self._auth[1]
+
+
+class Urllib3Response:
+    """The response of a `Urllib3Transport` request."""
+
+    __slots__ = ("url", "_response")
+
+    def __init__(self, url: str, response: urllib3.BaseHTTPResponse) -> None:
+        self.url = url
+        self._response = response
+
+    @property
+    def status_code(self) -> int:
+        return self._response.status
+
+    @property
+    def headers(self) -> Mapping[str, str]:
+        return self._response.headers
+
+    @property
+    def content(self) -> bytes:
+        return self._response.data
+
+    @property
+    def text(self) -> str:
+        return self.content.decode()
+
+    def json(self) -> t.Any:
+        return json.loads(self.content)
+
+    def iter_content(self, chunk_size: int) -> Iterator[bytes]:
+        try:
+            yield from self._response.stream(chunk_size)
+        except (urllib3.exceptions.HTTPError, OSError) as e:
+            raise TransportError(str(e))
+        finally:
+            self._response.release_conn()
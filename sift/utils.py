@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import importlib.util
 import json
 import typing as t
 import urllib.parse
@@ -18,3 +19,167 @@ class DecimalEncoder(json.JSONEncoder):
             return (str(o),)
 
         return super().default(o)
+
+
+def _encode_decimal(o: object) -> list[str]:
+    # the `default` hook of the accelerated encoders, matching DecimalEncoder
+    if isinstance(o, Decimal):
+        return [str(o)]
+
+    raise TypeError(
+        f"Object of type {type(o).__name__} is not JSON serializable"
+    )
+
+
+def _replace_decimals(o: t.Any) -> t.Any:
+    # for encoders serializing Decimal as a number without calling a hook
+    if isinstance(o, Decimal):
+        return [str(o)]
+
+    if isinstance(o, dict):
+        return {k: _replace_decimals(v) for k, v in o.items()}
+
+    if isinstance(o, (list, tuple)):
+        return [_replace_decimals(v) for v in o]
+
+    return o
+
+
+class JSONCodec(t.Protocol):
+    """Serializes request bodies and parses response bodies.
+
+    Every codec produces the same JSON documents as the standard library
+    with `DecimalEncoder`, up to whitespace and escaping: `Decimal` values
+    are sent as a list holding their string representation.
+    """
+
+    name: str
+
+    def dumps(self, obj: t.Any) -> str | bytes:
+        """Serializes `obj` to JSON."""
+
+    def loads(self, data: str | bytes) -> t.Any:
+        """Parses a JSON document."""
+
+
+class StdlibJSONCodec:
+    """The `json` module of the standard library."""
+
+    name = "json"
+
+    def dumps(self, obj: t.Any) -> str:
+        return json.dumps(obj, cls=DecimalEncoder)
+
+    def loads(self, data: str | bytes) -> t.Any:
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    """`orjson`, the fastest encoder and decoder. Produces UTF-8 bytes."""
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._orjson = orjson
+
+    def dumps(self, obj: t.Any) -> bytes:
+        data: bytes = self._orjson.dumps(
+            obj,
+            default=_encode_decimal,
+            option=self._orjson.OPT_NON_STR_KEYS,
+        )
+        return data
+
+    def loads(self, data: str | bytes) -> t.Any:
+        return self._orjson.loads(data)
+
+
+class UjsonCodec:
+    """`ujson`. It serializes `Decimal` as a number, so payloads are
+    converted first, which makes encoding slower than decoding."""
+
+    name = "ujson"
+
+    def __init__(self) -> None:
+        import ujson
+
+        self._ujson = ujson
+
+    def dumps(self, obj: t.Any) -> str:
+        data: str = self._ujson.dumps(_replace_decimals(obj))
+        return data
+
+    def loads(self, data: str | bytes) -> t.Any:
+        return self._ujson.loads(data)
+
+
+class SimdjsonCodec:
+    """`pysimdjson` for decoding; it has no encoder, so encoding uses the
+    standard library."""
+
+    name = "simdjson"
+
+    def __init__(self) -> None:
+        import simdjson
+
+        self._simdjson = simdjson
+
+    def dumps(self, obj: t.Any) -> str:
+        return json.dumps(obj, cls=DecimalEncoder)
+
+    def loads(self, data: str | bytes) -> t.Any:
+        return self._simdjson.loads(data)
+
+
+# name -> (codec class, the module it requires, its distribution)
+_JSON_CODECS: dict[str, tuple[type[JSONCodec], str | None, str | None]] = {
+    "json": (StdlibJSONCodec, None, None),
+    "orjson": (OrjsonCodec, "orjson", "orjson"),
+    "ujson": (UjsonCodec, "ujson", "ujson"),
+    "simdjson": (SimdjsonCodec, "simdjson", "pysimdjson"),
+}
+
+# the candidates of "auto", fastest first; ujson is left out as its Decimal
+# conversion makes encoding slower than with the standard library, see
+# benchmarks/json_codec.py
+_AUTO_JSON_CODECS = ("orjson", "simdjson", "json")
+
+
+def get_json_codec(name: str = "json") -> JSONCodec:
+    """
+    Returns a JSON codec by name.
+
+    Args:
+        name (optional):
+            "json" for the standard library, "orjson", "ujson" or "simdjson"
+            for an accelerated backend, or "auto" for orjson, or else
+            simdjson, if installed. Defaults to "json".
+
+    Raises:
+        ValueError: If the name is unknown
+        ImportError: If the backend is not installed
+    """
+    if name == "auto":
+        name = next(
+            candidate
+            for candidate in _AUTO_JSON_CODECS
+            if candidate == "json" or importlib.util.find_spec(candidate)
+        )
+
+    if name not in _JSON_CODECS:
+        raise ValueError(
+            f"unknown JSON codec {name!r}, expected one of "
+            f"{', '.join(['auto', *_JSON_CODECS])}"
+        )
+
+    codec_cls, _, distribution = _JSON_CODECS[name]
+
+    try:
+        return codec_cls()
+    except ImportError as e:
+        raise ImportError(
+            f"The {name!r} JSON codec requires the {distribution} package. "
+            f"Install it with `pip install {distribution}`."
+        ) from e
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import base64
+import json
+import typing as t
+from unittest import IsolatedAsyncioTestCase
+
+import httpx
+
+import sift
+from sift.async_client import AsyncClient
+from tests.test_client import (
+    USER_SCORE_RESPONSE_JSON,
+    valid_label_properties,
+    valid_transaction_properties,
+)
+
+
+class TestAsyncClient(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.test_key = "a_fake_test_api_key"
+        self.account_id = "ACCT"
+        self.requests: list[httpx.Request] = []
+        self.response = httpx.Response(
+            200, json={"status": 0, "error_message": "OK"}
+        )
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.requests.append(request)
+            return self.response
+
+        self.sift_client = AsyncClient(
+            api_key=self.test_key,
+            account_id=self.account_id,
+            session=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+
+    async def asyncTearDown(self) -> None:
+        await self.sift_client.aclose()
+
+    def basic_auth(self) -> str:
+        token = base64.b64encode(f"{self.test_key}:".encode()).decode()
+        return f"Basic {token}"
+
+    def test_lazy_import_from_package(self) -> None:
+        assert sift.AsyncClient is AsyncClient
+
+    def test_track_requires_valid_event(self) -> None:
+        self.assertRaises(TypeError, self.sift_client.track, None, {})
+        self.assertRaises(ValueError, self.sift_client.track, "", {})
+
+    async def test_event_ok(self) -> None:
+        response = await self.sift_client.track(
+            "$transaction",
+            valid_transaction_properties(),
+            return_score=True,
+        )
+
+        self.assertIsInstance(response, sift.client.Response)
+        assert response.is_ok()
+        assert response.api_status == 0
+        assert response.api_error_message == "OK"
+
+        (request,) = self.requests
+        assert request.method == "POST"
+        assert request.url.path == "/v205/events"
+        assert request.url.params["return_score"] == "true"
+        assert request.headers["Content-type"] == "application/json"
+        assert request.headers["User-Agent"].startswith("SiftScience/v205")
+
+        body = json.loads(request.content)
+        assert body["$type"] == "$transaction"
+        assert body["$api_key"] == self.test_key
+        assert body["$amount"] == ["1253200.0"]
+
+    async def test_get_user_score_ok(self) -> None:
+        self.response = httpx.Response(200, text=USER_SCORE_RESPONSE_JSON)
+
+        response = await self.sift_client.get_user_score(
+            "12345",
+            abuse_types=["payment_abuse", "content_abuse"],
+        )
+
+        assert response.is_ok()
+        assert isinstance(response.body, dict)
+        assert response.body["entity_id"] == "12345"
+        assert "/v205/users/12345/score?" in response.url
+
+        (request,) = self.requests
+        assert request.method == "GET"
+        assert request.headers["Authorization"] == self.basic_auth()
+        assert (
+            request.url.params["abuse_types"] == "payment_abuse,content_abuse"
+        )
+
+    async def test_label_user_ok(self) -> None:
+        response = await self.sift_client.label(
+            "54321", valid_label_properties()
+        )
+
+        assert response.is_ok()
+
+        (request,) = self.requests
+        assert request.url.path == "/v205/users/54321/labels"
+        assert json.loads(request.content)["$type"] == "$label"
+
+    async def test_unlabel_user_ok(self) -> None:
+        self.response = httpx.Response(204)
+
+        response = await self.sift_client.unlabel(
+            "54321", abuse_type="account_abuse"
+        )
+
+        assert response.is_ok()
+
+        (request,) = self.requests
+        assert request.method == "DELETE"
+        assert request.url.params["abuse_type"] == "account_abuse"
+
+    async def test_apply_decision_to_order_ok(self) -> None:
+        properties: dict[str, t.Any] = {
+            "decision_id": "order_looks_bad_payment_abuse",
+            "source": "AUTOMATED_RULE",
+            "time": 1481569575,
+        }
+
+        response = await self.sift_client.apply_order_decision(
+            "54321", "43210", properties
+        )
+
+        assert response.is_ok()
+
+        (request,) = self.requests
+        assert request.method == "POST"
+        assert request.url.path == (
+            "/v3/accounts/ACCT/users/54321/orders/43210/decisions"
+        )
+        assert request.headers["Authorization"] == self.basic_auth()
+        assert json.loads(request.content) == properties
+
+    async def test_update_psp_merchant_profile_ok(self) -> None:
+        response = await self.sift_client.update_psp_merchant_profile(
+            "api-key-1", {"$id": "api-key-1"}
+        )
+
+        assert response.is_ok()
+
+        (request,) = self.requests
+        assert request.method == "PUT"
+        assert request.url.path == (
+            "/v3/accounts/ACCT/psp_management/merchants/api-key-1"
+        )
+
+    async def test_non_2xx_response_raises(self) -> None:
+        self.response = httpx.Response(
+            400, json={"status": 55, "error_message": "Missing field"}
+        )
+
+        with self.assertRaises(sift.client.ApiException) as ctx:
+            await self.sift_client.score("12345")
+
+        assert ctx.exception.http_status_code == 400
+        assert ctx.exception.api_status == 55
+        assert ctx.exception.api_error_message == "Missing field"
+
+    async def test_exception_during_request(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("Failed", request=request)
+
+        client = AsyncClient(
+            api_key=self.test_key,
+            session=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+
+        async with client:
+            with self.assertRaises(sift.client.ApiException) as ctx:
+                await client.track("$login", {"$user_id": "54321"})
+
+        assert ctx.exception.url == "https://api.sift.com/v205/events"
+
+    async def test_track_many(self) -> None:
+        events: list[sift.client.TrackItem] = [
+            ("$login", {"$user_id": str(i)}, {"return_score": i % 2 == 0})
+            for i in range(10)
+        ]
+
+        results = [
+            result
+            async for result in self.sift_client.track_many(
+                events, max_concurrency=3
+            )
+        ]
+
+        assert [index for index, _ in results] == list(range(10))
+        assert all(
+            isinstance(result, sift.client.Response) for _, result in results
+        )
+        assert len(self.requests) == 10
+
+        unordered = [
+            index
+            async for index, _ in self.sift_client.track_many(
+                events, max_concurrency=3, ordered=False
+            )
+        ]
+
+        assert sorted(unordered) == list(range(10))
+
+    def test_timeout_conversion(self) -> None:
+        timeout = self.sift_client._timeout((1, 5))
+
+        assert timeout.connect == 1
+        assert timeout.read == 5
+        assert self.sift_client._timeout(3).read == 3
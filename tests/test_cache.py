@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+from unittest import IsolatedAsyncioTestCase, TestCase, mock
+
+import httpx
+
+import sift
+from sift.async_client import AsyncClient
+from sift.cache import ScoreCache
+from sift.client import Response
+from sift.exceptions import ApiException
+from tests.test_circuit_breaker import Clock
+from tests.test_retry import http_response
+
+API_KEY = "a_fake_test_api_key"
+
+
+def response() -> Response:
+    return Response(http_response())
+
+
+class TestScoreCache(TestCase):
+    def setUp(self) -> None:
+        self.clock = Clock()
+        patcher = mock.patch("time.monotonic", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_hit_and_expiry(self) -> None:
+        cache = ScoreCache(ttl=10)
+        key = ("billy_jones_301", None, False, API_KEY)
+        cached = response()
+
+        assert cache.get(key) == (None, 0)
+        cache.put(key, cached, 0)
+        assert cache.get(key)[0] is cached
+
+        self.clock.now += 10
+        assert cache.get(key)[0] is None
+        assert len(cache) == 0
+        assert (cache.hits, cache.misses) == (1, 2)
+        assert cache.hit_ratio == 1 / 3
+
+    def test_lru_eviction(self) -> None:
+        cache = ScoreCache(max_size=2)
+        keys = [(user_id, None, False, API_KEY) for user_id in "abc"]
+
+        for key in keys[:2]:
+            cache.put(key, response(), cache.get(key)[1])
+
+        # "a" becomes the most recently used
+        assert cache.get(keys[0])[0] is not None
+        cache.put(keys[2], response(), cache.get(keys[2])[1])
+
+        assert len(cache) == 2
+        assert cache.evictions == 1
+        assert cache.get(keys[1])[0] is None
+        assert cache.get(keys[0])[0] is not None
+
+    def test_invalidate(self) -> None:
+        cache = ScoreCache()
+        keys = [
+            ("billy_jones_301", None, False, API_KEY),
+            ("billy_jones_301", ("payment_abuse",), True, API_KEY),
+            ("other_user", None, False, API_KEY),
+        ]
+
+        for key in keys:
+            cache.put(key, response(), cache.get(key)[1])
+
+        cache.invalidate("billy_jones_301")
+
+        assert len(cache) == 1
+        assert cache.get(keys[2])[0] is not None
+
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_invalidation_during_lookup(self) -> None:
+        cache = ScoreCache()
+        key = ("billy_jones_301", None, False, API_KEY)
+
+        # the score was fetched before the user was rescored
+        _, token = cache.get(key)
+        cache.invalidate("billy_jones_301")
+        cache.put(key, response(), token)
+
+        assert len(cache) == 0
+        assert not cache._pending
+
+    def test_failed_lookup(self) -> None:
+        cache = ScoreCache()
+        key = ("billy_jones_301", None, False, API_KEY)
+
+        cache.put(key, None, cache.get(key)[1])
+
+        assert len(cache) == 0
+        assert not cache._pending
+
+    def test_invalid_arguments(self) -> None:
+        self.assertRaises(ValueError, ScoreCache, max_size=0)
+
+
+class TestClientScoreCache(TestCase):
+    def setUp(self) -> None:
+        self.sift_client = sift.Client(
+            api_key="a_fake_test_api_key",
+            account_id="ACCT",
+            score_cache=ScoreCache(),
+        )
+
+    def test_get_user_score(self) -> None:
+        with mock.patch.object(self.sift_client.session, "get") as mock_get:
+            mock_get.return_value = http_response()
+
+            first = self.sift_client.get_user_score("billy_jones_301")
+            assert self.sift_client.get_user_score("billy_jones_301") is first
+
+            # other arguments are cached separately
+            self.sift_client.get_user_score(
+                "billy_jones_301", abuse_types=["payment_abuse"]
+            )
+            self.sift_client.get_user_score(
+                "billy_jones_301", include_score_percentiles=True
+            )
+
+        assert mock_get.call_count == 3
+
+    def test_clients_of_other_accounts(self) -> None:
+        cache = self.sift_client.score_cache
+        assert cache is not None
+        other_client = sift.Client(
+            api_key="another_fake_test_api_key",
+            account_id="OTHER_ACCT",
+            score_cache=cache,
+        )
+
+        with mock.patch.object(
+            self.sift_client.session, "get"
+        ) as mock_get, mock.patch.object(
+            other_client.session, "get"
+        ) as other_mock_get:
+            mock_get.return_value = http_response()
+            other_mock_get.return_value = http_response()
+
+            first = self.sift_client.get_user_score("billy_jones_301")
+            other = other_client.get_user_score("billy_jones_301")
+
+            assert other is not first
+            assert self.sift_client.get_user_score("billy_jones_301") is first
+            assert other_client.get_user_score("billy_jones_301") is other
+
+        assert mock_get.call_count == 1
+        assert other_mock_get.call_count == 1
+        assert len(cache) == 2
+
+    def test_failures_are_not_cached(self) -> None:
+        with mock.patch.object(self.sift_client.session, "get") as mock_get:
+            mock_get.return_value = http_response(500, api_status=-1)
+
+            for _ in range(2):
+                self.assertRaises(
+                    ApiException,
+                    self.sift_client.get_user_score,
+                    "billy_jones_301",
+                )
+
+        assert mock_get.call_count == 2
+
+    def test_invalidating_calls(self) -> None:
+        calls = [
+            lambda: self.sift_client.track(
+                "$login", {"$user_id": "billy_jones_301"}, return_score=True
+            ),
+            lambda: self.sift_client.rescore_user("billy_jones_301"),
+            lambda: self.sift_client.label(
+                "billy_jones_301", {"$is_bad": True}
+            ),
+            lambda: self.sift_client.apply_user_decision(
+                "billy_jones_301",
+                {
+                    "decision_id": "user_looks_ok_legit",
+                    "source": "MANUAL_REVIEW",
+                    "analyst": "analyst@example.com",
+                },
+            ),
+        ]
+
+        with mock.patch.object(
+            self.sift_client.session, "get"
+        ) as mock_get, mock.patch.object(
+            self.sift_client.session, "post"
+        ) as mock_post:
+            mock_get.return_value = http_response()
+            mock_post.return_value = http_response()
+
+            for call in calls:
+                self.sift_client.get_user_score("billy_jones_301")
+                call()
+                self.sift_client.get_user_score("billy_jones_301")
+
+            # tracking without requesting a score keeps the cache
+            self.sift_client.track("$login", {"$user_id": "billy_jones_301"})
+            self.sift_client.get_user_score("billy_jones_301")
+
+        assert mock_get.call_count == len(calls) + 1
+
+
+class TestAsyncClientScoreCache(IsolatedAsyncioTestCase):
+    async def test_get_user_score(self) -> None:
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json={"status": 0})
+
+        async with AsyncClient(
+            api_key="a_fake_test_api_key",
+            session=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            score_cache=ScoreCache(),
+        ) as sift_client:
+            first = await sift_client.get_user_score("billy_jones_301")
+            assert await sift_client.get_user_score("billy_jones_301") is first
+
+            await sift_client.rescore_user("billy_jones_301")
+            await sift_client.get_user_score("billy_jones_301")
+
+        assert [request.method for request in requests] == [
+            "GET",
+            "POST",
+            "GET",
+        ]
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+from unittest import IsolatedAsyncioTestCase, TestCase, mock
+
+import httpx
+import requests
+
+import sift
+from sift.async_client import AsyncClient
+from sift.circuit_breaker import CircuitBreaker, is_failure
+from sift.exceptions import ApiException, CircuitOpenException
+from tests.test_retry import api_exception, http_response
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestCircuitBreaker(TestCase):
+    def setUp(self) -> None:
+        self.clock = Clock()
+        patcher = mock.patch("time.monotonic", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.breaker = CircuitBreaker(
+            failure_rate_threshold=0.5,
+            minimum_calls=4,
+            window=10,
+            reset_timeout=30,
+            half_open_probes=2,
+        )
+
+    def record(self, *failed: bool, duration: float = 0.1) -> None:
+        for f in failed:
+            assert self.breaker.allow("score") is None
+            self.breaker.record("score", f, duration)
+
+    def test_is_failure(self) -> None:
+        assert not is_failure(None)
+        assert not is_failure(api_exception(400, api_status=51))
+        assert not is_failure(api_exception(429))
+        assert is_failure(api_exception())
+        assert is_failure(api_exception(502))
+        assert is_failure(api_exception(200, api_status=-1))
+
+    def test_opens_on_failure_rate(self) -> None:
+        self.record(True, True, True)
+        assert self.breaker.state("score") == "closed"
+
+        self.record(False)
+        assert self.breaker.state("score") == "open"
+        assert self.breaker.allow("score") == 30
+        assert self.breaker.state("events") == "closed"
+
+    def test_old_calls_leave_the_window(self) -> None:
+        self.record(True, True)
+        self.clock.now += 11
+        self.record(True, False, False)
+
+        assert self.breaker.state("score") == "closed"
+
+    def test_opens_on_slow_calls(self) -> None:
+        breaker = CircuitBreaker(
+            slow_call_duration=1, slow_call_rate_threshold=0.5, minimum_calls=2
+        )
+
+        breaker.record("score", False, 0.1)
+        breaker.record("score", False, 1.5)
+
+        assert breaker.state("score") == "open"
+
+    def test_half_open_probes_close_the_circuit(self) -> None:
+        self.record(True, True, True, True)
+        self.clock.now += 30
+
+        assert self.breaker.allow("score") is None
+        assert self.breaker.allow("score") is None
+        assert self.breaker.state("score") == "half_open"
+        # only two probes are let through at a time
+        assert self.breaker.allow("score") == 30
+
+        self.breaker.record("score", False, 0.1)
+        assert self.breaker.state("score") == "half_open"
+
+        self.breaker.record("score", False, 0.1)
+        assert self.breaker.state("score") == "closed"
+
+    def test_failed_probe_reopens_the_circuit(self) -> None:
+        self.record(True, True, True, True)
+        self.clock.now += 30
+
+        assert self.breaker.allow("score") is None
+        self.breaker.record("score", True, 0.1)
+
+        assert self.breaker.state("score") == "open"
+        assert self.breaker.allow("score") == 30
+
+    def test_lost_probes_are_replaced(self) -> None:
+        self.record(True, True, True, True)
+        self.clock.now += 30
+
+        assert self.breaker.allow("score") is None
+        assert self.breaker.allow("score") is None
+        self.clock.now += 30
+
+        assert self.breaker.allow("score") is None
+
+    def test_calls_started_in_a_previous_state_are_ignored(self) -> None:
+        # started while the circuit was closed
+        _, closed = self.breaker._allow("score")
+        self.record(True, True, True, True)
+        self.clock.now += 30
+
+        first_probe = self.breaker._allow("score")
+        second_probe = self.breaker._allow("score")
+        assert first_probe[0] is second_probe[0] is None
+
+        # neither closes nor reopens the half-open circuit
+        self.breaker._record("score", False, 0.1, closed)
+        self.breaker._record("score", False, 0.1, closed)
+        self.breaker._record("score", True, 0.1, closed)
+        assert self.breaker.state("score") == "half_open"
+
+        self.breaker._record("score", False, 0.1, first_probe[1])
+        self.breaker._record("score", False, 0.1, second_probe[1])
+        assert self.breaker.state("score") == "closed"
+
+    def test_reset(self) -> None:
+        self.record(True, True, True, True)
+        self.breaker.reset()
+
+        assert self.breaker.state("score") == "closed"
+
+
+class TestClientCircuitBreaker(TestCase):
+    def setUp(self) -> None:
+        self.breaker = CircuitBreaker(minimum_calls=2, reset_timeout=30)
+        self.sift_client = sift.Client(
+            api_key="a_fake_test_api_key",
+            account_id="ACCT",
+            circuit_breaker=self.breaker,
+        )
+
+    def test_open_circuit_short_circuits_calls(self) -> None:
+        with mock.patch.object(self.sift_client.session, "get") as mock_get:
+            mock_get.side_effect = requests.exceptions.ReadTimeout("Timeout")
+
+            for _ in range(2):
+                with self.assertRaises(ApiException) as cm:
+                    self.sift_client.get_user_score("billy_jones_301")
+
+                self.assertNotIsInstance(cm.exception, CircuitOpenException)
+
+            with self.assertRaises(CircuitOpenException) as open_cm:
+                self.sift_client.score("billy_jones_301")
+
+            assert mock_get.call_count == 2
+            assert open_cm.exception.family == "score"
+            assert 0 < open_cm.exception.retry_after <= 30
+
+            # other endpoint families are not affected
+            mock_get.side_effect = None
+            mock_get.return_value = http_response()
+            assert self.sift_client.get_user_decisions("billy_jones_301")
+
+    def test_client_errors_dont_open_the_circuit(self) -> None:
+        with mock.patch.object(self.sift_client.session, "post") as mock_post:
+            mock_post.return_value = http_response(400, api_status=51)
+
+            for _ in range(3):
+                with self.assertRaises(ApiException):
+                    self.sift_client.label("billy_jones_301", {"$is_bad": 1})
+
+        assert self.breaker.state("labels") == "closed"
+
+
+class TestAsyncClientCircuitBreaker(IsolatedAsyncioTestCase):
+    async def test_open_circuit_short_circuits_calls(self) -> None:
+        calls: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            return httpx.Response(503, json={"status": -1})
+
+        async with AsyncClient(
+            api_key="a_fake_test_api_key",
+            session=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            circuit_breaker=CircuitBreaker(minimum_calls=1),
+        ) as sift_client:
+            with self.assertRaises(ApiException):
+                await sift_client.rescore_user("billy_jones_301")
+
+            with self.assertRaises(CircuitOpenException):
+                await sift_client.rescore_user("billy_jones_301")
+
+        assert len(calls) == 1
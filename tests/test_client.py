@@ -7,6 +7,7 @@ import warnings
 from decimal import Decimal
 from unittest import TestCase, mock
 
+import requests
 from requests.auth import HTTPBasicAuth
 from requests.exceptions import RequestException
 
@@ -1839,6 +1840,212 @@ class TestSiftPythonClient(TestCase):
             )
             self.assertIsInstance(response, sift.client.Response)
 
+    def test_track_many_ordered(self) -> None:
+        mock_response = mock.Mock()
+        mock_response.content = '{"status": 0, "error_message": "OK"}'
+        mock_response.json.return_value = json.loads(mock_response.content)
+        mock_response.status_code = 200
+        mock_response.headers = response_with_data_header()
+
+        events: list[sift.client.TrackItem] = [
+            ("$transaction", valid_transaction_properties()),
+            ("$login", {"$user_id": "54321"}, {"return_score": True}),
+            ("$logout", {"$user_id": "54321"}, None),
+        ] * 5
+
+        with mock.patch.object(self.sift_client.session, "post") as mock_post:
+            mock_post.return_value = mock_response
+
+            results = list(
+                self.sift_client.track_many(events, max_concurrency=4)
+            )
+
+            assert [index for index, _ in results] == list(range(15))
+            assert all(
+                isinstance(result, sift.client.Response)
+                for _, result in results
+            )
+            assert mock_post.call_count == 15
+
+            params = [
+                call.kwargs["params"] for call in mock_post.call_args_list
+            ]
+            assert params.count({"return_score": "true"}) == 5
+
+    def test_track_many_unordered_collects_errors(self) -> None:
+        mock_response = mock.Mock()
+        mock_response.content = '{"status": 0, "error_message": "OK"}'
+        mock_response.json.return_value = json.loads(mock_response.content)
+        mock_response.status_code = 200
+        mock_response.headers = response_with_data_header()
+
+        def post(url: str, data: str, **kwargs: t.Any) -> mock.Mock:
+            if json.loads(data)["$user_id"] == "bad":
+                raise RequestException("Failed")
+
+            return mock_response
+
+        events: list[sift.client.TrackItem] = [
+            ("$login", {"$user_id": "bad" if i % 3 == 0 else "good"})
+            for i in range(10)
+        ]
+
+        with mock.patch.object(self.sift_client.session, "post") as mock_post:
+            mock_post.side_effect = post
+
+            results = dict(
+                self.sift_client.track_many(
+                    events, max_concurrency=3, ordered=False
+                )
+            )
+
+        assert sorted(results) == list(range(10))
+
+        for index, result in results.items():
+            if index % 3 == 0:
+                self.assertIsInstance(result, sift.client.ApiException)
+            else:
+                self.assertIsInstance(result, sift.client.Response)
+
+    def test_track_many_validates_arguments(self) -> None:
+        events: list[sift.client.TrackItem] = [("$login", {})]
+
+        with self.assertRaises(ValueError):
+            list(self.sift_client.track_many(events, max_concurrency=0))
+
+        with self.assertRaises(ValueError):
+            list(self.sift_client.track_many(events))
+
+
+class TestResponse(TestCase):
+    def http_response(self, status_code: int, content: str) -> mock.Mock:
+        mock_response = mock.Mock()
+        mock_response.url = "https://api.sift.com/v205/events"
+        mock_response.status_code = status_code
+        mock_response.content = content.encode()
+        return mock_response
+
+    def test_body_is_parsed_lazily(self) -> None:
+        content = json.dumps(
+            {"status": 0, "error_message": "OK", "request": '{"a": 1}'}
+        )
+        http_response = self.http_response(200, content)
+        codec = mock.Mock(wraps=sift.utils.StdlibJSONCodec())
+
+        response = sift.client.Response(http_response, codec)
+
+        assert response.is_ok()
+        codec.loads.assert_not_called()
+
+        assert response.api_status == 0
+        assert response.api_error_message == "OK"
+        codec.loads.assert_called_once_with(http_response.content)
+
+        assert response.request == {"a": 1}
+        assert response.body is not None
+        assert codec.loads.call_count == 2
+
+    def test_non_2xx_raises_right_away(self) -> None:
+        http_response = self.http_response(
+            400, '{"status": 51, "error_message": "Invalid API key"}'
+        )
+
+        with self.assertRaises(sift.client.ApiException) as cm:
+            sift.client.Response(http_response, sift.utils.StdlibJSONCodec())
+
+        assert cm.exception.http_status_code == 400
+        assert cm.exception.api_status == 51
+        assert cm.exception.api_error_message == "Invalid API key"
+
+    def test_invalid_json_raises_on_access(self) -> None:
+        response = sift.client.Response(
+            self.http_response(200, "not json"),
+            sift.utils.StdlibJSONCodec(),
+        )
+
+        # on every access
+        for _ in range(2):
+            with self.assertRaises(sift.client.ApiException):
+                response.api_status
+
+        assert response.http_status_code == 200
+
+        response = sift.client.Response(
+            self.http_response(200, '{"status": 0, "request": "not json"}'),
+            sift.utils.StdlibJSONCodec(),
+        )
+
+        for _ in range(2):
+            with self.assertRaises(sift.client.ApiException):
+                response.request
+
+        assert response.api_status == 0
+
+    def test_no_body(self) -> None:
+        response = sift.client.Response(
+            self.http_response(204, ""), sift.utils.StdlibJSONCodec()
+        )
+
+        assert response.body is None
+        assert response.api_status is None
+        assert response.request is None
+        assert response.is_ok()
+
+    def test_slots(self) -> None:
+        response = sift.client.Response(
+            self.http_response(204, ""), sift.utils.StdlibJSONCodec()
+        )
+
+        assert not hasattr(response, "__dict__")
+
+
+class TestPrecomputedHeaders(TestCase):
+    def setUp(self) -> None:
+        self.sift_client = sift.Client(api_key="a_fake_test_api_key")
+
+    def test_headers_are_reused(self) -> None:
+        with mock.patch.object(self.sift_client.session, "post") as mock_post:
+            mock_post.return_value = mock.Mock(
+                status_code=204, url="https://api.sift.com"
+            )
+
+            for _ in range(2):
+                self.sift_client.track("$login", {"$user_id": "a"})
+
+        first, second = mock_post.call_args_list
+        assert first.kwargs["headers"] is second.kwargs["headers"]
+        assert first.kwargs["headers"]["User-Agent"].startswith(
+            "SiftScience/v205 "
+        )
+
+    def test_version_change(self) -> None:
+        self.sift_client.version = "204"
+
+        assert self.sift_client._post_headers()["User-Agent"].startswith(
+            "SiftScience/v204 "
+        )
+        assert self.sift_client._default_headers("205")[
+            "User-Agent"
+        ].startswith("SiftScience/v205 ")
+
+    def test_api_key_change(self) -> None:
+        auth = self.sift_client._auth
+        self.sift_client.api_key = "another_api_key"
+
+        assert self.sift_client._auth is not auth
+        assert self.sift_client._auth == HTTPBasicAuth("another_api_key", "")
+
+        request = self.sift_client._auth(
+            requests.Request("GET", "https://api.sift.com").prepare()
+        )
+        expected = HTTPBasicAuth("another_api_key", "")(
+            requests.Request("GET", "https://api.sift.com").prepare()
+        )
+        assert (
+            request.headers["Authorization"]
+            == expected.headers["Authorization"]
+        )
+
 
 def main() -> None:
     main()
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import gzip
+import json
+import zlib
+from unittest import IsolatedAsyncioTestCase, TestCase, mock
+
+import httpx
+
+import sift
+from sift.async_client import AsyncClient
+from sift.compression import Compression
+from tests.test_retry import http_response
+
+ORDER = {
+    "$user_id": "billy_jones_301",
+    "$items": [
+        {"$item_id": str(i), "$product_title": "The Slanket Blanket"}
+        for i in range(100)
+    ],
+}
+
+
+class TestCompression(TestCase):
+    def test_gzip(self) -> None:
+        data = json.dumps(ORDER)
+        compressed = Compression().compress(data)
+
+        assert compressed is not None
+        assert len(compressed) < len(data)
+        assert gzip.decompress(compressed).decode() == data
+
+    def test_deflate(self) -> None:
+        data = json.dumps(ORDER).encode()
+        compressed = Compression("deflate", level=1).compress(data)
+
+        assert compressed is not None
+        assert zlib.decompress(compressed) == data
+
+    def test_threshold(self) -> None:
+        compression = Compression(threshold=100)
+
+        assert compression.compress("x" * 99) is None
+        assert compression.compress("x" * 100) is not None
+        # the threshold is in encoded bytes, not characters
+        assert compression.compress("é" * 50) is not None
+
+    def test_incompressible_data(self) -> None:
+        assert Compression(threshold=0).compress('{"a": 1}') is None
+
+    def test_invalid_arguments(self) -> None:
+        self.assertRaises(ValueError, Compression, encoding="br")
+        self.assertRaises(ValueError, Compression, threshold=-1)
+        self.assertRaises(ValueError, Compression, level=0)
+
+
+class TestClientCompression(TestCase):
+    def setUp(self) -> None:
+        self.sift_client = sift.Client(
+            api_key="a_fake_test_api_key", compression=Compression()
+        )
+
+    def test_large_bodies_are_compressed(self) -> None:
+        with mock.patch.object(self.sift_client.session, "post") as mock_post:
+            mock_post.return_value = http_response()
+            self.sift_client.track("$create_order", ORDER)
+
+        kwargs = mock_post.call_args.kwargs
+        assert kwargs["headers"]["Content-Encoding"] == "gzip"
+        assert kwargs["headers"]["Accept-Encoding"] == "gzip, deflate"
+        assert kwargs["headers"]["Content-type"] == "application/json"
+
+        body = json.loads(gzip.decompress(kwargs["data"]))
+        assert body["$type"] == "$create_order"
+        assert body["$items"] == ORDER["$items"]
+
+    def test_small_bodies_are_not_compressed(self) -> None:
+        with mock.patch.object(self.sift_client.session, "post") as mock_post:
+            mock_post.return_value = http_response()
+            self.sift_client.label("billy_jones_301", {"$is_bad": True})
+
+        kwargs = mock_post.call_args.kwargs
+        assert "Content-Encoding" not in kwargs["headers"]
+        assert json.loads(kwargs["data"])["$is_bad"] is True
+
+    def test_reads_accept_compressed_responses(self) -> None:
+        with mock.patch.object(self.sift_client.session, "get") as mock_get:
+            mock_get.return_value = http_response()
+            self.sift_client.get_user_score("billy_jones_301")
+
+        headers = mock_get.call_args.kwargs["headers"]
+        assert headers["Accept-Encoding"] == "gzip, deflate"
+
+
+class TestAsyncClientCompression(IsolatedAsyncioTestCase):
+    async def test_large_bodies_are_compressed(self) -> None:
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(
+                200,
+                content=gzip.compress(b'{"status": 0}'),
+                headers={"Content-Encoding": "gzip"},
+            )
+
+        async with AsyncClient(
+            api_key="a_fake_test_api_key",
+            session=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            compression=Compression("deflate"),
+        ) as sift_client:
+            response = await sift_client.track("$create_order", ORDER)
+
+        assert response.api_status == 0
+        assert requests[0].headers["Content-Encoding"] == "deflate"
+        assert json.loads(zlib.decompress(requests[0].content))["$items"]
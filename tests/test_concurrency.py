@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+import typing as t
+from unittest import IsolatedAsyncioTestCase, TestCase, mock
+
+import httpx
+
+import sift
+from sift.async_client import AsyncClient
+from sift.concurrency import AdaptiveConcurrency, is_overload
+from sift.dispatcher import Dispatcher
+from tests.test_circuit_breaker import Clock
+from tests.test_retry import api_exception, http_response
+
+
+class TestAdaptiveConcurrency(TestCase):
+    def setUp(self) -> None:
+        self.clock = Clock()
+        patcher = mock.patch("time.monotonic", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_is_overload(self) -> None:
+        assert not is_overload(None)
+        assert not is_overload(api_exception(400, api_status=51))
+        assert is_overload(api_exception())
+        assert is_overload(api_exception(429))
+        assert is_overload(api_exception(400, api_status=60))
+        assert is_overload(api_exception(503))
+
+    def test_additive_increase(self) -> None:
+        concurrency = AdaptiveConcurrency(initial_limit=2, max_limit=4)
+
+        # about one more request in flight per limit's worth of successes
+        for _ in range(3):
+            concurrency.record(0.1)
+
+        assert concurrency.limit == 3
+
+        for _ in range(100):
+            concurrency.record(0.1)
+
+        assert concurrency.limit == 4
+
+    def test_multiplicative_decrease(self) -> None:
+        concurrency = AdaptiveConcurrency(initial_limit=20, min_limit=2)
+
+        concurrency.record(0.1, api_exception(429))
+        assert concurrency.limit == 14
+
+        # failures of requests sent before the decrease are ignored
+        concurrency.record(0.1, api_exception(429))
+        assert concurrency.limit == 14
+
+        for _ in range(10):
+            self.clock.now += 1
+            concurrency.record(0.1, api_exception(503))
+
+        assert concurrency.limit == 2
+
+    def test_latency_increase_is_overload(self) -> None:
+        concurrency = AdaptiveConcurrency(initial_limit=10)
+
+        concurrency.record(0.1)
+        limit = concurrency._limit
+
+        concurrency.record(0.15)
+        assert concurrency._limit > limit
+
+        self.clock.now += 1
+        concurrency.record(0.5)
+        assert concurrency.limit == 7
+
+    def test_acquire_and_release(self) -> None:
+        concurrency = AdaptiveConcurrency(initial_limit=1)
+
+        assert concurrency.acquire()
+        assert not concurrency.acquire(timeout=0.01)
+
+        concurrency.release()
+        assert concurrency.acquire(timeout=0.01)
+
+    def test_invalid_arguments(self) -> None:
+        self.assertRaises(ValueError, AdaptiveConcurrency, initial_limit=0)
+        self.assertRaises(
+            ValueError, AdaptiveConcurrency, initial_limit=10, max_limit=5
+        )
+        self.assertRaises(ValueError, AdaptiveConcurrency, decrease_factor=1)
+
+
+class ConcurrencyProbe:
+    """A session.post side effect recording the peak number of concurrent
+    calls and failing with HTTP 429 above `capacity` of them."""
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.in_flight = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, *args: t.Any, **kwargs: t.Any) -> mock.Mock:
+        with self.lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            overloaded = self.in_flight > self.capacity
+
+        time.sleep(0.002)
+
+        with self.lock:
+            self.in_flight -= 1
+
+        return http_response(429 if overloaded else 200)
+
+
+class TestAdaptiveBulkSending(TestCase):
+    def setUp(self) -> None:
+        self.sift_client = sift.Client(api_key="a_fake_test_api_key")
+        self.probe = ConcurrencyProbe(capacity=4)
+
+        patcher = mock.patch.object(
+            self.sift_client.session, "post", side_effect=self.probe
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def events(self, n: int) -> t.Iterator[sift.client.TrackItem]:
+        return (("$login", {"$user_id": str(i)}) for i in range(n))
+
+    def test_track_many_limit(self) -> None:
+        concurrency = AdaptiveConcurrency(initial_limit=1, max_limit=1)
+
+        results = list(
+            self.sift_client.track_many(
+                self.events(20),
+                max_concurrency=10,
+                concurrency=concurrency,
+                ordered=False,
+            )
+        )
+
+        assert len(results) == 20
+        assert self.probe.peak == 1
+
+    def test_track_many_backs_off(self) -> None:
+        concurrency = AdaptiveConcurrency(initial_limit=16, max_limit=16)
+
+        list(
+            self.sift_client.track_many(
+                self.events(200), max_concurrency=16, concurrency=concurrency
+            )
+        )
+
+        assert concurrency.limit < 16
+
+    def test_dispatcher_limit(self) -> None:
+        concurrency = AdaptiveConcurrency(initial_limit=2, max_limit=2)
+
+        with Dispatcher(
+            self.sift_client, workers=8, concurrency=concurrency
+        ) as dispatcher:
+            for i in range(40):
+                dispatcher.submit("$login", {"$user_id": str(i)})
+
+            assert dispatcher.flush(timeout=5)
+
+        assert dispatcher.sent == 40
+        assert self.probe.peak <= 2
+        assert concurrency.in_flight == 0
+
+
+class TestAsyncAdaptiveBulkSending(IsolatedAsyncioTestCase):
+    async def test_track_many_limit(self) -> None:
+        user_ids: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            user_ids.append(json.loads(request.content)["$user_id"])
+            return httpx.Response(200, json={"status": 0})
+
+        async with AsyncClient(
+            api_key="a_fake_test_api_key",
+            session=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        ) as sift_client:
+            concurrency = AdaptiveConcurrency(initial_limit=1)
+
+            results = [
+                index
+                async for index, _ in sift_client.track_many(
+                    (("$login", {"$user_id": str(i)}) for i in range(10)),
+                    concurrency=concurrency,
+                )
+            ]
+
+        assert results == list(range(10))
+        assert concurrency.limit > 1
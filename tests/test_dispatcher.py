@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import json
+import threading
+import typing as t
+from unittest import TestCase, mock
+
+from requests.exceptions import RequestException
+
+import sift
+from sift.dispatcher import Dispatcher
+
+
+def ok_response() -> mock.Mock:
+    mock_response = mock.Mock()
+    mock_response.content = '{"status": 0, "error_message": "OK"}'
+    mock_response.json.return_value = json.loads(mock_response.content)
+    mock_response.status_code = 200
+    return mock_response
+
+
+class TestDispatcher(TestCase):
+    def setUp(self) -> None:
+        self.sift_client = sift.Client(api_key="a_fake_test_api_key")
+        self.release = threading.Event()
+        self.sent_user_ids: list[str] = []
+
+        def post(url: str, data: str, **kwargs: t.Any) -> mock.Mock:
+            self.release.wait(5)
+            user_id = json.loads(data)["$user_id"]
+
+            if user_id == "bad":
+                raise RequestException("Failed")
+
+            self.sent_user_ids.append(user_id)
+            return ok_response()
+
+        patcher = mock.patch.object(
+            self.sift_client.session, "post", side_effect=post
+        )
+        self.mock_post = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.release.set)
+
+    def test_submit_and_flush(self) -> None:
+        self.release.set()
+
+        with Dispatcher(self.sift_client, workers=2) as dispatcher:
+            for i in range(20):
+                assert dispatcher.submit(
+                    "$login", {"$user_id": str(i)}, return_score=True
+                )
+
+            assert dispatcher.flush(timeout=5)
+            assert dispatcher.sent == 20
+            assert dispatcher.queue_size == 0
+
+        assert sorted(self.sent_user_ids, key=int) == [
+            str(i) for i in range(20)
+        ]
+        assert self.mock_post.call_args.kwargs["params"] == {
+            "return_score": "true"
+        }
+
+    def test_on_error(self) -> None:
+        self.release.set()
+        errors: list[tuple[sift.client.TrackItem, Exception]] = []
+
+        dispatcher = Dispatcher(
+            self.sift_client,
+            on_error=lambda item, e: errors.append((item, e)),
+        )
+        dispatcher.submit("$login", {"$user_id": "bad"})
+        dispatcher.submit("$login", {"$user_id": "good"})
+
+        assert dispatcher.close(timeout=5)
+        assert dispatcher.sent == 1
+        assert dispatcher.failed == 1
+
+        ((item, error),) = errors
+        assert item[1] == {"$user_id": "bad"}
+        self.assertIsInstance(error, sift.client.ApiException)
+
+    def test_submit_validates_arguments(self) -> None:
+        with Dispatcher(self.sift_client) as dispatcher:
+            self.assertRaises(TypeError, dispatcher.submit, None, {})
+            self.assertRaises(ValueError, dispatcher.submit, "$login", {})
+
+        with self.assertRaises(RuntimeError):
+            dispatcher.submit("$login", {"$user_id": "1"})
+
+        self.assertRaises(
+            ValueError, Dispatcher, self.sift_client, overflow="spill"
+        )
+
+    def submit_while_blocked(self, dispatcher: Dispatcher) -> list[bool]:
+        # the single worker takes the first event and blocks on it,
+        # the next two fill the queue
+        accepted = [dispatcher.submit("$login", {"$user_id": "0"})]
+
+        while dispatcher.queue_size:
+            pass
+
+        accepted += [
+            dispatcher.submit("$login", {"$user_id": str(i)})
+            for i in range(1, 5)
+        ]
+        return accepted
+
+    def test_drop_newest(self) -> None:
+        dispatcher = Dispatcher(
+            self.sift_client,
+            max_queue_size=2,
+            workers=1,
+            overflow="drop_newest",
+        )
+
+        accepted = self.submit_while_blocked(dispatcher)
+        self.release.set()
+
+        assert accepted == [True, True, True, False, False]
+        assert dispatcher.close(timeout=5)
+        assert dispatcher.dropped == 2
+        assert self.sent_user_ids == ["0", "1", "2"]
+
+    def test_drop_oldest(self) -> None:
+        dispatcher = Dispatcher(
+            self.sift_client,
+            max_queue_size=2,
+            workers=1,
+            overflow="drop_oldest",
+        )
+
+        accepted = self.submit_while_blocked(dispatcher)
+        self.release.set()
+
+        assert all(accepted)
+        assert dispatcher.close(timeout=5)
+        assert dispatcher.dropped == 2
+        assert self.sent_user_ids == ["0", "3", "4"]
+
+    def test_block_with_timeout(self) -> None:
+        dispatcher = Dispatcher(
+            self.sift_client,
+            max_queue_size=2,
+            workers=1,
+            block_timeout=0.01,
+        )
+
+        accepted = self.submit_while_blocked(dispatcher)
+
+        assert accepted == [True, True, True, False, False]
+        assert not dispatcher.flush(timeout=0.01)
+
+        self.release.set()
+
+        assert dispatcher.close(timeout=5)
+        assert dispatcher.dropped == 2
@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import typing as t
+from unittest import IsolatedAsyncioTestCase, TestCase, mock
+
+import sift
+from sift.async_client import AsyncClient
+from sift.exceptions import ApiException
+from sift.hooks import Hooks, RequestInfo, current_timings
+from sift.rate_limit import RateLimiter, TokenBucket
+from sift.retry import RetryPolicy
+from sift.testing import Fault, SiftServer
+from tests.test_transport import FakeTransport, ok
+
+
+def recording_hooks() -> tuple[Hooks, list[tuple[t.Any, ...]]]:
+    hooks = Hooks()
+    calls: list[tuple[t.Any, ...]] = []
+
+    for event in ("before_request", "after_response", "on_error", "on_retry"):
+        hooks.register(
+            event, lambda *args, event=event: calls.append((event, *args))
+        )
+
+    return hooks, calls
+
+
+class TestHooks(TestCase):
+    def test_register(self) -> None:
+        hooks = Hooks()
+        assert not hooks
+
+        def hook(request: RequestInfo) -> None:
+            pass
+
+        assert hooks.register("after_response", hook) is hook
+        assert hooks
+
+        hooks.unregister("after_response", hook)
+        assert not hooks
+
+        self.assertRaises(ValueError, hooks.register, "on_success", hook)
+        self.assertRaises(ValueError, hooks.unregister, "on_success", hook)
+
+    def test_failing_hooks_are_logged(self) -> None:
+        hooks = Hooks()
+        called: list[RequestInfo] = []
+
+        def fail(request: RequestInfo) -> None:
+            raise RuntimeError("failed")
+
+        hooks.register("after_response", fail)
+        hooks.register("after_response", called.append)
+        sift_client = sift.Client(
+            api_key="a_fake_test_api_key",
+            transport=FakeTransport(ok()),
+            hooks=hooks,
+        )
+
+        with self.assertLogs("sift.hooks") as logs:
+            assert sift_client.track(
+                "$login", {"$user_id": "billy_jones_301"}
+            ).is_ok()
+
+        assert len(called) == 1
+        assert "after_response hook" in logs.output[0]
+
+    def test_no_instrumentation_without_hooks(self) -> None:
+        sift_client = sift.Client(
+            api_key="a_fake_test_api_key",
+            transport=FakeTransport(ok()),
+            hooks=Hooks(),
+        )
+
+        with mock.patch.object(sift_client, "_request_info") as request_info:
+            sift_client.track("$login", {"$user_id": "billy_jones_301"})
+
+        request_info.assert_not_called()
+
+
+class TestClientHooks(TestCase):
+    def setUp(self) -> None:
+        self.server = SiftServer(api_key="a_fake_test_api_key").start()
+        self.addCleanup(self.server.stop)
+        self.hooks, self.calls = recording_hooks()
+        self.sift_client = sift.Client(
+            api_key="a_fake_test_api_key",
+            api_url=self.server.url,
+            retry=RetryPolicy(max_attempts=2, backoff_factor=0),
+            hooks=self.hooks,
+        )
+        self.addCleanup(self.sift_client.close)
+
+    def test_events(self) -> None:
+        self.sift_client.get_user_score("billy_jones_301")
+        self.sift_client.get_user_score("billy_jones_301")
+
+        events = [call[0] for call in self.calls]
+        assert events == ["before_request", "after_response"] * 2
+
+        first, second = self.calls[1][1], self.calls[3][1]
+        assert first.endpoint == "get_user_score"
+        assert first.family == "score"
+        assert first.method == "GET"
+        assert first.url_template == "/v205/users/{user_id}/score"
+        assert first.payload_size == 0
+        assert first.attempt == 1
+        assert first.status == 200
+
+        # the first call opened the connection the second reused
+        assert first.timings.connect is not None and first.timings.connect > 0
+        assert second.timings.connect == 0
+        assert second.timings.ttfb is not None
+        assert 0 < second.timings.ttfb <= second.timings.total
+        assert current_timings() is None
+
+    def test_headers(self) -> None:
+        def propagate(request: RequestInfo) -> None:
+            request.headers["traceparent"] = "00-0af7651916cd43dd-01"
+
+        self.hooks.register("before_request", propagate)
+        self.sift_client.track("$login", {"$user_id": "billy_jones_301"})
+
+        (request,) = self.server.requests
+        assert request.headers["traceparent"] == "00-0af7651916cd43dd-01"
+
+        info = self.calls[0][1]
+        assert info.url_template == "/v205/events"
+        assert info.payload_size == len(request.body)
+        assert "Authorization" not in info.headers
+
+    def test_payload_size(self) -> None:
+        data = '{"$user_id": "zoë"}'
+        info = self.sift_client._request_info(
+            "post",
+            f"{self.server.url}/v205/events",
+            "track",
+            1,
+            {"data": data},
+        )
+
+        assert info.payload_size == len(data.encode()) == len(data) + 1
+
+    def test_retries(self) -> None:
+        self.server.inject(Fault(429, times=1, retry_after=0))
+
+        assert self.sift_client.track(
+            "$login", {"$user_id": "billy_jones_301"}
+        ).is_ok()
+
+        events = [call[0] for call in self.calls]
+        assert events == [
+            "before_request",
+            "after_response",
+            "on_error",
+            "on_retry",
+            "before_request",
+            "after_response",
+        ]
+
+        _, failed, error, delay = self.calls[3]
+        assert failed.status == 429
+        assert failed.attempt == 1
+        assert error.http_status_code == 429
+        assert delay == 0
+        assert self.calls[5][1].attempt == 2
+
+    def test_errors(self) -> None:
+        self.server.inject(Fault(disconnect=True))
+
+        with self.assertRaises(ApiException):
+            self.sift_client.label("billy_jones_301", {"$is_bad": True})
+
+        events = [call[0] for call in self.calls]
+        assert events == ["before_request", "on_error"]
+
+        info = self.calls[1][1]
+        assert info.status is None
+        assert info.timings.total > 0
+
+    def test_rejected_calls(self) -> None:
+        sift_client = sift.Client(
+            api_key="a_fake_test_api_key",
+            api_url=self.server.url,
+            rate_limiter=RateLimiter(
+                default=TokenBucket(rate=1, burst=1), max_wait=0
+            ),
+            hooks=self.hooks,
+        )
+        self.addCleanup(sift_client.close)
+
+        sift_client.get_user_score("billy_jones_301")
+
+        with self.assertRaises(ApiException):
+            sift_client.get_user_score("billy_jones_301")
+
+        events = [call[0] for call in self.calls]
+        assert events == ["before_request", "after_response", "on_error"]
+
+
+class TestAsyncClientHooks(IsolatedAsyncioTestCase):
+    async def test_events(self) -> None:
+        hooks, calls = recording_hooks()
+
+        with SiftServer() as server:
+            server.inject(Fault(503, times=1))
+
+            async with AsyncClient(
+                api_key="a_fake_test_api_key",
+                api_url=server.url,
+                retry=RetryPolicy(max_attempts=2, backoff_factor=0),
+                hooks=hooks,
+            ) as sift_client:
+                response = await sift_client.get_user_score("billy_jones_301")
+
+        assert response.is_ok()
+        assert [call[0] for call in calls] == [
+            "before_request",
+            "after_response",
+            "on_error",
+            "on_retry",
+            "before_request",
+            "after_response",
+        ]
+
+        failed, info = calls[1][1], calls[5][1]
+        assert failed.status == 503
+        assert failed.timings.connect is not None
+        assert failed.timings.connect > 0
+        assert info.status == 200
+        assert info.attempt == 2
+        assert info.url_template == "/v205/users/{user_id}/score"
+        assert info.timings.connect == 0
+        assert info.timings.ttfb is not None
+        assert 0 < info.timings.ttfb <= info.timings.total
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import base64
+import importlib.util
+import json
+import typing as t
+from unittest import IsolatedAsyncioTestCase, TestCase, skipUnless
+
+import httpx
+
+import sift
+from sift.async_client import AsyncClient
+from sift.exceptions import ApiException
+from sift.retry import RetryPolicy
+
+if t.TYPE_CHECKING:
+    from sift.http2 import HTTP2Transport
+
+Handler = t.Callable[[httpx.Request], httpx.Response]
+
+
+def ok(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(
+        200, json={"status": 0, "error_message": "OK", "score": 0.5}
+    )
+
+
+@skipUnless(importlib.util.find_spec("h2"), "requires h2")
+class TestHTTP2Transport(TestCase):
+    def client(self, handler: Handler, **kwargs: t.Any) -> sift.Client:
+        from sift.http2 import HTTP2Transport
+
+        self.transport = HTTP2Transport(
+            httpx.Client(transport=httpx.MockTransport(handler))
+        )
+        return sift.Client(
+            api_key="a_fake_test_api_key", transport=self.transport, **kwargs
+        )
+
+    def test_http2_client(self) -> None:
+        sift_client = sift.Client(api_key="a_fake_test_api_key", http2=True)
+        transport = t.cast("HTTP2Transport", sift_client.transport)
+
+        assert transport.client._transport._pool._http2  # type: ignore[attr-defined]
+        assert sift_client.pool_stats is transport.stats
+        self.assertRaises(ValueError, sift_client.warm_up)
+
+    def test_requests(self) -> None:
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return ok(request)
+
+        sift_client = self.client(handler)
+        response = sift_client.track(
+            "$login", {"$user_id": "billy_jones_301"}, return_score=True
+        )
+        sift_client.get_user_score("billy_jones_301")
+        sift_client.unlabel("billy_jones_301", abuse_type="payment_abuse")
+
+        assert response.is_ok()
+        assert response.api_error_message == "OK"
+        assert [(r.method, r.url.path) for r in requests] == [
+            ("POST", "/v205/events"),
+            ("GET", "/v205/users/billy_jones_301/score"),
+            ("DELETE", "/v205/users/billy_jones_301/labels"),
+        ]
+        assert requests[0].url.params["return_score"] == "true"
+        assert json.loads(requests[0].content)["$type"] == "$login"
+        assert requests[0].headers["Content-type"] == "application/json"
+        assert requests[1].headers["Authorization"] == "Basic " + (
+            base64.b64encode(b"a_fake_test_api_key:").decode()
+        )
+        assert self.transport.stats.requests == 3
+
+    def test_status_only(self) -> None:
+        sift_client = self.client(ok)
+        response = sift_client.track(
+            "$login", {"$user_id": "billy_jones_301"}, status_only=True
+        )
+
+        assert response.api_status == 0
+        assert response.body is None
+
+    def test_api_errors(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(
+                400, json={"status": 51, "error_message": "Invalid API key"}
+            )
+
+        with self.assertRaises(ApiException) as context:
+            self.client(handler).get_user_score("billy_jones_301")
+
+        assert context.exception.http_status_code == 400
+        assert context.exception.api_status == 51
+
+    def test_connection_errors(self) -> None:
+        attempts = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            attempts.append(request)
+
+            if len(attempts) == 1:
+                raise httpx.ConnectError("Connection refused")
+
+            if len(attempts) == 3:
+                raise httpx.ReadTimeout("Read timed out")
+
+            return ok(request)
+
+        sift_client = self.client(
+            handler, retry=RetryPolicy(max_attempts=2, backoff_factor=0)
+        )
+
+        # the request wasn't sent, so it is retried
+        assert sift_client.label("billy_jones_301", {"$is_bad": True}).is_ok()
+
+        # the request may have been processed, so it isn't
+        with self.assertRaises(ApiException) as context:
+            sift_client.label("billy_jones_301", {"$is_bad": True})
+
+        assert "Read timed out" in str(context.exception)
+        assert len(attempts) == 3
+
+
+@skipUnless(importlib.util.find_spec("h2"), "requires h2")
+class TestAsyncClientHTTP2(IsolatedAsyncioTestCase):
+    async def test_http2_client(self) -> None:
+        async with AsyncClient(
+            api_key="a_fake_test_api_key", http2=True
+        ) as sift_client:
+            assert sift_client.session._transport._pool._http2  # type: ignore[attr-defined]
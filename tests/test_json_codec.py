@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import typing as t
+from decimal import Decimal
+from unittest import TestCase, mock, skipUnless
+
+import sift
+from sift.utils import DecimalEncoder, get_json_codec
+from tests.test_retry import http_response
+
+ORDER: dict[t.Any, t.Any] = {
+    "$user_id": "billy_jones_301",
+    "$order_id": "ORDER-28168441",
+    "$amount": Decimal("115940000"),
+    "$currency_code": "USD",
+    "$items": [
+        {
+            "$item_id": "12344321",
+            "$product_title": "Microwavable Kettle Corn: Original Flavor",
+            "$price": Decimal("4.99"),
+            "$quantity": 4,
+            "$tags": ["Popcorn", "Snacks", "On Sale"],
+        },
+    ],
+    "$shipping_address": {"$name": "Bill Jones", "$city": "New London"},
+    "$promotions": [
+        {"$promotion_id": "FirstTimeBuyer", "$status": "$success"}
+    ],
+    "$is_first_order": True,
+    "$referrer_user_id": None,
+    "note": "café ☕",
+    1: "non-string key",
+}
+
+CODECS = [
+    name
+    for name in ("json", "orjson", "ujson", "simdjson")
+    if name == "json" or importlib.util.find_spec(name)
+]
+
+
+class TestJSONCodecs(TestCase):
+    def test_parity(self) -> None:
+        expected = json.loads(json.dumps(ORDER, cls=DecimalEncoder))
+
+        for name in CODECS:
+            with self.subTest(codec=name):
+                codec = get_json_codec(name)
+                data = codec.dumps(ORDER)
+
+                assert json.loads(data) == expected
+                assert codec.loads(data) == expected
+                assert json.loads(data)["$items"][0]["$price"] == ["4.99"]
+
+    def test_stdlib_output_is_unchanged(self) -> None:
+        assert get_json_codec().dumps(ORDER) == json.dumps(
+            ORDER, cls=DecimalEncoder
+        )
+
+    def test_unserializable_objects(self) -> None:
+        for name in CODECS:
+            with self.subTest(codec=name):
+                self.assertRaises(
+                    TypeError, get_json_codec(name).dumps, {"a": object()}
+                )
+
+    def test_auto(self) -> None:
+        fastest = next(
+            (name for name in ("orjson", "simdjson") if name in CODECS),
+            "json",
+        )
+
+        assert get_json_codec("auto").name == fastest
+
+    def test_unknown_codec(self) -> None:
+        self.assertRaises(ValueError, get_json_codec, "yaml")
+
+    def test_missing_backend(self) -> None:
+        with mock.patch.dict("sys.modules", {"orjson": None}):
+            with self.assertRaises(ImportError) as cm:
+                get_json_codec("orjson")
+
+        assert "pip install orjson" in str(cm.exception)
+
+
+@skipUnless(importlib.util.find_spec("orjson"), "requires orjson")
+class TestClientJSONCodec(TestCase):
+    def test_requests_and_responses(self) -> None:
+        sift_client = sift.Client(
+            api_key="a_fake_test_api_key", json_codec="orjson"
+        )
+        mock_response = http_response()
+        mock_response.content = b'{"status": 0, "request": "{\\"a\\": 1}"}'
+        mock_response.json.side_effect = AssertionError("not called")
+
+        with mock.patch.object(sift_client.session, "post") as mock_post:
+            mock_post.return_value = mock_response
+            response = sift_client.track("$create_order", ORDER)
+
+        data = mock_post.call_args.kwargs["data"]
+        assert isinstance(data, bytes)
+        assert json.loads(data)["$amount"] == ["115940000"]
+        assert response.api_status == 0
+        assert response.request == {"a": 1}
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from unittest import TestCase
+
+import sift
+from sift.exceptions import ApiException
+from sift.hooks import Hooks
+from sift.metrics import Histogram, Metrics, status_class
+from sift.rate_limit import RateLimiter, TokenBucket
+from sift.retry import RetryPolicy
+from sift.testing import Fault, SiftServer
+
+
+def not_none(value: float | None) -> float:
+    assert value is not None
+    return value
+
+
+class TestHistogram(TestCase):
+    def test_quantiles(self) -> None:
+        histogram = Histogram((0.1, 0.2, 0.5))
+        assert histogram.quantile(0.5) is None
+
+        for value in (0.05,) * 50 + (0.15,) * 40 + (0.3,) * 9 + (2.0,):
+            histogram.observe(value)
+
+        assert histogram.count == 100
+        assert histogram.quantile(0) == 0
+        assert histogram.quantile(0.5) == 0.1
+        self.assertAlmostEqual(not_none(histogram.quantile(0.7)), 0.15)
+        self.assertAlmostEqual(not_none(histogram.quantile(0.99)), 0.5)
+        # above the last bucket
+        assert histogram.quantile(0.999) == 0.5
+        self.assertRaises(ValueError, histogram.quantile, 2)
+
+        snapshot = histogram.snapshot()
+        assert snapshot["count"] == 100
+        self.assertAlmostEqual(snapshot["sum"], 2.5 + 6 + 2.7 + 2)
+        assert snapshot["p50"] == 0.1
+        assert snapshot["buckets"] == {
+            0.1: 50,
+            0.2: 90,
+            0.5: 99,
+            float("inf"): 100,
+        }
+
+    def test_buckets(self) -> None:
+        histogram = Histogram((0.1, 0.2))
+        histogram.observe(0.1)
+
+        # upper bounds are inclusive
+        assert histogram.snapshot()["buckets"][0.1] == 1
+        self.assertRaises(ValueError, Histogram, ())
+        self.assertRaises(ValueError, Histogram, (0.2, 0.1))
+        self.assertRaises(ValueError, Metrics, (0.1, 0.1))
+
+    def test_status_class(self) -> None:
+        assert status_class(204) == "2xx"
+        assert status_class(429) == "4xx"
+        assert status_class(None) == "error"
+
+
+class TestMetrics(TestCase):
+    def setUp(self) -> None:
+        self.server = SiftServer().start()
+        self.addCleanup(self.server.stop)
+        self.metrics = Metrics()
+        self.hooks = Hooks()
+        self.metrics.register(self.hooks)
+        self.sift_client = sift.Client(
+            api_key="a_fake_test_api_key",
+            api_url=self.server.url,
+            retry=RetryPolicy(max_attempts=2, backoff_factor=0),
+            rate_limiter=RateLimiter(
+                families={"score": TokenBucket(rate=1, burst=2)}, max_wait=0
+            ),
+            hooks=self.hooks,
+        )
+        self.addCleanup(self.sift_client.close)
+
+    def test_snapshot(self) -> None:
+        self.server.inject(
+            Fault(429, endpoints={"track"}, times=1, retry_after=0)
+        )
+        self.sift_client.track("$login", {"$user_id": "billy_jones_301"})
+        self.sift_client.track("$login", {"$user_id": "billy_jones_301"})
+        self.sift_client.get_user_score("billy_jones_301")
+        self.sift_client.get_user_score("billy_jones_301")
+
+        with self.assertRaises(ApiException):
+            self.sift_client.get_user_score("billy_jones_301")
+
+        self.server.inject(Fault(disconnect=True, endpoints={"label"}))
+
+        with self.assertRaises(ApiException):
+            self.sift_client.label("billy_jones_301", {"$is_bad": True})
+
+        snapshot = self.metrics.snapshot()
+        requests = snapshot["requests"]
+
+        assert list(requests) == ["events", "labels", "score"]
+        assert requests["events"]["2xx"]["count"] == 2
+        assert requests["events"]["4xx"]["count"] == 1
+        assert requests["labels"]["error"]["count"] == 1
+        assert requests["score"]["2xx"]["count"] == 2
+        assert requests["score"]["2xx"]["p99"] > 0
+        assert snapshot["retries"] == {"events": 1}
+        assert snapshot["rejected"] == {"score": 1}
+
+    def test_prometheus(self) -> None:
+        self.sift_client.get_user_score("billy_jones_301")
+        text = Metrics(namespace="checkout_sift").prometheus()
+
+        assert "# TYPE checkout_sift_request_duration_seconds histogram" in (
+            text
+        )
+        assert "checkout_sift_retries_total{" not in text
+
+        text = self.metrics.prometheus()
+        labels = 'family="score",status_class="2xx"'
+
+        assert text.endswith("\n")
+        assert (
+            f'sift_client_request_duration_seconds_bucket{{{labels},le="0.005"}}'
+            in text
+        )
+        assert (
+            f'sift_client_request_duration_seconds_bucket{{{labels},le="+Inf"}} 1'
+            in text
+        )
+        assert f"sift_client_request_duration_seconds_count{{{labels}}} 1" in (
+            text
+        )
+        assert "# TYPE sift_client_rejected_total counter" in text
+
+    def test_unregister(self) -> None:
+        self.metrics.unregister(self.hooks)
+
+        assert not self.hooks
+
+        self.sift_client.get_user_score("billy_jones_301")
+        assert self.metrics.snapshot()["requests"] == {}
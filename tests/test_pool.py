@@ -0,0 +1,344 @@
+from __future__ import annotations
+
+import asyncio
+import socket
+import threading
+import time
+import typing as t
+from email.message import Message
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+import httpx
+import requests
+
+import sift
+from sift.async_client import AsyncClient
+from sift.exceptions import ApiException
+from sift.pool import PooledHTTPAdapter, PoolStats, httpx_limits
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.url = f"http://127.0.0.1:{self.server_address[1]}"
+        self.heads = 0
+        self.connections: list[socket.socket] = []
+        # the method, path, headers and body of the GET and POST requests
+        self.requests: list[tuple[str, str, Message[str, str], bytes]] = []
+
+    def reap(self) -> None:
+        """Closes the connections, as a server does once they are idle."""
+        for connection in self.connections:
+            connection.shutdown(socket.SHUT_RDWR)
+
+        self.connections.clear()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: _Server
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.connections.append(self.connection)
+
+    def do_HEAD(self) -> None:
+        self.server.heads += 1
+        self.send_response(404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self) -> None:
+        data = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.requests.append(
+            (self.command, self.path, self.headers, data)
+        )
+        body = b'{"status": 0, "error_message": "OK"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_POST = do_GET
+
+    def log_message(self, format: str, *args: t.Any) -> None:
+        pass
+
+
+def start_server(test: TestCase) -> _Server:
+    """Serves keep-alive HTTP/1.1 until the end of the test."""
+    server = _Server()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    def stop() -> None:
+        server.shutdown()
+        server.server_close()
+
+    test.addCleanup(stop)
+    return server
+
+
+def wait_for(condition: t.Callable[[], bool], timeout: float = 5) -> bool:
+    deadline = time.monotonic() + timeout
+
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    return condition()
+
+
+class TestPoolStats(TestCase):
+    def test_counters(self) -> None:
+        stats = PoolStats()
+        assert stats.reuse_ratio == 0
+
+        for _ in range(4):
+            stats._count_request()
+
+        stats._count_new_connection()
+
+        assert stats.reused_connections == 3
+        assert stats.reuse_ratio == 0.75
+        assert stats.as_dict() == {
+            "requests": 4,
+            "new_connections": 1,
+            "warmed_connections": 0,
+            "reused_connections": 3,
+        }
+
+        stats._count_new_connection()
+        stats._count_warmed_connection()
+        assert stats.reused_connections == 3
+
+
+class TestPooledHTTPAdapter(TestCase):
+    def setUp(self) -> None:
+        self.server = start_server(self)
+
+    def client(self, **kwargs: t.Any) -> sift.Client:
+        sift_client = sift.Client(
+            api_key="a_fake_test_api_key", api_url=self.server.url, **kwargs
+        )
+        self.addCleanup(sift_client.close)
+        return sift_client
+
+    def test_connections_are_reused(self) -> None:
+        sift_client = self.client()
+
+        for _ in range(5):
+            sift_client.get_user_score("billy_jones_301")
+
+        assert sift_client.pool_stats is not None
+        assert sift_client.pool_stats.as_dict() == {
+            "requests": 5,
+            "new_connections": 1,
+            "warmed_connections": 0,
+            "reused_connections": 4,
+        }
+
+    def test_pool_size_across_threads(self) -> None:
+        sift_client = self.client(pool_maxsize=8)
+        barrier = threading.Barrier(8)
+
+        def get_scores() -> None:
+            for _ in range(5):
+                barrier.wait()
+                sift_client.get_user_score("billy_jones_301")
+
+        threads = [threading.Thread(target=get_scores) for _ in range(8)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join(10)
+
+        assert sift_client.pool_stats is not None
+        assert sift_client.pool_stats.requests == 40
+        # every thread gets its connection back from the pool
+        assert sift_client.pool_stats.new_connections <= 8
+
+    def test_keep_alive_disabled(self) -> None:
+        sift_client = self.client(keep_alive=False)
+
+        for _ in range(3):
+            sift_client.track("$login", {"$user_id": "billy_jones_301"})
+
+        assert sift_client.pool_stats is not None
+        assert sift_client.pool_stats.new_connections == 3
+
+    def test_settings(self) -> None:
+        adapter = PooledHTTPAdapter(
+            pool_connections=2, pool_maxsize=16, pool_block=True
+        )
+
+        assert adapter.poolmanager.connection_pool_kw["maxsize"] == 16
+        assert adapter.poolmanager.connection_pool_kw["block"] is True
+        assert adapter.poolmanager.pools._maxsize == 2
+        self.assertRaises(ValueError, PooledHTTPAdapter, pool_maxsize=0)
+
+    def test_provided_session(self) -> None:
+        session = requests.Session()
+        sift_client = self.client(session=session)
+
+        assert sift_client.session is session
+        assert sift_client.pool_stats is None
+
+
+class TestWarmUp(TestCase):
+    def setUp(self) -> None:
+        self.server = start_server(self)
+        self.sift_client = sift.Client(
+            api_key="a_fake_test_api_key", api_url=self.server.url
+        )
+        self.addCleanup(self.sift_client.close)
+
+    def test_warm_up(self) -> None:
+        assert self.sift_client.warm_up(3) == 3
+        assert wait_for(lambda: len(self.server.connections) == 3)
+        assert self.sift_client.warm_up(3) == 0
+
+        self.sift_client.get_user_score("billy_jones_301")
+
+        assert self.sift_client.pool_stats is not None
+        assert self.sift_client.pool_stats.as_dict() == {
+            "requests": 1,
+            "new_connections": 3,
+            "warmed_connections": 3,
+            "reused_connections": 1,
+        }
+        assert self.server.heads == 0
+
+    def test_warm_up_is_bounded_by_pool_size(self) -> None:
+        sift_client = sift.Client(
+            api_key="a_fake_test_api_key",
+            api_url=self.server.url,
+            pool_maxsize=2,
+        )
+        self.addCleanup(sift_client.close)
+
+        assert sift_client.warm_up(5) == 2
+
+    def test_ping_reopens_closed_connections(self) -> None:
+        assert isinstance(self.sift_client.session, requests.Session)
+        adapter = self.sift_client.session.get_adapter(self.server.url)
+        assert isinstance(adapter, PooledHTTPAdapter)
+
+        assert adapter.warm_up(self.server.url, 2) == 2
+        assert adapter.warm_up(self.server.url, 2, ping=True) == 0
+        assert self.server.heads == 2
+
+        assert wait_for(lambda: len(self.server.connections) == 2)
+        self.server.reap()
+
+        assert adapter.warm_up(self.server.url, 2, ping=True) == 2
+        assert self.server.heads == 2
+
+    def test_keep_alive(self) -> None:
+        self.sift_client.warm_up(2, keep_alive_interval=0.05)
+
+        assert wait_for(lambda: self.server.heads >= 4)
+
+        self.sift_client.close()
+        heads = self.server.heads
+        time.sleep(0.1)
+        assert self.server.heads == heads
+
+    def test_invalid_arguments(self) -> None:
+        self.assertRaises(ValueError, self.sift_client.warm_up, 0)
+        self.assertRaises(TypeError, self.sift_client.warm_up, "1")
+        self.assertRaises(
+            ValueError, self.sift_client.warm_up, 1, keep_alive_interval=0
+        )
+
+        sift_client = sift.Client(
+            api_key="a_fake_test_api_key", session=requests.Session()
+        )
+        self.assertRaises(ValueError, sift_client.warm_up)
+
+    def test_connection_failure(self) -> None:
+        sift_client = sift.Client(
+            api_key="a_fake_test_api_key",
+            api_url="http://127.0.0.1:1",
+        )
+
+        with self.assertRaises(ApiException) as context:
+            sift_client.warm_up()
+
+        assert context.exception.url == "http://127.0.0.1:1"
+
+
+class TestAsyncClientPool(IsolatedAsyncioTestCase):
+    def test_limits(self) -> None:
+        limits = httpx_limits(pool_maxsize=16)
+        assert limits.max_connections is None
+        assert limits.max_keepalive_connections == 16
+
+        limits = httpx_limits(pool_maxsize=16, pool_block=True)
+        assert limits.max_connections == 16
+
+        assert httpx_limits(keep_alive=False).max_keepalive_connections == 0
+
+    async def test_connections_are_reused(self) -> None:
+        server = start_server(self)
+
+        async with AsyncClient(
+            api_key="a_fake_test_api_key", api_url=server.url
+        ) as sift_client:
+            for _ in range(3):
+                await sift_client.get_user_score("billy_jones_301")
+
+        assert sift_client.pool_stats is not None
+        assert sift_client.pool_stats.as_dict() == {
+            "requests": 3,
+            "new_connections": 1,
+            "warmed_connections": 0,
+            "reused_connections": 2,
+        }
+
+    async def test_warm_up(self) -> None:
+        server = start_server(self)
+
+        async with AsyncClient(
+            api_key="a_fake_test_api_key", api_url=server.url
+        ) as sift_client:
+            assert await sift_client.warm_up(3) == 3
+            assert await sift_client.warm_up(3) == 0
+
+            await sift_client.get_user_score("billy_jones_301")
+
+        assert sift_client.pool_stats is not None
+        assert sift_client.pool_stats.as_dict() == {
+            "requests": 1,
+            "new_connections": 3,
+            "warmed_connections": 3,
+            "reused_connections": 1,
+        }
+
+    async def test_keep_alive(self) -> None:
+        server = start_server(self)
+
+        async with AsyncClient(
+            api_key="a_fake_test_api_key", api_url=server.url
+        ) as sift_client:
+            await sift_client.warm_up(2, keep_alive_interval=0.05)
+
+            for _ in range(100):
+                if server.heads >= 6:
+                    break
+
+                await asyncio.sleep(0.01)
+
+        assert server.heads >= 6
+        assert sift_client._keep_alive is None
+
+    async def test_provided_session(self) -> None:
+        async with AsyncClient(
+            api_key="a_fake_test_api_key", session=httpx.AsyncClient()
+        ) as sift_client:
+            assert sift_client.pool_stats is None
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import typing as t
+from unittest import IsolatedAsyncioTestCase, TestCase, mock, skipIf
+
+import httpx
+
+import sift
+from sift.async_client import AsyncClient
+from sift.exceptions import RateLimitedException
+from sift.rate_limit import RateLimiter, SharedTokenBucket, TokenBucket
+from tests.test_circuit_breaker import Clock
+from tests.test_retry import http_response
+
+
+class TestTokenBucket(TestCase):
+    def setUp(self) -> None:
+        self.clock = Clock()
+        patcher = mock.patch("time.monotonic", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_burst_then_rate(self) -> None:
+        bucket = TokenBucket(rate=10, burst=3)
+
+        assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+        # reservations queue up behind each other
+        assert bucket.reserve() == 0.1
+        assert bucket.reserve() == 0.2
+
+        self.clock.now += 10
+        assert bucket.reserve() == 0
+
+    def test_max_wait(self) -> None:
+        bucket = TokenBucket(rate=2, burst=1)
+
+        assert bucket.reserve(max_wait=0) == 0
+        assert bucket.reserve(max_wait=0) is None
+        assert bucket.reserve(max_wait=0.4) is None
+        assert bucket.reserve(max_wait=0.5) == 0.5
+
+        self.clock.now += 1
+        assert bucket.reserve(max_wait=0) == 0
+
+    def test_default_burst(self) -> None:
+        assert TokenBucket(rate=50).burst == 50
+        assert TokenBucket(rate=0.5).burst == 1
+
+    def test_invalid_arguments(self) -> None:
+        self.assertRaises(ValueError, TokenBucket, rate=0)
+        self.assertRaises(ValueError, TokenBucket, rate=1, burst=0)
+
+    def test_concurrent_reservations(self) -> None:
+        bucket = TokenBucket(rate=100, burst=10)
+        waits: list[float | None] = []
+
+        def reserve() -> None:
+            for _ in range(25):
+                waits.append(bucket.reserve())
+
+        threads = [threading.Thread(target=reserve) for _ in range(4)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        # the clock is frozen: every token is handed out exactly once
+        assert sorted(round(t.cast(float, w), 6) for w in waits) == [
+            max(i - 9, 0) / 100 for i in range(100)
+        ]
+
+
+def reserve_all(
+    bucket: SharedTokenBucket,
+    results: multiprocessing.SimpleQueue[int],
+) -> None:
+    results.put(sum(bucket.reserve(max_wait=0) is not None for _ in range(10)))
+
+
+@skipIf(sys.platform == "win32", "requires POSIX")
+class TestSharedTokenBucket(TestCase):
+    def setUp(self) -> None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.path = os.path.join(tmp_dir.name, "events.bucket")
+
+    def test_state_is_shared(self) -> None:
+        with mock.patch("time.monotonic", Clock()):
+            first = SharedTokenBucket(self.path, rate=10, burst=2)
+            second = SharedTokenBucket(self.path, rate=10, burst=2)
+
+            assert first.reserve() == 0
+            assert second.reserve() == 0
+            assert first.reserve(max_wait=0) is None
+            assert second.reserve() == 0.1
+
+        first.close()
+        second.close()
+
+    def test_bucket_opened_before_fork(self) -> None:
+        # practically no refill: the processes share 20 tokens
+        bucket = SharedTokenBucket(self.path, rate=0.001, burst=20)
+        context = multiprocessing.get_context("fork")
+        results: multiprocessing.SimpleQueue[int] = context.SimpleQueue()
+        processes = [
+            context.Process(target=reserve_all, args=(bucket, results))
+            for _ in range(4)
+        ]
+
+        for process in processes:
+            process.start()
+
+        for process in processes:
+            process.join(10)
+
+        assert sum(results.get() for _ in processes) == 20
+        assert bucket.reserve(max_wait=0) is None
+
+        bucket.close()
+
+
+class TestRateLimiter(TestCase):
+    def test_families(self) -> None:
+        score = mock.Mock(reserve=mock.Mock(return_value=0.5))
+        default = mock.Mock(reserve=mock.Mock(return_value=0.0))
+        limiter = RateLimiter(
+            default=default, families={"score": score}, max_wait=1
+        )
+
+        assert limiter.reserve("score") == 0.5
+        assert limiter.reserve("events") == 0.0
+        score.reserve.assert_called_once_with(1)
+        default.reserve.assert_called_once_with(1)
+
+        assert RateLimiter(families={"score": score}).reserve("events") == 0
+
+
+class TestClientRateLimiting(TestCase):
+    def setUp(self) -> None:
+        patcher = mock.patch("time.sleep")
+        self.mock_sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_calls_wait_for_tokens(self) -> None:
+        sift_client = sift.Client(
+            api_key="a_fake_test_api_key",
+            rate_limiter=RateLimiter(
+                families={"labels": TokenBucket(rate=1, burst=1)}
+            ),
+        )
+
+        with mock.patch.object(sift_client.session, "post") as mock_post:
+            mock_post.return_value = http_response()
+
+            sift_client.label("billy_jones_301", {"$is_bad": True})
+            self.mock_sleep.assert_not_called()
+
+            sift_client.label("billy_jones_301", {"$is_bad": True})
+            self.mock_sleep.assert_called_once()
+            assert 0.9 < self.mock_sleep.call_args.args[0] <= 1
+
+            # other families are not limited
+            sift_client.track("$login", {"$user_id": "billy_jones_301"})
+            assert self.mock_sleep.call_count == 1
+
+        assert mock_post.call_count == 3
+
+    def test_fail_fast(self) -> None:
+        sift_client = sift.Client(
+            api_key="a_fake_test_api_key",
+            rate_limiter=RateLimiter(
+                default=TokenBucket(rate=1, burst=1), max_wait=0
+            ),
+        )
+
+        with mock.patch.object(sift_client.session, "get") as mock_get:
+            mock_get.return_value = http_response()
+
+            sift_client.get_user_score("billy_jones_301")
+
+            with self.assertRaises(RateLimitedException) as cm:
+                sift_client.get_user_score("billy_jones_301")
+
+        assert cm.exception.family == "score"
+        assert mock_get.call_count == 1
+        self.mock_sleep.assert_not_called()
+
+
+class TestAsyncClientRateLimiting(IsolatedAsyncioTestCase):
+    async def test_calls_wait_for_tokens(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json={"status": 0})
+
+        async with AsyncClient(
+            api_key="a_fake_test_api_key",
+            session=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            rate_limiter=RateLimiter(default=TokenBucket(rate=1, burst=1)),
+        ) as sift_client:
+            with mock.patch("asyncio.sleep") as mock_sleep:
+                await sift_client.rescore_user("billy_jones_301")
+                await sift_client.rescore_user("billy_jones_301")
+
+        mock_sleep.assert_awaited_once()
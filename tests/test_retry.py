@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import email.utils
+import json
+import time
+from unittest import IsolatedAsyncioTestCase, TestCase, mock
+
+import httpx
+import requests
+import urllib3
+
+import sift
+from sift.async_client import AsyncClient
+from sift.exceptions import ApiException
+from sift.retry import RetryPolicy
+from tests.test_client import valid_transaction_properties
+
+
+def http_response(
+    status_code: int = 200,
+    api_status: int = 0,
+    headers: dict[str, str] | None = None,
+) -> mock.Mock:
+    mock_response = mock.Mock()
+    mock_response.content = json.dumps(
+        {"status": api_status, "error_message": "error"}
+    )
+    mock_response.json.return_value = json.loads(mock_response.content)
+    mock_response.status_code = status_code
+    mock_response.headers = headers or {}
+    return mock_response
+
+
+def api_exception(
+    http_status_code: int | None = None,
+    api_status: int | None = None,
+) -> ApiException:
+    return ApiException(
+        "error",
+        "https://api.sift.com/v205/events",
+        http_status_code=http_status_code,
+        api_status=api_status,
+    )
+
+
+class TestRetryPolicy(TestCase):
+    def test_retryable_failures(self) -> None:
+        policy = RetryPolicy()
+
+        for error in (
+            api_exception(),
+            api_exception(429),
+            api_exception(503),
+            api_exception(400, api_status=60),
+            api_exception(500, api_status=-1),
+        ):
+            assert policy.is_retryable(error, idempotent=True)
+
+        for error in (
+            api_exception(400, api_status=51),
+            api_exception(404),
+        ):
+            assert not policy.is_retryable(error, idempotent=True)
+
+    def test_non_idempotent_calls_are_retried_if_not_processed(self) -> None:
+        policy = RetryPolicy()
+
+        assert policy.is_retryable(api_exception(429), idempotent=False)
+        assert policy.is_retryable(
+            api_exception(400, api_status=60), idempotent=False
+        )
+        assert policy.is_retryable(
+            api_exception(), idempotent=False, request_sent=False
+        )
+        assert not policy.is_retryable(api_exception(), idempotent=False)
+        assert not policy.is_retryable(api_exception(503), idempotent=False)
+
+        policy = RetryPolicy(retry_non_idempotent=True)
+
+        assert policy.is_retryable(api_exception(503), idempotent=False)
+
+    def test_backoff_is_capped(self) -> None:
+        policy = RetryPolicy(backoff_factor=1, max_backoff=3)
+
+        for attempt, cap in ((1, 1), (2, 2), (3, 3), (10, 3)):
+            assert all(0 <= policy.backoff(attempt) <= cap for _ in range(100))
+
+    def test_retry_delay(self) -> None:
+        policy = RetryPolicy(max_attempts=3, max_backoff=10)
+        error = api_exception(503)
+
+        assert policy.retry_delay(error, True, 1, 0, retry_after="2") == 2
+        assert policy.retry_delay(error, True, 3, 0) is None
+        assert policy.retry_delay(error, True, 1, 0, retry_after="20") is None
+
+        retry_after = email.utils.formatdate(time.time() + 5, usegmt=True)
+        delay = policy.retry_delay(error, True, 1, 0, retry_after=retry_after)
+        assert delay is not None and 3 < delay <= 5
+
+        policy = RetryPolicy(respect_retry_after=False, backoff_factor=0.1)
+        delay = policy.retry_delay(error, True, 1, 0, retry_after="2")
+        assert delay is not None and delay <= 0.1
+
+    def test_deadline(self) -> None:
+        policy = RetryPolicy(max_attempts=10, deadline=5)
+        error = api_exception(503)
+
+        assert policy.retry_delay(error, True, 2, 2, retry_after="1") == 1
+        assert policy.retry_delay(error, True, 2, 4.5, retry_after="1") is None
+
+    def test_invalid_max_attempts(self) -> None:
+        self.assertRaises(ValueError, RetryPolicy, max_attempts=0)
+
+
+class TestClientRetries(TestCase):
+    def setUp(self) -> None:
+        self.sift_client = sift.Client(
+            api_key="a_fake_test_api_key",
+            account_id="ACCT",
+            retry=RetryPolicy(max_attempts=3),
+        )
+
+        patcher = mock.patch("time.sleep")
+        self.mock_sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_idempotent_call_is_retried(self) -> None:
+        with mock.patch.object(self.sift_client.session, "get") as mock_get:
+            mock_get.side_effect = [
+                http_response(503),
+                http_response(500, api_status=-1),
+                http_response(),
+            ]
+            response = self.sift_client.get_user_score("billy_jones_301")
+
+        assert response.is_ok()
+        assert mock_get.call_count == 3
+        assert self.mock_sleep.call_count == 2
+
+    def test_gives_up_after_max_attempts(self) -> None:
+        with mock.patch.object(self.sift_client.session, "get") as mock_get:
+            mock_get.return_value = http_response(503)
+
+            with self.assertRaises(ApiException) as cm:
+                self.sift_client.get_user_score("billy_jones_301")
+
+        assert cm.exception.http_status_code == 503
+        assert mock_get.call_count == 3
+
+    def test_retry_after_is_respected(self) -> None:
+        with mock.patch.object(self.sift_client.session, "get") as mock_get:
+            mock_get.side_effect = [
+                http_response(429, headers={"Retry-After": "1.5"}),
+                http_response(),
+            ]
+            self.sift_client.get_user_score("billy_jones_301")
+
+        self.mock_sleep.assert_called_once_with(1.5)
+
+    def test_non_idempotent_call_is_not_retried_once_processed(self) -> None:
+        with mock.patch.object(self.sift_client.session, "post") as mock_post:
+            mock_post.side_effect = [
+                requests.exceptions.ReadTimeout("Timed out"),
+                http_response(),
+            ]
+
+            with self.assertRaises(ApiException):
+                self.sift_client.track(
+                    "$transaction", valid_transaction_properties()
+                )
+
+        assert mock_post.call_count == 1
+
+    def test_non_idempotent_call_is_retried_if_not_processed(self) -> None:
+        new_connection_error = urllib3.exceptions.NewConnectionError(
+            mock.Mock(), "Connection refused"
+        )
+
+        with mock.patch.object(self.sift_client.session, "post") as mock_post:
+            mock_post.side_effect = [
+                requests.exceptions.ConnectionError(
+                    urllib3.exceptions.MaxRetryError(
+                        mock.Mock(), "/v205/events", new_connection_error
+                    )
+                ),
+                http_response(400, api_status=60),
+                http_response(),
+            ]
+            response = self.sift_client.track(
+                "$transaction", valid_transaction_properties()
+            )
+
+        assert response.is_ok()
+        assert mock_post.call_count == 3
+
+        # the request is sent once more with the same arguments
+        first, second, third = mock_post.call_args_list
+        assert first == second == third
+
+    def test_per_call_policy(self) -> None:
+        with mock.patch.object(self.sift_client.session, "get") as mock_get:
+            mock_get.return_value = http_response(503)
+
+            with self.assertRaises(ApiException):
+                self.sift_client.get_decisions(
+                    "user", retry=RetryPolicy(max_attempts=1)
+                )
+
+        assert mock_get.call_count == 1
+
+    def test_no_retries_by_default(self) -> None:
+        sift_client = sift.Client(api_key="a_fake_test_api_key")
+
+        with mock.patch.object(sift_client.session, "post") as mock_post:
+            mock_post.return_value = http_response(429)
+
+            with self.assertRaises(ApiException):
+                sift_client.label("billy_jones_301", {"$is_bad": True})
+
+            mock_post.reset_mock()
+
+            with self.assertRaises(ApiException):
+                sift_client.label(
+                    "billy_jones_301",
+                    {"$is_bad": True},
+                    retry=RetryPolicy(max_attempts=2),
+                )
+
+        assert mock_post.call_count == 2
+
+
+class TestAsyncClientRetries(IsolatedAsyncioTestCase):
+    async def test_retries(self) -> None:
+        statuses = [503, 200]
+        requests_sent: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests_sent.append(request)
+            return httpx.Response(
+                statuses.pop(0), json={"status": 0, "error_message": "OK"}
+            )
+
+        async with AsyncClient(
+            api_key="a_fake_test_api_key",
+            account_id="ACCT",
+            session=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            retry=RetryPolicy(backoff_factor=0),
+        ) as sift_client:
+            response = await sift_client.rescore_user("billy_jones_301")
+
+            assert response.is_ok()
+            assert len(requests_sent) == 2
+
+            statuses = [503, 200]
+
+            with self.assertRaises(ApiException):
+                await sift_client.apply_user_decision(
+                    "billy_jones_301",
+                    {
+                        "decision_id": "user_looks_ok",
+                        "source": "AUTOMATED_RULE",
+                    },
+                    retry=RetryPolicy(backoff_factor=0),
+                )
+
+            assert len(requests_sent) == 3
+
+    async def test_connect_error_is_retried(self) -> None:
+        attempts: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            attempts.append(request)
+
+            if len(attempts) == 1:
+                raise httpx.ConnectError("Connection refused")
+
+            return httpx.Response(200, json={"status": 0})
+
+        async with AsyncClient(
+            api_key="a_fake_test_api_key",
+            session=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            retry=RetryPolicy(backoff_factor=0),
+        ) as sift_client:
+            response = await sift_client.track(
+                "$transaction", valid_transaction_properties()
+            )
+
+        assert response.is_ok()
+        assert len(attempts) == 2
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import typing as t
+from unittest import IsolatedAsyncioTestCase, TestCase, mock
+
+import httpx
+
+import sift
+from sift.async_client import AsyncClient
+from sift.exceptions import ApiException
+from sift.single_flight import AsyncSingleFlight, SingleFlight
+from tests.test_retry import http_response
+
+
+def run_threads(n: int, target: t.Callable[[], None]) -> None:
+    threads = [threading.Thread(target=target) for _ in range(n)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join(5)
+
+
+class BlockingCall:
+    """A call blocking until `release` is set, so that callers pile up."""
+
+    def __init__(self, result: t.Any = None) -> None:
+        self.result = result
+        self.calls = 0
+        self.release = threading.Event()
+
+    def __call__(self, *args: t.Any, **kwargs: t.Any) -> t.Any:
+        self.calls += 1
+        self.release.wait(5)
+
+        if isinstance(self.result, Exception):
+            raise self.result
+
+        return self.result
+
+
+class TestSingleFlight(TestCase):
+    def test_concurrent_calls_are_shared(self) -> None:
+        flight: SingleFlight[str] = SingleFlight()
+        call = BlockingCall("result")
+        results: list[str] = []
+
+        def do() -> None:
+            results.append(flight.do("key", call))
+
+        timer = threading.Timer(0.1, call.release.set)
+        timer.start()
+        run_threads(8, do)
+
+        assert results == ["result"] * 8
+        assert call.calls == 1
+        assert (flight.calls, flight.shared) == (1, 7)
+
+        # the key is free once the call completes
+        assert flight.do("key", lambda: "new result") == "new result"
+
+    def test_exception_is_shared(self) -> None:
+        flight: SingleFlight[None] = SingleFlight()
+        call = BlockingCall(ValueError("boom"))
+        errors: list[Exception] = []
+
+        def do() -> None:
+            try:
+                flight.do("key", call)
+            except ValueError as e:
+                errors.append(e)
+
+        timer = threading.Timer(0.1, call.release.set)
+        timer.start()
+        run_threads(4, do)
+
+        assert len(errors) == 4
+        assert call.calls == 1
+        assert not flight._in_flight
+
+    def test_keys_are_independent(self) -> None:
+        flight: SingleFlight[str] = SingleFlight()
+
+        assert flight.do("a", lambda: "a") == "a"
+        assert flight.do("b", lambda: "b") == "b"
+        assert flight.calls == 2
+
+
+class TestAsyncSingleFlight(IsolatedAsyncioTestCase):
+    async def test_concurrent_calls_are_shared(self) -> None:
+        flight: AsyncSingleFlight[str] = AsyncSingleFlight()
+        calls = 0
+
+        async def call() -> str:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(
+            *(flight.do("key", call) for _ in range(8))
+        )
+
+        assert results == ["result"] * 8
+        assert calls == 1
+        assert (flight.calls, flight.shared) == (1, 7)
+        assert not flight._in_flight
+
+    async def test_cancelled_caller(self) -> None:
+        flight: AsyncSingleFlight[str] = AsyncSingleFlight()
+
+        async def call() -> str:
+            await asyncio.sleep(0.01)
+            return "result"
+
+        first = asyncio.ensure_future(flight.do("key", call))
+        second = asyncio.ensure_future(flight.do("key", call))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        # the call goes on for the other callers
+        assert await second == "result"
+
+
+class TestClientCoalescing(TestCase):
+    def test_concurrent_reads_are_coalesced(self) -> None:
+        sift_client = sift.Client(
+            api_key="a_fake_test_api_key", coalesce_reads=True
+        )
+        call = BlockingCall(http_response())
+        responses: list[sift.client.Response] = []
+
+        def get_score() -> None:
+            responses.append(sift_client.get_user_score("billy_jones_301"))
+
+        with mock.patch.object(
+            sift_client.session, "get", side_effect=call
+        ) as mock_get:
+            timer = threading.Timer(0.1, call.release.set)
+            timer.start()
+            run_threads(8, get_score)
+
+        assert len(responses) == 8
+        assert all(response is responses[0] for response in responses)
+        mock_get.assert_called_once()
+
+    def test_different_params_are_not_coalesced(self) -> None:
+        sift_client = sift.Client(
+            api_key="a_fake_test_api_key", coalesce_reads=True
+        )
+        call = BlockingCall(http_response())
+
+        def get_score() -> None:
+            sift_client.get_user_score("billy_jones_301")
+
+        def get_scores() -> None:
+            sift_client.get_user_score(
+                "billy_jones_301", abuse_types=["payment_abuse"]
+            )
+
+        with mock.patch.object(
+            sift_client.session, "get", side_effect=call
+        ) as mock_get:
+            threads = [
+                threading.Thread(target=target)
+                for target in (get_score, get_scores)
+            ]
+
+            for thread in threads:
+                thread.start()
+
+            call.release.set()
+
+            for thread in threads:
+                thread.join(5)
+
+        assert mock_get.call_count == 2
+
+    def test_failures_are_shared(self) -> None:
+        sift_client = sift.Client(
+            api_key="a_fake_test_api_key",
+            account_id="ACCT",
+            coalesce_reads=True,
+        )
+        call = BlockingCall(http_response(500, api_status=-1))
+        errors: list[ApiException] = []
+
+        def get_decisions() -> None:
+            try:
+                sift_client.get_user_decisions("billy_jones_301")
+            except ApiException as e:
+                errors.append(e)
+
+        with mock.patch.object(
+            sift_client.session, "get", side_effect=call
+        ) as mock_get:
+            timer = threading.Timer(0.1, call.release.set)
+            timer.start()
+            run_threads(4, get_decisions)
+
+        assert len(errors) == 4
+        mock_get.assert_called_once()
+
+    def test_writes_are_not_coalesced(self) -> None:
+        sift_client = sift.Client(
+            api_key="a_fake_test_api_key", coalesce_reads=True
+        )
+
+        with mock.patch.object(sift_client.session, "post") as mock_post:
+            mock_post.return_value = http_response()
+
+            sift_client.rescore_user("billy_jones_301")
+            sift_client.rescore_user("billy_jones_301")
+
+        assert mock_post.call_count == 2
+        assert sift_client.single_flight is not None
+        assert sift_client.single_flight.calls == 0
+
+
+class TestAsyncClientCoalescing(IsolatedAsyncioTestCase):
+    async def test_concurrent_reads_are_coalesced(self) -> None:
+        requests: list[httpx.Request] = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={"status": 0})
+
+        async with AsyncClient(
+            api_key="a_fake_test_api_key",
+            account_id="ACCT",
+            session=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            coalesce_reads=True,
+        ) as sift_client:
+            responses = await asyncio.gather(
+                *(
+                    sift_client.get_workflow_status("4zxwibludiaaa")
+                    for _ in range(8)
+                )
+            )
+
+        assert len(requests) == 1
+        assert all(response is responses[0] for response in responses)
@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+import time
+import typing as t
+from decimal import Decimal
+from unittest import TestCase, mock
+
+from requests.exceptions import RequestException
+
+import sift
+from sift.dispatcher import Dispatcher
+from sift.retry import RetryPolicy
+from sift.spool import Spool
+
+
+def ok_response() -> mock.Mock:
+    mock_response = mock.Mock()
+    mock_response.content = '{"status": 0, "error_message": "OK"}'
+    mock_response.json.return_value = json.loads(mock_response.content)
+    mock_response.status_code = 200
+    return mock_response
+
+
+def bad_request_response() -> mock.Mock:
+    mock_response = mock.Mock()
+    mock_response.content = (
+        '{"status": 55, "error_message": "Missing required field"}'
+    )
+    mock_response.json.return_value = json.loads(mock_response.content)
+    mock_response.status_code = 400
+    return mock_response
+
+
+class TestSpool(TestCase):
+    def setUp(self) -> None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.directory = tmp_dir.name
+
+        self.sift_client = sift.Client(api_key="a_fake_test_api_key")
+        self.sent_user_ids: list[str] = []
+
+        def post(url: str, data: str, **kwargs: t.Any) -> mock.Mock:
+            user_id = json.loads(data)["$user_id"]
+
+            if user_id.startswith("bad"):
+                raise RequestException("Failed")
+
+            if user_id.startswith("invalid"):
+                return bad_request_response()
+
+            self.sent_user_ids.append(user_id)
+            return ok_response()
+
+        patcher = mock.patch.object(
+            self.sift_client.session, "post", side_effect=post
+        )
+        self.mock_post = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def segments(self) -> list[str]:
+        return sorted(
+            name
+            for name in os.listdir(self.directory)
+            if name.startswith("segment-")
+        )
+
+    def test_append_ack_and_recover(self) -> None:
+        with Spool(self.directory) as spool:
+            seqs = [
+                spool.append(("$login", {"$user_id": str(i)}))
+                for i in range(5)
+            ]
+
+            assert seqs == [1, 2, 3, 4, 5]
+
+            spool.ack(1)
+            spool.ack(2)
+            spool.ack(4)
+
+            assert [seq for seq, _ in spool.pending()] == [3, 5]
+
+        with Spool(self.directory) as spool:
+            pending = list(spool.pending())
+
+            # the acknowledgement of 4 is not covered by the checkpoint
+            assert [seq for seq, _ in pending] == [3, 4, 5]
+            assert pending[0][1] == ("$login", {"$user_id": "2"}, None)
+            assert spool.append(("$login", {"$user_id": "5"})) == 6
+
+    def test_options_and_decimals_are_preserved(self) -> None:
+        with Spool(self.directory) as spool:
+            spool.append(
+                (
+                    "$transaction",
+                    {"$user_id": "1", "$amount": Decimal("1253200.0")},
+                    {"return_score": True},
+                )
+            )
+
+            ((_, item),) = spool.pending()
+
+        # decimals are stored the way DecimalEncoder sends them
+        assert item == (
+            "$transaction",
+            {"$user_id": "1", "$amount": ["1253200.0"]},
+            {"return_score": True},
+        )
+
+    def test_segments_rotate_and_are_deleted_once_acked(self) -> None:
+        with Spool(self.directory, segment_size=200) as spool:
+            for i in range(20):
+                spool.append(("$login", {"$user_id": str(i)}))
+
+            assert len(self.segments()) > 3
+
+            for seq, _ in list(spool.pending()):
+                spool.ack(seq)
+
+            spool.flush()
+
+            assert len(self.segments()) == 1
+            assert list(spool.pending()) == []
+
+        with Spool(self.directory, segment_size=200) as spool:
+            assert list(spool.pending()) == []
+            assert spool.next_seq == 21
+
+    def test_torn_record_is_truncated(self) -> None:
+        with Spool(self.directory) as spool:
+            spool.append(("$login", {"$user_id": "1"}))
+            spool.append(("$login", {"$user_id": "2"}))
+
+        (segment,) = self.segments()
+        path = os.path.join(self.directory, segment)
+        size = os.path.getsize(path)
+
+        with open(path, "ab") as f:
+            f.write(b"\x00\x00\x01\x00garbage")
+
+        with Spool(self.directory) as spool:
+            assert os.path.getsize(path) == size
+            assert [seq for seq, _ in spool.pending()] == [1, 2]
+            assert spool.append(("$login", {"$user_id": "3"})) == 3
+            assert [seq for seq, _ in spool.pending()] == [1, 2, 3]
+
+    def test_concurrent_appends(self) -> None:
+        seqs: list[int] = []
+
+        with Spool(self.directory) as spool:
+
+            def append() -> None:
+                for i in range(50):
+                    seqs.append(spool.append(("$login", {"$user_id": "1"})))
+
+            threads = [threading.Thread(target=append) for _ in range(4)]
+
+            for thread in threads:
+                thread.start()
+
+            for thread in threads:
+                thread.join()
+
+            assert sorted(seqs) == list(range(1, 201))
+            assert [seq for seq, _ in spool.pending()] == list(range(1, 201))
+
+    def test_replay(self) -> None:
+        with Spool(self.directory) as spool:
+            for user_id in ("1", "bad", "2"):
+                spool.append(("$login", {"$user_id": user_id}))
+
+            assert spool.replay(self.sift_client) == (2, 1)
+            assert sorted(self.sent_user_ids) == ["1", "2"]
+            assert [item for _, item in spool.pending()] == [
+                ("$login", {"$user_id": "bad"}, None)
+            ]
+
+    def test_replay_acks_rejected_events(self) -> None:
+        with Spool(self.directory) as spool:
+            for user_id in ("invalid", "1", "2"):
+                spool.append(("$login", {"$user_id": user_id}))
+
+            assert spool.replay(self.sift_client, max_concurrency=1) == (
+                2,
+                1,
+            )
+            assert list(spool.pending()) == []
+
+        # the checkpoint moved past the rejected event
+        with Spool(self.directory) as spool:
+            assert list(spool.pending()) == []
+            assert spool.replay(self.sift_client) == (0, 0)
+
+        assert self.mock_post.call_count == 3
+
+    def test_unserializable_options(self) -> None:
+        with Spool(self.directory) as spool:
+            with self.assertRaisesRegex(ValueError, "'retry'"):
+                spool.append(
+                    (
+                        "$login",
+                        {"$user_id": "1"},
+                        {"return_score": True, "retry": RetryPolicy()},
+                    )
+                )
+
+            with Dispatcher(self.sift_client, spool=spool) as dispatcher:
+                with self.assertRaisesRegex(ValueError, "'retry'"):
+                    dispatcher.submit(
+                        "$login", {"$user_id": "1"}, retry=RetryPolicy()
+                    )
+
+            assert list(spool.pending()) == []
+            assert spool.next_seq == 1
+
+    def test_dispatcher_with_spool(self) -> None:
+        with Spool(self.directory) as spool:
+            # left over by a previous run
+            spool.append(("$login", {"$user_id": "leftover"}))
+
+            dispatcher = Dispatcher(self.sift_client, spool=spool)
+            dispatcher.submit("$login", {"$user_id": "1"})
+            dispatcher.submit("$login", {"$user_id": "bad"})
+
+            assert dispatcher.close(timeout=5)
+            assert sorted(self.sent_user_ids) == ["1", "leftover"]
+            assert dispatcher.failed == 1
+            assert [item for _, item in spool.pending()] == [
+                ("$login", {"$user_id": "bad"}, {})
+            ]
+
+    def test_dispatcher_retries_failed_events(self) -> None:
+        attempts: list[str] = []
+
+        def post(url: str, data: str, **kwargs: t.Any) -> mock.Mock:
+            user_id = json.loads(data)["$user_id"]
+            attempts.append(user_id)
+
+            if attempts.count(user_id) == 1:
+                raise RequestException("Failed")
+
+            return ok_response()
+
+        self.mock_post.side_effect = post
+
+        with Spool(self.directory) as spool:
+            dispatcher = Dispatcher(
+                self.sift_client, spool=spool, replay_interval=0.01
+            )
+            dispatcher.submit("$login", {"$user_id": "1"})
+
+            for _ in range(500):
+                if dispatcher.sent:
+                    break
+
+                time.sleep(0.01)
+
+            assert dispatcher.close(timeout=5)
+            assert attempts == ["1", "1"]
+            assert list(spool.pending()) == []
+
+    def test_dispatcher_acks_rejected_events(self) -> None:
+        errors: list[Exception] = []
+
+        with Spool(self.directory) as spool:
+            dispatcher = Dispatcher(
+                self.sift_client,
+                spool=spool,
+                replay_interval=0.01,
+                on_error=lambda item, e: errors.append(e),
+            )
+            dispatcher.submit("$login", {"$user_id": "invalid"})
+
+            assert dispatcher.flush(timeout=5)
+            # replays would have sent it again by now
+            time.sleep(0.1)
+
+            assert dispatcher.close(timeout=5)
+            assert self.mock_post.call_count == 1
+            assert dispatcher.failed == 1
+            assert list(spool.pending()) == []
+
+        (error,) = errors
+        assert isinstance(error, sift.client.ApiException)
+        assert error.http_status_code == 400
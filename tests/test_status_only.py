@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import json
+from unittest import IsolatedAsyncioTestCase, TestCase, mock
+
+import httpx
+
+import sift
+from sift.async_client import AsyncClient
+from sift.client import StatusResponse, _StatusScanner
+from sift.exceptions import ApiException
+
+
+def track_response_body(status: int = 0, message: str = "OK") -> bytes:
+    # the API echoes the request, which can be large
+    request = {"$type": "$create_order", "status": 1, "$items": ["x"] * 1000}
+
+    return json.dumps(
+        {
+            "status": status,
+            "error_message": message,
+            "time": 1327604222,
+            "request": json.dumps(request),
+        }
+    ).encode()
+
+
+def chunks(data: bytes, size: int) -> list[bytes]:
+    return [data[i:][:size] for i in range(0, len(data), size)]
+
+
+def streamed_response(status_code: int, content: bytes) -> mock.Mock:
+    mock_response = mock.Mock()
+    mock_response.url = "https://api.sift.com/v205/events"
+    mock_response.status_code = status_code
+    mock_response.content = content
+    mock_response.iter_content.return_value = chunks(content, 7)
+    return mock_response
+
+
+class TestStatusScanner(TestCase):
+    def scan(self, body: bytes, chunk_size: int) -> _StatusScanner:
+        scanner = _StatusScanner()
+
+        for chunk in chunks(body, chunk_size):
+            scanner.feed(chunk)
+
+        return scanner
+
+    def test_chunk_boundaries(self) -> None:
+        body = track_response_body(51, 'Invalid "API" key é')
+
+        for chunk_size in (1, 3, 16, len(body)):
+            scanner = self.scan(body, chunk_size)
+            assert scanner.api_status == 51
+            assert scanner.api_error_message == 'Invalid "API" key é'
+
+    def test_fields_of_the_echoed_request_are_ignored(self) -> None:
+        body = b'{"time": 1, "request": "{\\"status\\": 1}", "status": 0}'
+
+        scanner = self.scan(body, 4)
+        assert scanner.api_status == 0
+        assert scanner.api_error_message is None
+
+
+class TestClientStatusOnly(TestCase):
+    def setUp(self) -> None:
+        self.sift_client = sift.Client(api_key="a_fake_test_api_key")
+
+    def test_track(self) -> None:
+        mock_response = streamed_response(200, track_response_body())
+
+        with mock.patch.object(self.sift_client.session, "post") as mock_post:
+            mock_post.return_value = mock_response
+            response = self.sift_client.track(
+                "$login", {"$user_id": "billy_jones_301"}, status_only=True
+            )
+
+        assert mock_post.call_args.kwargs["stream"] is True
+        assert isinstance(response, StatusResponse)
+        assert response.is_ok()
+        assert response.api_status == 0
+        assert response.api_error_message == "OK"
+        assert response.body is None
+        assert response.request is None
+        mock_response.json.assert_not_called()
+
+    def test_errors_are_parsed(self) -> None:
+        content = b'{"status": 51, "error_message": "Invalid API key"}'
+
+        with mock.patch.object(self.sift_client.session, "post") as mock_post:
+            mock_post.return_value = streamed_response(400, content)
+
+            with self.assertRaises(ApiException) as cm:
+                self.sift_client.track(
+                    "$login", {"$user_id": "billy_jones_301"}, status_only=True
+                )
+
+        assert cm.exception.api_status == 51
+        assert cm.exception.api_error_message == "Invalid API key"
+
+    def test_client_default(self) -> None:
+        sift_client = sift.Client(
+            api_key="a_fake_test_api_key", track_status_only=True
+        )
+
+        with mock.patch.object(sift_client.session, "post") as mock_post:
+            mock_post.return_value = streamed_response(
+                200, track_response_body()
+            )
+
+            sift_client.track("$login", {"$user_id": "billy_jones_301"})
+            assert mock_post.call_args.kwargs["stream"] is True
+
+            # requesting a score requires the body
+            sift_client.track(
+                "$login", {"$user_id": "billy_jones_301"}, return_score=True
+            )
+            assert "stream" not in mock_post.call_args.kwargs
+
+    def test_options_requiring_the_body(self) -> None:
+        for option in (
+            "return_score",
+            "return_action",
+            "return_workflow_status",
+            "include_warnings",
+        ):
+            with self.subTest(option=option):
+                self.assertRaises(
+                    ValueError,
+                    self.sift_client.track,
+                    "$login",
+                    {"$user_id": "billy_jones_301"},
+                    status_only=True,
+                    **{option: True},
+                )
+
+
+class TestAsyncClientStatusOnly(IsolatedAsyncioTestCase):
+    async def test_track(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            if json.loads(request.content)["$user_id"] == "bad":
+                return httpx.Response(
+                    400, json={"status": 51, "error_message": "Invalid"}
+                )
+
+            return httpx.Response(200, content=track_response_body())
+
+        async with AsyncClient(
+            api_key="a_fake_test_api_key",
+            session=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            track_status_only=True,
+        ) as sift_client:
+            response = await sift_client.track("$login", {"$user_id": "ok"})
+
+            with self.assertRaises(ApiException) as cm:
+                await sift_client.track("$login", {"$user_id": "bad"})
+
+        assert isinstance(response, StatusResponse)
+        assert response.api_status == 0
+        assert response.body is None
+        assert cm.exception.api_status == 51
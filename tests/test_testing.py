@@ -0,0 +1,350 @@
+from __future__ import annotations
+
+import typing as t
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+import sift
+from sift.async_client import AsyncClient
+from sift.compression import Compression
+from sift.exceptions import ApiException
+from sift.retry import RetryPolicy
+from sift.testing import (
+    Fault,
+    SiftServer,
+    _route,
+    lognormal_latency,
+    uniform_latency,
+)
+
+
+def valid_psp_merchant_properties() -> dict[str, t.Any]:
+    return {
+        "$id": "api-key-1",
+        "$name": "Wonderful Payments Inc.",
+        "$description": "Wonderful Payments payment provider.",
+        "$address": {"$city": "New Orleans", "$country": "US"},
+        "$category": "1002",
+        "$service_level": "Platinum",
+        "$status": "active",
+        "$risk_profile": {"$level": "low", "$score": 10},
+    }
+
+
+class TestRoutes(TestCase):
+    def test_routes(self) -> None:
+        assert _route("POST", "/v205/events") == ("track", ())
+        assert _route("GET", "/v205/users/billy%2F301/score") == (
+            "get_user_score",
+            ("billy/301",),
+        )
+        assert _route("POST", "/v205/users/billy_jones_301/score") == (
+            "rescore_user",
+            ("billy_jones_301",),
+        )
+        assert _route(
+            "POST", "/v3/accounts/ACCT/users/billy/orders/order_1/decisions"
+        ) == ("apply_order_decision", ("ACCT", "billy", "order_1"))
+        assert _route(
+            "PUT", "/v3/accounts/ACCT/psp_management/merchants/api-key-1"
+        ) == ("update_psp_merchant_profile", ("ACCT", "api-key-1"))
+        assert _route("GET", "/v205/events") == (None, ())
+        assert _route("GET", "/v205/nothing") == (None, ())
+
+
+class TestLatency(TestCase):
+    def test_distributions(self) -> None:
+        samples = sorted(lognormal_latency(0.03, 0.2)() for _ in range(2000))
+
+        assert 0.025 < samples[1000] < 0.035
+        assert all(0.01 <= uniform_latency(0.01, 0.02)() <= 0.02 for _ in "ab")
+        self.assertRaises(ValueError, lognormal_latency, 0.2, 0.03)
+
+    def test_per_endpoint(self) -> None:
+        server = SiftServer(latency={"track": 0.5, "score": lambda: 0.25})
+
+        assert server._latency("track") == 0.5
+        assert server._latency("score") == 0.25
+        assert server._latency("label") == 0
+        assert server._latency(None) == 0
+
+
+class TestSiftServer(TestCase):
+    def setUp(self) -> None:
+        self.server = SiftServer(api_key="a_fake_test_api_key", seed=1)
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        self.sift_client = sift.Client(
+            api_key="a_fake_test_api_key",
+            account_id="ACCT",
+            api_url=self.server.url,
+            retry=RetryPolicy(max_attempts=2, backoff_factor=0),
+        )
+        self.addCleanup(self.sift_client.close)
+
+    def test_track(self) -> None:
+        response = self.sift_client.track(
+            "$create_order",
+            {"$user_id": "billy_jones_301", "$amount": 1000},
+            return_score=True,
+            abuse_types=["payment_abuse"],
+        )
+
+        assert response.is_ok()
+        score = response.body["score_response"]  # type: ignore[index]
+        assert score["user_id"] == "billy_jones_301"
+        assert list(score["scores"]) == ["payment_abuse"]
+
+        (request,) = self.server.requests
+        assert request.endpoint == "track"
+        assert request.path == "/v205/events"
+        assert request.query == {
+            "return_score": "true",
+            "abuse_types": "payment_abuse",
+        }
+        assert request.json()["$type"] == "$create_order"
+
+    def test_compressed_track(self) -> None:
+        sift_client = sift.Client(
+            api_key="a_fake_test_api_key",
+            api_url=self.server.url,
+            compression=Compression(threshold=0),
+        )
+
+        assert sift_client.track(
+            "$login", {"$user_id": "billy_jones_301", "$note": "a" * 2048}
+        ).is_ok()
+
+        request = self.server.requests[0]
+        assert request.headers["Content-Encoding"] == "gzip"
+        assert request.json()["$user_id"] == "billy_jones_301"
+
+    def test_scores_and_labels(self) -> None:
+        first = self.sift_client.get_user_score("billy_jones_301").body
+        self.sift_client.label(
+            "billy_jones_301",
+            {"$is_bad": True, "$abuse_type": "payment_abuse"},
+        )
+        second = self.sift_client.score("billy_jones_301").body
+
+        assert first is not None and second is not None
+        assert first["entity_id"] == "billy_jones_301"
+        assert (
+            first["scores"]["payment_abuse"]["score"]
+            == second["scores"]["payment_abuse"]["score"]
+        )
+        assert second["latest_labels"]["payment_abuse"]["is_bad"] is True
+
+        response = self.sift_client.unlabel(
+            "billy_jones_301", abuse_type="payment_abuse"
+        )
+
+        assert response.http_status_code == 204
+        assert not self.sift_client.score("billy_jones_301").body[  # type: ignore[index]
+            "latest_labels"
+        ]
+
+    def test_decisions(self) -> None:
+        decisions = self.sift_client.get_decisions("user", limit=2).body
+
+        assert decisions is not None
+        assert len(decisions["data"]) == 2
+        assert decisions["has_more"]
+
+        self.sift_client.apply_order_decision(
+            "billy_jones_301",
+            "order_1",
+            {
+                "decision_id": "order_looks_bad_payment_abuse",
+                "source": "MANUAL_REVIEW",
+                "analyst": "analyst@example.com",
+            },
+        )
+        applied = self.sift_client.get_order_decisions("order_1").body
+
+        assert applied is not None
+        assert applied["decisions"]["payment_abuse"]["decision"] == {
+            "id": "order_looks_bad_payment_abuse"
+        }
+        assert self.sift_client.get_user_decisions("billy_jones_301").body == {
+            "decisions": {}
+        }
+
+        with self.assertRaises(ApiException) as context:
+            self.sift_client.apply_user_decision(
+                "billy_jones_301",
+                {"decision_id": "unknown", "source": "AUTOMATED_RULE"},
+            )
+
+        assert context.exception.http_status_code == 400
+
+    def test_workflow_status(self) -> None:
+        response = self.sift_client.get_workflow_status("4zxwibludiaaa")
+
+        assert response.body is not None
+        assert response.body["id"] == "4zxwibludiaaa"
+        assert response.body["state"] == "finished"
+
+    def test_psp_merchants(self) -> None:
+        properties = valid_psp_merchant_properties()
+        created = self.sift_client.create_psp_merchant_profile(properties)
+
+        assert created.http_status_code == 201
+        assert created.body is not None
+        assert created.body["name"] == "Wonderful Payments Inc."
+        assert created.body["risk_profile"] == {"level": "low", "score": 10}
+
+        properties["$name"] = "Wonderful Payments LLC"
+        self.sift_client.update_psp_merchant_profile("api-key-1", properties)
+        merchant = self.sift_client.get_a_psp_merchant_profile("api-key-1")
+        merchants = self.sift_client.get_psp_merchant_profiles().body
+
+        assert merchant.body is not None and merchants is not None
+        assert merchant.body["name"] == "Wonderful Payments LLC"
+        assert merchants["merchants"] == [merchant.body]
+
+        with self.assertRaises(ApiException) as context:
+            self.sift_client.get_a_psp_merchant_profile("api-key-2")
+
+        assert context.exception.http_status_code == 404
+
+    def test_verification(self) -> None:
+        sent = self.sift_client.verification_send(
+            {
+                "$user_id": "billy_jones_301",
+                "$send_to": "billy_jones_301@gmail.com",
+                "$verification_type": "$email",
+                "$brand_name": "MyTopBrand",
+                "$language": "en",
+                "$event": {
+                    "$session_id": "SOME_SESSION_ID",
+                    "$verified_event": "$login",
+                },
+            }
+        )
+
+        assert sent.is_ok()
+        assert sent.body is not None
+        assert sent.body["brand_name"] == "MyTopBrand"
+
+        checked = self.sift_client.verification_check(
+            {"$user_id": "billy_jones_301", "$code": "000000"}
+        )
+
+        assert checked.api_status == 50
+
+    def test_invalid_api_key(self) -> None:
+        sift_client = sift.Client(
+            api_key="another_api_key",
+            account_id="ACCT",
+            api_url=self.server.url,
+        )
+
+        with self.assertRaises(ApiException) as context:
+            sift_client.track("$login", {"$user_id": "billy_jones_301"})
+
+        assert context.exception.http_status_code == 400
+        assert context.exception.api_status == 51
+
+        with self.assertRaises(ApiException) as context:
+            sift_client.get_decisions("user")
+
+        assert context.exception.http_status_code == 401
+
+    def test_rate_limited(self) -> None:
+        fault = self.server.inject(Fault(429, times=1, retry_after=0))
+
+        assert self.sift_client.track(
+            "$login", {"$user_id": "billy_jones_301"}
+        ).is_ok()
+        assert len(self.server.requests_to("track")) == 2
+        assert fault.remaining == 0
+        assert not self.server.faults
+
+    def test_server_errors(self) -> None:
+        self.server.inject(Fault(503, endpoints={"label"}))
+
+        assert self.sift_client.get_user_score("billy_jones_301").is_ok()
+
+        with self.assertRaises(ApiException) as context:
+            self.sift_client.label("billy_jones_301", {"$is_bad": True})
+
+        assert context.exception.http_status_code == 503
+        assert context.exception.api_status == -4
+
+        self.server.clear_faults()
+        assert self.sift_client.label(
+            "billy_jones_301", {"$is_bad": True}
+        ).is_ok()
+
+    def test_malformed_json(self) -> None:
+        self.server.inject(Fault(malformed_json=True, times=1))
+
+        response = self.sift_client.get_workflow_status("4zxwibludiaaa")
+
+        with self.assertRaises(ApiException) as context:
+            response.body
+
+        assert "Failed to parse json" in str(context.exception)
+
+    def test_disconnect(self) -> None:
+        self.server.inject(Fault(disconnect=True))
+
+        self.assertRaises(
+            ApiException,
+            self.sift_client.apply_user_decision,
+            "billy_jones_301",
+            {
+                "decision_id": "user_looks_ok_payment_abuse",
+                "source": "AUTOMATED_RULE",
+            },
+        )
+        # not idempotent, so not retried
+        assert len(self.server.requests) == 1
+
+    def test_probability(self) -> None:
+        self.server.inject(Fault(500, probability=0.5))
+        failed = sum(
+            self.server._fault("track") is not None for _ in range(1000)
+        )
+
+        assert 400 < failed < 600
+        self.assertRaises(ValueError, Fault, probability=2)
+        self.assertRaises(ValueError, Fault, times=0)
+
+    def test_capture(self) -> None:
+        server = SiftServer(capture=False).start()
+        self.addCleanup(server.stop)
+        sift_client = sift.Client(
+            api_key="a_fake_test_api_key", api_url=server.url
+        )
+
+        sift_client.track("$login", {"$user_id": "billy_jones_301"})
+
+        assert server.requests == []
+
+        self.sift_client.track("$login", {"$user_id": "billy_jones_301"})
+        self.server.clear()
+
+        assert self.server.requests == []
+
+
+class TestAsyncClientSiftServer(IsolatedAsyncioTestCase):
+    async def test_calls(self) -> None:
+        with SiftServer() as server:
+            async with AsyncClient(
+                api_key="a_fake_test_api_key",
+                account_id="ACCT",
+                api_url=server.url,
+            ) as sift_client:
+                response = await sift_client.track(
+                    "$login", {"$user_id": "billy_jones_301"}
+                )
+                score = await sift_client.get_user_score("billy_jones_301")
+
+        assert response.is_ok()
+        assert score.body is not None
+        assert score.body["entity_id"] == "billy_jones_301"
+        assert [r.endpoint for r in server.requests] == [
+            "track",
+            "get_user_score",
+        ]
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import importlib.util
+import sys
+import typing as t
+from unittest import IsolatedAsyncioTestCase, TestCase, mock, skipUnless
+
+import sift
+from sift.async_client import AsyncClient
+from sift.client import _default_tracing, _get_tracing
+from sift.exceptions import ApiException
+from sift.retry import RetryPolicy
+from sift.testing import Fault, SiftServer
+
+if t.TYPE_CHECKING:
+    from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+        InMemorySpanExporter,
+    )
+
+HAS_OPENTELEMETRY_SDK = (
+    importlib.util.find_spec("opentelemetry") is not None
+    and importlib.util.find_spec("opentelemetry.sdk") is not None
+)
+
+
+def tracer_provider() -> tuple[TracerProvider, InMemorySpanExporter]:
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+        InMemorySpanExporter,
+    )
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    return provider, exporter
+
+
+class TestTracingSettings(TestCase):
+    def test_without_opentelemetry(self) -> None:
+        with mock.patch.dict(
+            sys.modules, {"opentelemetry": None, "sift.tracing": None}
+        ):
+            assert _default_tracing.__wrapped__() is None
+
+            self.assertRaises(ImportError, _get_tracing, True)
+
+        assert _get_tracing(False) is None
+
+    @skipUnless(HAS_OPENTELEMETRY_SDK, "requires opentelemetry-sdk")
+    def test_with_opentelemetry(self) -> None:
+        from sift.tracing import Tracing
+
+        tracing = Tracing()
+
+        assert isinstance(_get_tracing(None), Tracing)
+        assert _get_tracing(None) is _get_tracing(None)
+        assert _get_tracing(tracing) is tracing
+        assert sift.Client(api_key="a_fake_test_api_key").tracing is (
+            _default_tracing()
+        )
+        assert (
+            sift.Client(api_key="a_fake_test_api_key", tracing=False).tracing
+            is None
+        )
+
+
+@skipUnless(HAS_OPENTELEMETRY_SDK, "requires opentelemetry-sdk")
+class TestClientTracing(TestCase):
+    def setUp(self) -> None:
+        from sift.tracing import Tracing
+
+        self.server = SiftServer(api_key="a_fake_test_api_key").start()
+        self.addCleanup(self.server.stop)
+        self.provider, self.exporter = tracer_provider()
+        self.sift_client = sift.Client(
+            api_key="a_fake_test_api_key",
+            account_id="ACCT",
+            api_url=self.server.url,
+            retry=RetryPolicy(max_attempts=2, backoff_factor=0),
+            tracing=Tracing(self.provider),
+        )
+        self.addCleanup(self.sift_client.close)
+
+    def span(self) -> ReadableSpan:
+        (span,) = self.exporter.get_finished_spans()
+        return span
+
+    def test_track(self) -> None:
+        from opentelemetry.trace import SpanKind
+
+        self.sift_client.track("$login", {"$user_id": "billy_jones_301"})
+
+        span = self.span()
+        assert span.name == "sift.track"
+        assert span.kind == SpanKind.CLIENT
+        assert dict(span.attributes or {}) == {
+            "sift.endpoint": "track",
+            "sift.endpoint_family": "events",
+            "sift.event_type": "$login",
+            "sift.retry_count": 0,
+            "url.template": "/v205/events",
+            "http.request.method": "POST",
+            "http.response.status_code": 200,
+        }
+
+        # the trace context is propagated
+        (request,) = self.server.requests
+        assert span.context is not None
+        trace_id = f"{span.context.trace_id:032x}"
+        span_id = f"{span.context.span_id:016x}"
+        assert request.headers["traceparent"].startswith(
+            f"00-{trace_id}-{span_id}-"
+        )
+
+    def test_parent_span(self) -> None:
+        tracer = self.provider.get_tracer("checkout")
+
+        with tracer.start_as_current_span("checkout") as parent:
+            self.sift_client.get_user_score("billy_jones_301")
+
+        score, checkout = self.exporter.get_finished_spans()
+        assert checkout.name == "checkout"
+        assert score.name == "sift.get_user_score"
+        assert score.parent is not None
+        assert score.parent.span_id == parent.get_span_context().span_id
+        assert score.attributes is not None
+        assert score.attributes["url.template"] == (
+            "/v205/users/{user_id}/score"
+        )
+        assert "sift.event_type" not in score.attributes
+
+    def test_retries(self) -> None:
+        self.server.inject(Fault(429, times=1, retry_after=0))
+
+        self.sift_client.get_user_score("billy_jones_301")
+
+        attributes = self.span().attributes
+        assert attributes is not None
+        assert attributes["sift.retry_count"] == 1
+        assert attributes["http.response.status_code"] == 200
+
+    def test_errors(self) -> None:
+        from opentelemetry.trace import StatusCode
+
+        self.server.inject(Fault(500))
+
+        with self.assertRaises(ApiException):
+            self.sift_client.get_decisions("user")
+
+        span = self.span()
+        assert span.status.status_code == StatusCode.ERROR
+        assert span.attributes is not None
+        assert span.attributes["sift.retry_count"] == 1
+        assert span.attributes["http.response.status_code"] == 500
+        assert span.events[0].name == "exception"
+
+
+@skipUnless(HAS_OPENTELEMETRY_SDK, "requires opentelemetry-sdk")
+class TestAsyncClientTracing(IsolatedAsyncioTestCase):
+    async def test_calls(self) -> None:
+        from sift.tracing import Tracing
+
+        provider, exporter = tracer_provider()
+
+        with SiftServer() as server:
+            server.inject(Fault(503, endpoints={"get_user_score"}, times=1))
+
+            async with AsyncClient(
+                api_key="a_fake_test_api_key",
+                api_url=server.url,
+                retry=RetryPolicy(max_attempts=2, backoff_factor=0),
+                tracing=Tracing(provider),
+            ) as sift_client:
+                await sift_client.track(
+                    "$create_order", {"$user_id": "billy_jones_301"}
+                )
+                await sift_client.get_user_score("billy_jones_301")
+
+        track, score = exporter.get_finished_spans()
+        assert track.name == "sift.track"
+        assert track.attributes is not None
+        assert track.attributes["sift.event_type"] == "$create_order"
+        assert score.name == "sift.get_user_score"
+        assert score.attributes is not None
+        assert score.attributes["sift.retry_count"] == 1
+        assert score.attributes["http.response.status_code"] == 200
+        assert all("traceparent" in r.headers for r in server.requests)
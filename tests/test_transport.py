@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import base64
+import json
+import typing as t
+from unittest import TestCase, mock
+
+import requests
+
+import sift
+from sift.exceptions import ApiException, TransportError
+from sift.retry import RetryPolicy
+from sift.transport import (
+    BufferedResponse,
+    HttpRequest,
+    RequestsTransport,
+    TransportResponse,
+    Urllib3Transport,
+)
+from tests.test_pool import start_server
+from tests.test_retry import http_response
+
+AUTHORIZATION = "Basic " + base64.b64encode(b"a_fake_test_api_key:").decode()
+
+
+class FakeTransport:
+    def __init__(self, *responses: BufferedResponse | TransportError) -> None:
+        self.responses = list(responses)
+        self.requests: list[HttpRequest] = []
+        self.closed = False
+
+    def send(self, request: HttpRequest) -> TransportResponse:
+        self.requests.append(request)
+        response = self.responses.pop(0)
+
+        if isinstance(response, TransportError):
+            raise response
+
+        return response
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def ok(status: int = 0) -> BufferedResponse:
+    return BufferedResponse(
+        "https://api.sift.com/v205/events",
+        200,
+        {"Content-Type": "application/json"},
+        json.dumps({"status": status, "error_message": "OK"}).encode(),
+    )
+
+
+class TestHttpRequest(TestCase):
+    def test_full_url(self) -> None:
+        request = HttpRequest(
+            "get",
+            "https://api.sift.com/v205/users/billy_jones_301/score",
+            params={"abuse_types": "payment_abuse,legacy", "fields": None},
+        )
+
+        assert request.full_url() == (
+            "https://api.sift.com/v205/users/billy_jones_301/score"
+            "?abuse_types=payment_abuse%2Clegacy"
+        )
+        assert HttpRequest("get", "https://a.b/c").full_url() == (
+            "https://a.b/c"
+        )
+
+    def test_auth_headers(self) -> None:
+        request = HttpRequest(
+            "get",
+            "https://a.b/c",
+            auth=requests.auth.HTTPBasicAuth("a_fake_test_api_key", ""),
+        )
+
+        assert request.auth_headers() == {"Authorization": AUTHORIZATION}
+        assert HttpRequest("get", "https://a.b/c").auth_headers() == {}
+
+
+class TestClientTransport(TestCase):
+    def test_calls_go_through_the_transport(self) -> None:
+        transport = FakeTransport(ok(), ok())
+        sift_client = sift.Client(
+            api_key="a_fake_test_api_key", transport=transport
+        )
+
+        response = sift_client.track(
+            "$login", {"$user_id": "billy_jones_301"}, return_score=True
+        )
+        sift_client.get_user_score("billy_jones_301", timeout=5)
+
+        assert response.is_ok()
+        assert sift_client.pool_stats is None
+
+        track, score = transport.requests
+        assert track.method == "post"
+        assert track.url == "https://api.sift.com/v205/events"
+        assert track.params == {"return_score": "true"}
+        assert json.loads(t.cast(str, track.data))["$user_id"] == (
+            "billy_jones_301"
+        )
+        assert track.timeout == 2
+        assert score.method == "get"
+        assert score.auth_headers() == {"Authorization": AUTHORIZATION}
+        assert score.data is None
+        assert score.timeout == 5
+
+        sift_client.close()
+        assert transport.closed
+
+    def test_status_only(self) -> None:
+        transport = FakeTransport(ok(status=51))
+        sift_client = sift.Client(
+            api_key="a_fake_test_api_key", transport=transport
+        )
+
+        response = sift_client.track(
+            "$login", {"$user_id": "billy_jones_301"}, status_only=True
+        )
+
+        assert transport.requests[0].stream
+        assert response.api_status == 51
+        assert response.body is None
+
+    def test_transport_errors(self) -> None:
+        transport = FakeTransport(
+            TransportError("Connection refused", request_sent=False),
+            ok(),
+            TransportError("Read timed out"),
+        )
+        sift_client = sift.Client(
+            api_key="a_fake_test_api_key",
+            transport=transport,
+            retry=RetryPolicy(max_attempts=2, backoff_factor=0),
+        )
+
+        # the request wasn't sent, so it is retried
+        assert sift_client.label("billy_jones_301", {"$is_bad": True}).is_ok()
+
+        # the request may have been processed, so it isn't
+        with self.assertRaises(ApiException) as context:
+            sift_client.label("billy_jones_301", {"$is_bad": True})
+
+        assert str(context.exception) == "Read timed out"
+        assert context.exception.url == (
+            "https://api.sift.com/v205/users/billy_jones_301/labels"
+        )
+        assert len(transport.requests) == 3
+
+    def test_session(self) -> None:
+        sift_client = sift.Client(
+            api_key="a_fake_test_api_key", transport=FakeTransport()
+        )
+
+        with self.assertRaises(AttributeError):
+            sift_client.session
+
+        self.assertRaises(ValueError, sift_client.warm_up)
+
+        session = requests.Session()
+        sift_client.session = session
+
+        assert isinstance(sift_client.transport, RequestsTransport)
+        assert sift_client.session is session
+
+
+class TestRequestsTransport(TestCase):
+    def setUp(self) -> None:
+        self.session = requests.Session()
+        self.transport = RequestsTransport(self.session)
+
+    def test_arguments(self) -> None:
+        with mock.patch.object(self.session, "delete") as mock_delete:
+            mock_delete.return_value = http_response()
+            self.transport.send(
+                HttpRequest(
+                    "delete",
+                    "https://api.sift.com/v205/users/billy_jones_301/labels",
+                    params={"abuse_type": "payment_abuse"},
+                    timeout=2,
+                )
+            )
+
+        mock_delete.assert_called_once_with(
+            "https://api.sift.com/v205/users/billy_jones_301/labels",
+            params={"abuse_type": "payment_abuse"},
+            timeout=2,
+        )
+
+    def test_errors(self) -> None:
+        request = HttpRequest("post", "https://api.sift.com/v205/events")
+
+        with mock.patch.object(self.session, "post") as mock_post:
+            mock_post.side_effect = requests.exceptions.ConnectTimeout("late")
+
+            with self.assertRaises(TransportError) as context:
+                self.transport.send(request)
+
+            assert not context.exception.request_sent
+
+            mock_post.side_effect = requests.exceptions.ReadTimeout("later")
+
+            with self.assertRaises(TransportError) as context:
+                self.transport.send(request)
+
+            assert context.exception.request_sent
+            assert str(context.exception) == "later"
+
+    def test_streamed_response_errors(self) -> None:
+        streamed = mock.Mock()
+        streamed.iter_content.side_effect = (
+            requests.exceptions.ChunkedEncodingError("truncated")
+        )
+
+        with mock.patch.object(self.session, "post") as mock_post:
+            mock_post.return_value = streamed
+            response = self.transport.send(
+                HttpRequest(
+                    "post", "https://api.sift.com/v205/events", stream=True
+                )
+            )
+
+        mock_post.assert_called_once_with(
+            "https://api.sift.com/v205/events", stream=True
+        )
+        self.assertRaises(TransportError, list, response.iter_content(4096))
+
+
+class TestUrllib3Transport(TestCase):
+    def setUp(self) -> None:
+        self.server = start_server(self)
+        self.transport = Urllib3Transport()
+        self.sift_client = sift.Client(
+            api_key="a_fake_test_api_key",
+            api_url=self.server.url,
+            transport=self.transport,
+        )
+        self.addCleanup(self.sift_client.close)
+
+    def test_calls(self) -> None:
+        response = self.sift_client.track(
+            "$login", {"$user_id": "billy_jones_301"}, return_action=True
+        )
+        self.sift_client.track(
+            "$login", {"$user_id": "billy_jones_301"}, status_only=True
+        )
+        self.sift_client.get_user_score("billy_jones_301")
+
+        assert response.is_ok()
+        assert response.api_error_message == "OK"
+
+        (method, path, headers, body), _, score = self.server.requests
+        assert method == "POST"
+        assert path == "/v205/events?return_action=true"
+        assert headers["Content-Type"] == "application/json"
+        assert json.loads(body)["$type"] == "$login"
+        assert score[:2] == ("GET", "/v205/users/billy_jones_301/score")
+        assert score[2]["Authorization"] == AUTHORIZATION
+
+        assert self.transport.stats.as_dict() == {
+            "requests": 3,
+            "new_connections": 1,
+            "warmed_connections": 0,
+            "reused_connections": 2,
+        }
+
+    def test_api_errors(self) -> None:
+        with mock.patch.object(
+            self.transport.pool_manager, "request"
+        ) as mock_request:
+            mock_request.return_value = mock.Mock(
+                status=401, headers={}, data=b'{"status": 51}'
+            )
+
+            with self.assertRaises(ApiException) as context:
+                self.sift_client.get_user_score("billy_jones_301")
+
+        assert context.exception.http_status_code == 401
+        assert context.exception.api_status == 51
+
+    def test_connection_errors(self) -> None:
+        self.server.server_close()
+
+        with self.assertRaises(TransportError) as context:
+            self.transport.send(HttpRequest("post", self.server.url))
+
+        assert not context.exception.request_sent